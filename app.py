@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hmac
+import os
 import runpy
 import sys
 from contextlib import contextmanager
@@ -8,12 +10,15 @@ from pathlib import Path
 
 import streamlit as st
 
+import memory_usage
 from branding import (
     BRAND,
     apply_enterprise_theme,
     powered_by_markdown,
     sred_header_title,
 )
+from page_profiler import TraceProfiler
+from page_timing import TIMINGS, WINDOW_MINUTES, timed_page
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -31,8 +36,15 @@ SRED_PAGES = {
     "Form T661 Review": SRED_PAGES_DIR / "5_Form_T661_Review.py",
     "Risk Report": SRED_PAGES_DIR / "6_Risk_Report.py",
     "ITC Calculator": SRED_PAGES_DIR / "7_ITC_Calculator.py",
+    "Portfolio": SRED_PAGES_DIR / "8_Portfolio.py",
 }
 
+# Hidden admin view: open the app with ?admin=<token>; disabled while no token is set
+ADMIN_TOKEN_ENV = "SCANNER_ADMIN_TOKEN"
+# Profiler controls in the sidebar: SCANNER_PROFILER=1 for everyone, or ?profile=<admin token>
+# (ignored while no admin token is set)
+PROFILER_ENV = "SCANNER_PROFILER"
+
 
 @contextmanager
 def _push_sys_paths(paths: list[Path]):
@@ -93,6 +105,7 @@ Use the SR&ED section selector in the sidebar to explore:
 | **Form T661 Review** | Full form completeness check (all 10 parts) |
 | **Risk Report** | Final risk score + remediation plan |
 | **ITC Calculator** | Federal + provincial ITC estimate |
+| **Portfolio** | Batch scoring across every claim in the portfolio |
         """
     )
     st.info(
@@ -140,28 +153,238 @@ def _render_sred_sidebar_and_get_page() -> str:
 
 
 def _render_sred():
-    with _push_sys_paths([SRED_DIR]):
-        selected_page = _render_sred_sidebar_and_get_page()
+    with timed_page("SR&ED", "Overview") as timer:
+        with _push_sys_paths([SRED_DIR]):
+            selected_page = _render_sred_sidebar_and_get_page()
+        timer.page = selected_page
+
+        page_script = SRED_PAGES[selected_page]
+        if page_script is None:
+            _render_sred_overview()
+            return
+
+        _run_script(
+            script=page_script,
+            module_name=f"sred_{page_script.stem}",
+            sys_paths=[SRED_DIR, SRED_PAGES_DIR],
+        )
 
-    page_script = SRED_PAGES[selected_page]
-    if page_script is None:
-        _render_sred_overview()
-        return
 
-    _run_script(
-        script=page_script,
-        module_name=f"sred_{page_script.stem}",
-        sys_paths=[SRED_DIR, SRED_PAGES_DIR],
+def _render_cpa():
+    # The CPA app picks its page inside the script; read it back from the widget state
+    with timed_page("CPA", "Dashboard") as timer:
+        try:
+            _run_script(
+                script=CPA_APP,
+                module_name="cpa_inspection_embedded",
+                sys_paths=[CPA_DIR],
+                patch_page_config=True,
+            )
+        finally:
+            # Labels carry an icon prefix ("\U0001f3e0 Dashboard")
+            timer.page = st.session_state.get("cpa_page", timer.page).split(" ", 1)[-1]
+
+
+def _admin_token_matches(value: str | None) -> bool:
+    """True when ``value`` is the configured admin token; always False while none is configured."""
+    token = os.environ.get(ADMIN_TOKEN_ENV)
+    if not token or value is None:
+        return False
+    return hmac.compare_digest(value.encode("utf-8"), token.encode("utf-8"))
+
+
+def _admin_requested() -> bool:
+    return _admin_token_matches(st.query_params.get("admin"))
+
+
+def _profiler_enabled() -> bool:
+    if os.environ.get(PROFILER_ENV, "").lower() in ("1", "true", "yes", "on"):
+        return True
+    return _admin_token_matches(st.query_params.get("profile"))
+
+
+def _store_capture(profiler: TraceProfiler):
+    # Keep the exports rather than the raw events, which can be large
+    st.session_state.profile_capture = {
+        "name": profiler.name,
+        "duration_ms": profiler.duration_ns / 1e6,
+        "events": len(profiler.events),
+        "truncated": profiler.truncated,
+        "speedscope": profiler.speedscope_json(),
+        "folded": profiler.folded(),
+    }
+
+
+def _profile_cold_scan():
+    with _push_sys_paths([CPA_DIR]):
+        from engine.scanner import run_scan
+
+        with TraceProfiler("CPA / cold run_scan") as profiler:
+            run_scan()
+    _store_capture(profiler)
+
+
+def _render_profiler_controls():
+    with st.expander("Profiler", expanded="profile_capture" in st.session_state):
+        if st.button("Profile next rerun", help="Trace the next execution of this page, whatever triggers it"):
+            st.session_state.profile_armed = True
+        if st.session_state.get("profile_armed"):
+            st.caption("Armed: interact with the page to capture its next rerun.")
+        if st.button("Profile a cold CPA scan", help="run_scan with no caches, outside the page"):
+            _profile_cold_scan()
+
+        capture = st.session_state.get("profile_capture")
+        if capture:
+            st.caption(
+                f"**{capture['name']}**: {capture['duration_ms']:.1f} ms, {capture['events']:,} events"
+                + (" (truncated)" if capture["truncated"] else "")
+            )
+            slug = capture["name"].lower().replace(" / ", "-").replace(" ", "_").replace("&", "")
+            st.download_button(
+                "Speedscope profile",
+                data=capture["speedscope"],
+                file_name=f"{slug}.speedscope.json",
+                mime="application/json",
+                help="Open at https://www.speedscope.app",
+            )
+            st.download_button(
+                "Folded stacks (flamegraph)",
+                data=capture["folded"],
+                file_name=f"{slug}.folded",
+                mime="text/plain",
+                help="Input for flamegraph.pl or inferno-flamegraph",
+            )
+
+
+def _render_admin():
+    st.title("Admin")
+    timings_tab, memory_tab = st.tabs(["Page Timings", "Memory"])
+    with timings_tab:
+        _render_admin_timings()
+    with memory_tab:
+        _render_admin_memory()
+
+
+def _render_admin_timings():
+    st.caption(
+        f"Per-page script execution time in this process, all-time and over the last {WINDOW_MINUTES} minutes. "
+        f"Snapshots are appended to `{TIMINGS.log_path}`."
     )
 
+    modes = TIMINGS.by_mode()
+    if modes:
+        cols = st.columns(len(modes))
+        for col, (mode, summary) in zip(cols, sorted(modes.items())):
+            col.metric(f"{mode} p95", f"{summary['p95'] * 1000:.0f} ms", help=f"{summary['count']} executions")
 
-def _render_cpa():
-    _run_script(
-        script=CPA_APP,
-        module_name="cpa_inspection_embedded",
-        sys_paths=[CPA_DIR],
-        patch_page_config=True,
+    rows = TIMINGS.snapshot()
+    if not rows:
+        st.info("No page executions recorded yet.")
+    else:
+        st.dataframe(
+            [
+                {
+                    "Mode": r["mode"],
+                    "Page": r["page"],
+                    "Runs (window)": r["window"]["count"],
+                    "Runs/min": round(r["window"]["count"] / WINDOW_MINUTES, 2),
+                    "Mean ms": round(r["window"]["mean"] * 1000, 1),
+                    "p50 ms": round(r["window"]["p50"] * 1000, 1),
+                    "p95 ms": round(r["window"]["p95"] * 1000, 1),
+                    "Max ms": round(r["window"]["max"] * 1000, 1),
+                    "Errors": r["window"]["errors"],
+                    "Runs (all)": r["total"]["count"],
+                    "p95 ms (all)": round(r["total"]["p95"] * 1000, 1),
+                }
+                for r in rows
+            ],
+            hide_index=True,
+        )
+
+        labels = [f"{r['mode']} / {r['page']}" for r in rows]
+        chosen = st.selectbox("Latency histogram", range(len(rows)), format_func=lambda i: labels[i])
+        st.bar_chart(
+            {"executions": rows[chosen]["total"]["buckets"]},
+            x_label="Latency bucket (seconds, upper bound)",
+        )
+
+    c1, c2 = st.columns(2)
+    if c1.button("Flush to log now"):
+        TIMINGS.flush()
+        st.toast("Timings appended to the log.")
+    if c2.button("Reset timings"):
+        TIMINGS.reset()
+        st.rerun()
+
+
+def _size_table(rows: list[memory_usage.SizeRow], scope_label: str, name_label: str):
+    st.dataframe(
+        [
+            {
+                scope_label: r.scope,
+                name_label: r.name,
+                "Entries": r.entries,
+                "Size": memory_usage.format_bytes(r.bytes),
+                "Bytes": r.bytes,
+            }
+            for r in rows
+        ],
+        hide_index=True,
+    )
+
+
+def _render_admin_memory():
+    st.caption(
+        "Deep sizes of what this process holds, measured when the page loads. Shared objects "
+        "are counted in every row that references them."
     )
+    sessions = memory_usage.session_state_report(current=dict(st.session_state))
+    caches = memory_usage.cache_report()
+    modules = memory_usage.module_cache_report()
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Process RSS", memory_usage.format_bytes(memory_usage.process_rss()))
+    m2.metric("Session state", memory_usage.format_bytes(sum(r.bytes for r in sessions)),
+              help=f"{len({r.scope for r in sessions})} session(s)")
+    m3.metric("Streamlit caches", memory_usage.format_bytes(sum(r.bytes for r in caches)))
+    m4.metric("Module caches", memory_usage.format_bytes(sum(r.bytes for r in modules)))
+
+    st.subheader("Session state")
+    _size_table(sessions, "Session", "Key")
+    st.subheader("Cached functions")
+    _size_table(caches, "Cache", "Function")
+    st.subheader("Module-level caches")
+    _size_table(modules, "Module", "Attribute")
+
+    st.subheader("Allocation sites (tracemalloc)")
+    c1, c2 = st.columns(2)
+    if not memory_usage.tracing():
+        st.caption(
+            "Tracing is off. It is process-wide and slows every allocation; only allocations made "
+            "after it starts are attributed, so take snapshots after some traffic to see what grew."
+        )
+        if c1.button("Start tracing"):
+            memory_usage.start_tracing()
+            st.rerun()
+    else:
+        if c1.button("Take snapshot"):
+            st.session_state.admin_allocations = memory_usage.allocation_snapshot()
+        if c2.button("Stop tracing"):
+            memory_usage.stop_tracing()
+            st.session_state.pop("admin_allocations", None)
+            st.rerun()
+
+    snapshot = st.session_state.get("admin_allocations")
+    if snapshot:
+        st.caption(
+            f"Traced {memory_usage.format_bytes(snapshot['traced'])} "
+            f"(peak {memory_usage.format_bytes(snapshot['peak'])})"
+        )
+        st.markdown("**Top allocation sites**")
+        st.dataframe(snapshot["top"], hide_index=True)
+        if snapshot["growth"]:
+            st.markdown("**Growth since the previous snapshot**")
+            st.dataframe(snapshot["growth"], hide_index=True)
 
 
 def main():
@@ -173,6 +396,10 @@ def main():
     )
     apply_enterprise_theme()
 
+    if _admin_requested():
+        _render_admin()
+        return
+
     with st.sidebar:
         st.markdown(f"## 🧭 {BRAND.display_name} Suite")
         st.caption(powered_by_markdown())
@@ -186,10 +413,26 @@ def main():
         )
         st.divider()
 
-    if mode == "CPA Practice Inspection":
-        _render_cpa()
-    else:
-        _render_sred()
+    render_page = _render_cpa if mode == "CPA Practice Inspection" else _render_sred
+    if not _profiler_enabled():
+        render_page()
+        return
+
+    # Controls render after the page (into a slot above it) so a fresh capture shows at once
+    armed = st.session_state.pop("profile_armed", False)
+    slot = st.sidebar.container()
+    profiler = TraceProfiler(f"{'CPA' if render_page is _render_cpa else 'SR&ED'} / rerun") if armed else None
+    try:
+        if profiler:
+            with profiler:
+                render_page()
+        else:
+            render_page()
+    finally:
+        if profiler:
+            _store_capture(profiler)
+        with slot:
+            _render_profiler_controls()
 
 
 if __name__ == "__main__":
@@ -2,16 +2,26 @@ import streamlit as st
 import pandas as pd
 from datetime import date, datetime
 from pathlib import Path
+import os
 import sys
 
-from engine.scanner import run_scan
-from engine.report import generate_report_text, generate_csv_rows
+from engine.cache import load_or_run_scan, scan_input_key
+from engine.diff import diff_findings
+from engine.history import ScanHistory, record_scan
+from engine import metrics as scan_metrics
+from engine.models import scan_result_from_dict
+from engine.report import generate_report_text, generate_csv_rows, prioritized_findings
+from engine.scanner import FIRM_PROFILE_ENV_VAR, run_scan
+from engine.search import FileSearchIndex
+from engine.sources import SOURCE_ENV_VAR
+from engine.store import STORE_ENV_VAR
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from branding import PALETTE, apply_enterprise_theme, powered_by_markdown
+import scan_client
 
 st.set_page_config(
     page_title="CPA Practice Inspection Readiness Scanner",
@@ -20,12 +30,58 @@ st.set_page_config(
 )
 apply_enterprise_theme()
 
-# --- Run scan (cached) ---
-@st.cache_data
-def get_scan_results():
-    return run_scan()
+# --- Run scan (one frozen ScanResult per input data version, shared by reference across
+# sessions and reruns, backed by the on-disk scan cache or the scan service) ---
+def _scan_from_service():
+    """The scan of this app's configured inputs from the scan service, or None to scan in-process."""
+    if not scan_client.service_url():
+        return None
+    try:
+        return scan_result_from_dict(scan_client.request_scan(
+            store=os.environ.get(STORE_ENV_VAR),
+            source=os.environ.get(SOURCE_ENV_VAR),
+            firm_profile=os.environ.get(FIRM_PROFILE_ENV_VAR),
+        ))
+    except scan_client.ScanServiceError as exc:
+        print(f"Scan service unavailable, scanning in-process: {exc}", file=sys.stderr)
+        return None
+
+
+@st.cache_resource(max_entries=4)
+def get_scan_results(data_version):
+    result = _scan_from_service() or load_or_run_scan(key=data_version)
+    record_scan(result, input_key=data_version)
+    return result
+
+
+# Engagement file search index, built once per scanned data version
+@st.cache_resource(max_entries=4)
+def get_file_index(data_version):
+    return FileSearchIndex(get_scan_results(data_version).file_results)
+
+
+def get_readiness_trend(firm):
+    with ScanHistory() as history:
+        return history.aggregates(firm)
+
+
+# Diff against the previous recorded scan of different inputs; (None, None) on the first scan
+def get_scan_diff(result):
+    with ScanHistory() as history:
+        previous = history.previous(result.license_number)
+        if previous is None:
+            return None, None
+        before = history.findings(previous["id"])
+    diff = diff_findings(
+        before,
+        result.all_findings,
+        score_delta=round(result.readiness_score - previous["readiness_score"], 1),
+        post_fix_delta=round(result.post_fix_score - previous["post_fix_score"], 1),
+    )
+    return previous, diff
 
-result = get_scan_results()
+data_version = scan_input_key()
+result = get_scan_results(data_version)
 
 # --- Sidebar ---
 st.sidebar.markdown("### \U0001f4cb CPA Practice Inspection\n### Readiness Scanner")
@@ -42,6 +98,7 @@ page = st.sidebar.radio(
         "\U0001f517 Evidence Graph",
         "\U0001f4e4 Generate Report",
     ],
+    key="cpa_page",
 )
 
 st.sidebar.divider()
@@ -126,6 +183,28 @@ if page == "\U0001f3e0 Dashboard":
         m3.metric("Warnings", result.warning_count, delta=f"{result.warning_count} found", delta_color="inverse")
         m4.metric("Files Scanned", result.files_scanned)
 
+    # Readiness trend from the scan history (aggregate columns only)
+    trend = get_readiness_trend(result.license_number)
+    if len(trend) > 1:
+        st.subheader("Readiness Trend")
+        trend_df = pd.DataFrame(trend)
+        trend_df["scanned_at"] = pd.to_datetime(trend_df["scanned_at"])
+        trend_df = trend_df.set_index("scanned_at")
+        t1, t2 = st.columns(2)
+        with t1:
+            st.line_chart(
+                trend_df[["readiness_score", "post_fix_score"]].rename(
+                    columns={"readiness_score": "Readiness Score", "post_fix_score": "Post-Fix Score"}
+                )
+            )
+        with t2:
+            st.line_chart(
+                trend_df[["critical_count", "warning_count"]].rename(
+                    columns={"critical_count": "Critical Gaps", "warning_count": "Warnings"}
+                )
+            )
+        st.caption(f"{len(trend)} recorded scans since {trend[0]['scanned_at'][:10]}.")
+
     st.divider()
 
     # Component traffic lights
@@ -169,6 +248,58 @@ if page == "\U0001f3e0 Dashboard":
     else:
         st.success("\u2705 Your firm appears ready for inspection!")
 
+    if result.skipped_documents:
+        st.warning(
+            "Skipped firm-level documents of an unknown type; no rule checked them:\n\n"
+            + "\n".join(f"- {skipped}" for skipped in result.skipped_documents)
+        )
+
+    # Per-phase and per-rule timings. Scans are served from the cache, so the numbers
+    # come from the last instrumented scan in this process (or a fresh one on demand).
+    with st.expander("Scan Diagnostics"):
+        if st.button("Run instrumented scan"):
+            run_scan(metrics=scan_metrics.ScanMetrics())
+        diagnostics = scan_metrics.last_scan_metrics
+        if diagnostics is None:
+            st.caption(
+                "No instrumented scan has run in this process. Run one here, or set "
+                f"{scan_metrics.METRICS_ENV}=1 to instrument every scan."
+            )
+        else:
+            st.caption(
+                f"Scan at {datetime.fromtimestamp(diagnostics.started_at):%Y-%m-%d %H:%M:%S} "
+                f"took {diagnostics.total_seconds * 1000:.1f} ms."
+            )
+            d1, d2 = st.columns(2)
+            d1.dataframe(
+                pd.DataFrame(
+                    [{"Phase": name, "Calls": s.calls, "Time (ms)": round(s.seconds * 1000, 3)}
+                     for name, s in diagnostics.phases.items()]
+                ),
+                hide_index=True,
+            )
+            d2.dataframe(
+                pd.DataFrame(
+                    [{"Rule": name, "Calls": s.calls, "Findings": s.findings,
+                      "Time (ms)": round(s.seconds * 1000, 3)}
+                     for name, s in diagnostics.rules.items()]
+                ),
+                hide_index=True,
+            )
+            e1, e2 = st.columns(2)
+            e1.download_button(
+                "Download Prometheus metrics",
+                data=diagnostics.to_prometheus(),
+                file_name="cpa_scan_metrics.prom",
+                mime="text/plain",
+            )
+            e2.download_button(
+                "Download JSON metrics",
+                data=diagnostics.to_json(),
+                file_name="cpa_scan_metrics.json",
+                mime="application/json",
+            )
+
 
 # ============================================================
 # Page 2: Firm-Level Scan
@@ -217,22 +348,51 @@ elif page == "\U0001f4c2 Engagement Files":
     st.title("\U0001f4c2 Engagement File Review")
     st.caption("Review each client engagement file the inspector may select")
 
-    # File selector
-    file_options = []
-    for fr in result.file_results:
+    # File selector: search over id, client, partner, preparer, type and status,
+    # narrowed by facet filters
+    file_index = get_file_index(data_version)
+    query = st.text_input(
+        "Search engagement files",
+        placeholder="Client, file ID, partner, preparer, type or status",
+    )
+    facet_labels = {
+        "engagement_type": "Engagement type",
+        "overall_status": "Status",
+        "engagement_partner": "Partner",
+    }
+    facets = file_index.search(query, limit=0).facets
+    filters = {}
+    for col, (facet, label) in zip(st.columns(len(facet_labels)), facet_labels.items()):
+        counts = facets[facet]
+        filters[facet] = set(col.multiselect(
+            label,
+            sorted(counts),
+            format_func=lambda v, counts=counts: f"{v or '(none)'} ({counts[v]})",
+            key=f"file_facet_{facet}",
+        ))
+
+    matches = file_index.search(query, filters=filters, limit=50)
+    if not matches.hits:
+        st.info("No engagement files match this search.")
+        st.stop()
+
+    def file_label(i):
+        fr = result.file_results[i]
         if fr.overall_status == "fail":
             icon = "\u274c"
         elif fr.overall_status == "pass_with_warning":
             icon = "\u26a0\ufe0f"
         else:
             icon = "\u2705"
-        file_options.append(f"{icon} {fr.client_name} ({fr.file_id})")
+        return f"{icon} {fr.client_name} ({fr.file_id})"
 
     selected_idx = st.selectbox(
         "Select engagement file",
-        range(len(file_options)),
-        format_func=lambda i: file_options[i],
+        matches.hits,
+        format_func=file_label,
     )
+    if matches.total > len(matches.hits):
+        st.caption(f"Showing the top {len(matches.hits)} of {matches.total} matching files")
 
     fr = result.file_results[selected_idx]
 
@@ -257,9 +417,8 @@ elif page == "\U0001f4c2 Engagement Files":
     st.divider()
 
     # Checklist view — load the raw file data for the detail view
-    from engine.scanner import load_engagement_files
-    engagement_files = load_engagement_files()
-    raw_file = engagement_files[selected_idx]
+    from engine.scanner import load_engagement_file
+    raw_file = load_engagement_file(fr.file_id) or {}
     checks = raw_file.get("checks", {})
 
     st.subheader("Inspection Checklist")
@@ -339,6 +498,38 @@ elif page == "\U0001f4ca Gap Report":
     s3.metric("\u26a0\ufe0f Warnings", result.warning_count)
     s4.metric("\u2139\ufe0f Info", result.info_count)
 
+    # Remediation progress since the previous scan
+    previous_scan, scan_diff = get_scan_diff(result)
+    if scan_diff is not None:
+        st.divider()
+        st.subheader("Changes Since Last Scan")
+        st.caption(f"Compared with the scan of {previous_scan['scanned_at'][:16].replace('T', ' ')} UTC")
+        d1, d2, d3, d4 = st.columns(4)
+        d1.metric("Readiness Score", f"{result.readiness_score}%", delta=f"{scan_diff.score_delta:+} pts")
+        d2.metric("\u2705 Resolved", len(scan_diff.resolved))
+        d3.metric("\U0001f195 New", len(scan_diff.added), delta_color="inverse")
+        d4.metric("\u270f\ufe0f Changed", len(scan_diff.changed))
+        if not scan_diff.has_changes:
+            st.info("No findings changed since the last scan.")
+        if scan_diff.resolved:
+            with st.expander(f"\u2705 Resolved ({len(scan_diff.resolved)})"):
+                for f in scan_diff.resolved:
+                    st.markdown(f"- ~~[{f.rule_id}] {f.description}~~ — {f.location}")
+        if scan_diff.added:
+            with st.expander(f"\U0001f195 New ({len(scan_diff.added)})", expanded=True):
+                for f in scan_diff.added:
+                    st.markdown(f"- **[{f.rule_id}] {f.description}** ({f.severity}) — {f.location}")
+        if scan_diff.changed:
+            with st.expander(f"\u270f\ufe0f Changed ({len(scan_diff.changed)})"):
+                for before, after in scan_diff.changed:
+                    severity = (
+                        f"{before.severity} \u2192 {after.severity}"
+                        if before.severity != after.severity else after.severity
+                    )
+                    st.markdown(f"- **[{after.rule_id}] {after.description}** ({severity}) — {after.location}")
+                    if before.issue != after.issue:
+                        st.caption(f"Was: {before.issue}")
+
     st.divider()
 
     # Predicted outcomes
@@ -360,53 +551,83 @@ elif page == "\U0001f4ca Gap Report":
 
     st.divider()
 
-    # Findings grouped by severity
-    critical_findings = [f for f in result.all_findings if f.severity == "critical"]
-    warning_findings = [f for f in result.all_findings if f.severity == "warning"]
-    info_findings = [f for f in result.all_findings if f.severity == "info"]
-
-    priority = 1
-
-    if critical_findings:
-        st.subheader("\u274c Critical — Must fix before inspection")
-        for f in critical_findings:
-            with st.container():
-                c1, c2 = st.columns([3, 1])
-                with c1:
-                    st.markdown(f"**{priority}. [{f.rule_id}] {f.description}**")
-                    st.markdown(f"*Location:* {f.location} | *Component:* {f.component}")
-                    st.error(f"**The inspector will flag this:** {f.issue}")
-                    st.markdown(f"**Fix:** {f.remediation}")
-                with c2:
-                    st.metric("Est. Time", f.estimated_fix_time)
-                st.markdown("---")
-                priority += 1
+    # Findings in priority order; numbering and totals cover the full set, only one slice is rendered
+    prioritized = prioritized_findings(result)
+    severity_headers = {
+        "critical": "\u274c Critical — Must fix before inspection",
+        "warning": "\u26a0\ufe0f Warnings — Should fix before inspection",
+        "info": "\u2139\ufe0f Info — For your awareness",
+    }
 
-    if warning_findings:
-        st.subheader("\u26a0\ufe0f Warnings — Should fix before inspection")
-        for f in warning_findings:
+    view_col, size_col, page_col = st.columns([2, 1, 1])
+    view_mode = view_col.radio("View", ["Detailed", "Table"], horizontal=True, label_visibility="collapsed")
+
+    if view_mode == "Table":
+        table = pd.DataFrame([
+            {
+                "#": priority,
+                "Severity": f.severity.title(),
+                "Rule": f.rule_id,
+                "Description": f.description,
+                "Location": f.location,
+                "Component": f.component,
+                "Est. Time": f.estimated_fix_time,
+            }
+            for priority, f in prioritized
+        ])
+        selection = st.dataframe(
+            table,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+        )
+        st.caption("Select a row to see the issue and fix.")
+        selected_rows = selection.selection.rows
+        if selected_rows:
+            priority, f = prioritized[selected_rows[0]]
+            st.markdown(f"**{priority}. [{f.rule_id}] {f.description}**")
+            st.markdown(f"*Location:* {f.location} | *Component:* {f.component}")
+            if f.severity == "critical":
+                st.error(f"**The inspector will flag this:** {f.issue}")
+            elif f.severity == "warning":
+                st.warning(f.issue)
+            else:
+                st.info(f.issue)
+            st.markdown(f"**Fix:** {f.remediation} (Est. {f.estimated_fix_time})")
+    else:
+        page_size = size_col.selectbox("Per page", [10, 25, 50, 100], index=1)
+        page_count = max(1, -(-len(prioritized) // page_size))
+        page_number = page_col.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        start = (page_number - 1) * page_size
+        visible = prioritized[start:start + page_size]
+        if page_count > 1:
+            st.caption(f"Showing {start + 1}–{start + len(visible)} of {len(prioritized)} findings")
+
+        current_severity = None
+        for priority, f in visible:
+            if f.severity != current_severity:
+                current_severity = f.severity
+                st.subheader(severity_headers[f.severity])
             with st.container():
-                c1, c2 = st.columns([3, 1])
-                with c1:
+                if f.severity == "info":
                     st.markdown(f"**{priority}. [{f.rule_id}] {f.description}**")
-                    st.markdown(f"*Location:* {f.location} | *Component:* {f.component}")
-                    st.warning(f"{f.issue}")
-                    st.markdown(f"**Fix:** {f.remediation}")
-                with c2:
-                    st.metric("Est. Time", f.estimated_fix_time)
-                st.markdown("---")
-                priority += 1
-
-    if info_findings:
-        st.subheader("\u2139\ufe0f Info — For your awareness")
-        for f in info_findings:
-            with st.container():
-                st.markdown(f"**{priority}. [{f.rule_id}] {f.description}**")
-                st.markdown(f"*Location:* {f.location}")
-                st.info(f"{f.issue}")
-                st.markdown(f"**Fix:** {f.remediation} (Est. {f.estimated_fix_time})")
+                    st.markdown(f"*Location:* {f.location}")
+                    st.info(f"{f.issue}")
+                    st.markdown(f"**Fix:** {f.remediation} (Est. {f.estimated_fix_time})")
+                else:
+                    c1, c2 = st.columns([3, 1])
+                    with c1:
+                        st.markdown(f"**{priority}. [{f.rule_id}] {f.description}**")
+                        st.markdown(f"*Location:* {f.location} | *Component:* {f.component}")
+                        if f.severity == "critical":
+                            st.error(f"**The inspector will flag this:** {f.issue}")
+                        else:
+                            st.warning(f"{f.issue}")
+                        st.markdown(f"**Fix:** {f.remediation}")
+                    with c2:
+                        st.metric("Est. Time", f.estimated_fix_time)
                 st.markdown("---")
-                priority += 1
 
     st.divider()
 
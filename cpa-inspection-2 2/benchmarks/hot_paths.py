@@ -0,0 +1,107 @@
+"""Micro-benchmarks of the CPA scan hot paths at several firm sizes.
+
+Covers ``run_scan`` end to end, assertion counting, every rule and report
+generation. Scale ``sample`` is the bundled data; numeric scales are firms of
+that many engagement files, generated with ``scale_fixtures`` into a temporary
+directory. Throughput is documents (firm documents plus engagement files) per
+second, or findings per second for the report writers::
+
+    python -m benchmarks.hot_paths [--scale sample 100 1000] [-k check_ report]
+    python -m benchmarks.hot_paths --save baselines/main.json
+    python -m benchmarks.hot_paths --compare baselines/main.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import microbench  # noqa: E402
+from scale_fixtures import generate_cpa  # noqa: E402
+
+from engine import rules  # noqa: E402
+from engine.report import generate_csv_rows, generate_report_text  # noqa: E402
+from engine.scanner import FIRM_PROFILE_ENV_VAR, _count_bool_checks, load_documents, run_scan  # noqa: E402
+from engine.sources import SOURCE_ENV_VAR  # noqa: E402
+
+FIRM_RULES = (
+    rules.check_governance,
+    rules.check_ethics,
+    rules.check_acceptance,
+    rules.check_resources,
+    rules.check_communication,
+    rules.check_monitoring,
+)
+
+
+def bench_scale(suite: microbench.Suite, scale: str, include_firm_rules: bool) -> None:
+    firm_docs, engagement_files = load_documents()
+    documents = len(firm_docs) + len(engagement_files)
+    result = run_scan()
+    findings = len(result.all_findings)
+
+    suite.bench("run_scan", scale, run_scan, documents, "docs")
+
+    def count_assertions():
+        for doc in firm_docs.values():
+            _count_bool_checks(doc)
+        for ef in engagement_files:
+            _count_bool_checks(ef.get("checks", {}))
+
+    suite.bench("_count_bool_checks", scale, count_assertions, documents, "docs")
+
+    # Firm-level rules only read the firm documents, which do not grow with the file count
+    if include_firm_rules:
+        for rule in FIRM_RULES:
+            suite.bench(rule.__name__, scale, lambda rule=rule: rule(firm_docs), len(firm_docs), "docs")
+
+    def check_files():
+        for ef in engagement_files:
+            rules.check_engagement_file(ef)
+
+    suite.bench("check_engagement_file", scale, check_files, len(engagement_files), "files")
+    suite.bench("generate_report_text", scale, lambda: generate_report_text(result), findings, "findings")
+    suite.bench("generate_csv_rows", scale, lambda: generate_csv_rows(result), findings, "findings")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", nargs="+", default=["sample", "100", "1000"],
+                        help="'sample' for the bundled data, or engagement files per generated firm")
+    parser.add_argument("--seed", type=int, default=0)
+    microbench.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    saved_env = {name: os.environ.get(name) for name in (SOURCE_ENV_VAR, FIRM_PROFILE_ENV_VAR)}
+    suite = microbench.suite_from_args(args)
+    with tempfile.TemporaryDirectory(prefix="cpa-bench-") as tmp:
+        try:
+            for i, scale in enumerate(args.scale):
+                if scale == "sample":
+                    for name in saved_env:
+                        os.environ.pop(name, None)
+                else:
+                    out = Path(tmp) / scale
+                    generate_cpa(out, firms=1, files_per_firm=int(scale), failure_rate=0.25,
+                                 warning_rate=0.25, seed=args.seed)
+                    firm_dir = out / "cpa" / "firm_0001"
+                    os.environ[SOURCE_ENV_VAR] = str(firm_dir / "documents")
+                    os.environ[FIRM_PROFILE_ENV_VAR] = str(firm_dir / "firm_profile.json")
+                bench_scale(suite, scale, include_firm_rules=i == 0)
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    return microbench.finish(suite, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Per-rerun cost of serving the ScanResult: st.cache_data copy vs st.cache_resource reference.
+
+st.cache_data keeps the pickled return value and unpickles a fresh copy on
+every hit; st.cache_resource hands back the same object. This measures both
+access paths (and the resulting per-session memory) at several scan sizes::
+
+    python -m benchmarks.rerun_cost [--scale 1 10 100] [--repeat 50]
+"""
+
+import argparse
+import pickle
+import sys
+import timeit
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.scanner import run_scan  # noqa: E402
+
+
+def scaled_result(base, scale: int):
+    """Replicate the engagement files ``scale`` times, as a firm with more files would produce."""
+    file_results = tuple(
+        replace(fr, file_id=f"{fr.file_id}-{i}")
+        for i in range(scale)
+        for fr in base.file_results
+    )
+    all_findings = tuple(f for c in base.components for f in c.findings) + tuple(
+        f for fr in file_results for f in fr.findings
+    )
+    return replace(base, file_results=file_results, all_findings=all_findings, files_scanned=len(file_results))
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    base = run_scan()
+    print(f"{'files':>7} {'findings':>9} {'pickle KB':>10} {'cache_data us':>14} {'cache_resource us':>18}")
+    for scale in args.scale:
+        result = scaled_result(base, scale)
+        blob = pickle.dumps(result)
+        shared = {"scan": result}
+        copy_us = min(timeit.repeat(lambda: pickle.loads(blob), number=1, repeat=args.repeat)) * 1e6
+        ref_us = min(timeit.repeat(lambda: shared["scan"], number=1, repeat=args.repeat)) * 1e6
+        print(
+            f"{result.files_scanned:>7} {len(result.all_findings):>9} {len(blob) / 1024:>10.1f} "
+            f"{copy_us:>14.1f} {ref_us:>18.2f}"
+        )
+    print("cache_data also keeps one unpickled copy per session; cache_resource keeps one in total.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
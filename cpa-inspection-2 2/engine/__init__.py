@@ -0,0 +1,13 @@
+"""CPA practice inspection engine: document sources, rules, scanning and reporting.
+
+The engine shares ``branding`` and ``fingerprint`` with the SR&ED app; they
+live at the suite root, one level above this app, and are made importable
+here once rather than by each module that needs them.
+"""
+
+import sys
+from pathlib import Path
+
+SUITE_ROOT = Path(__file__).resolve().parents[2]
+if str(SUITE_ROOT) not in sys.path:
+    sys.path.append(str(SUITE_ROOT))
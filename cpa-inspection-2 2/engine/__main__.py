@@ -0,0 +1,116 @@
+"""Headless scanner: run the inspection scan for one or more firms without the Streamlit app.
+
+A data root is a directory holding ``firm_profile.json`` and a ``documents/``
+tree (``firm_level/`` and ``engagement_files/``), like the bundled ``data/``
+directory or a firm written by ``scale_fixtures.py``. With no root, the
+configured source (CPA_DOCUMENT_STORE / CPA_DOCUMENT_SOURCE / CPA_FIRM_PROFILE,
+else the bundled data) is scanned::
+
+    python -m engine                                   # summary of the configured firm
+    python -m engine firms/a firms/b --out reports/    # scan.json, report.txt, findings.csv per firm
+    python -m engine --format json --out - firms/a     # JSON result on stdout
+    python -m engine firms/* --fail-under 70           # exit 1 if any firm scores below 70
+
+Only the engine is imported (no Streamlit, pandas or plotly), so a scan
+starts in a fraction of a second and many firms can be scanned in one process.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from engine import metrics as scan_metrics
+from engine.models import ScanResult, scan_result_to_dict
+from engine.report import generate_csv_rows, generate_report_text
+from engine.scanner import data_root, is_data_root, run_scan
+
+FORMATS = ("json", "text", "csv")
+OUTPUT_NAMES = {"json": "scan.json", "text": "report.txt", "csv": "findings.csv"}
+CSV_COLUMNS = ("Priority", "Rule ID", "Description", "Location", "Component", "Issue", "Remediation", "Est. Fix Time")
+
+
+def render(result: ScanResult, fmt: str) -> str:
+    if fmt == "json":
+        return json.dumps(scan_result_to_dict(result), indent=2)
+    if fmt == "text":
+        return generate_report_text(result) + "\n"
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(generate_csv_rows(result))
+    return buffer.getvalue()
+
+
+def scan(root: Path | None, use_cache: bool, metrics: scan_metrics.ScanMetrics | None) -> ScanResult:
+    with data_root(root):
+        if use_cache:
+            from engine.cache import load_or_run_scan
+
+            return load_or_run_scan()
+        return run_scan(metrics)
+
+
+def summary_line(label: str, result: ScanResult, seconds: float) -> str:
+    return (
+        f"{label}: {result.firm_name} | readiness {result.readiness_score} | {result.predicted_outcome} | "
+        f"{result.critical_count} critical, {result.warning_count} warning, {result.info_count} info | "
+        f"{result.files_scanned} files in {seconds * 1000:.0f} ms"
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m engine", description=__doc__.splitlines()[0])
+    parser.add_argument("roots", nargs="*", type=Path, help="data roots to scan (default: the configured source)")
+    parser.add_argument("--out", help="output directory (one subdirectory per root), or - for stdout")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=list(FORMATS), help="outputs to write")
+    parser.add_argument("--cache", action="store_true", help="serve unchanged inputs from the persistent scan cache")
+    parser.add_argument("--metrics", type=Path, help="write per-rule timings here (Prometheus text, or JSON for .json)")
+    parser.add_argument("--fail-under", type=int, help="exit 1 if any firm's readiness score is below this")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no summary lines")
+    args = parser.parse_args(argv)
+
+    if args.out == "-" and (len(args.roots) > 1 or len(args.format) > 1):
+        parser.error("--out - writes a single format for a single root")
+    if args.cache and args.metrics:
+        parser.error("--metrics needs a fresh scan; drop --cache")
+    for root in args.roots:
+        if not is_data_root(root):
+            parser.error(f"{root} is not a data root (needs firm_profile.json and documents/)")
+
+    failing = 0
+    for root in args.roots or [None]:
+        label = str(root) if root is not None else "configured source"
+        metrics = scan_metrics.ScanMetrics() if args.metrics else None
+        start = time.perf_counter()
+        result = scan(root, args.cache, metrics)
+        elapsed = time.perf_counter() - start
+
+        if args.out == "-":
+            sys.stdout.write(render(result, args.format[0]))
+        elif args.out:
+            out_dir = Path(args.out) / (root.resolve().name if root is not None else "configured")
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for fmt in args.format:
+                (out_dir / OUTPUT_NAMES[fmt]).write_text(render(result, fmt), encoding="utf-8")
+        if metrics is not None:
+            path = args.metrics if len(args.roots) <= 1 else args.metrics.with_name(f"{root.resolve().name}-{args.metrics.name}")
+            metrics.write(path)
+
+        if not args.quiet and args.out != "-":
+            print(summary_line(label, result, elapsed))
+        elif not args.quiet:
+            print(summary_line(label, result, elapsed), file=sys.stderr)
+        for skipped in result.skipped_documents:
+            print(f"{label}: skipped {skipped}", file=sys.stderr)
+        if args.fail_under is not None and result.readiness_score < args.fail_under:
+            failing += 1
+
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,133 @@
+"""Persistent, content-addressed cache of ScanResults that survives process restarts.
+
+Entries are keyed by a data-version fingerprint of every scan input (firm
+profile and the firm-level and engagement documents from the configured
+document source) plus the rules version, the engine source (rules, scanner,
+document decoding and schemas) and the CSQM 1 policy file, so any change to
+inputs or to how they are read and scored produces a new key. Entries are
+zlib-compressed JSON, written atomically, and evicted oldest-first once the
+cache directory exceeds its size budget.
+"""
+
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+
+import xxhash
+
+from engine.models import ScanResult, scan_result_from_dict, scan_result_to_dict
+from engine.scanner import DATA_DIR, firm_profile_path, run_scan
+from engine.sources import configured_source
+from fingerprint import fingerprint
+
+# Bump when scoring or finding semantics change without a source change here.
+RULES_VERSION = "1"
+
+ENGINE_DIR = Path(__file__).parent
+POLICY_FILE = DATA_DIR / "policies" / "csqm1_full.yaml"
+# Every engine module: results depend on decoding (sources, store) and validation (schemas) as
+# much as on the rules
+ENGINE_SOURCES = sorted(ENGINE_DIR.glob("*.py"))
+
+CACHE_DIR = Path(os.environ.get("CPA_SCAN_CACHE_DIR", DATA_DIR.parent / ".scan_cache"))
+CACHE_MAX_BYTES = int(os.environ.get("CPA_SCAN_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+ENTRY_SUFFIX = ".json.z"
+
+
+def scan_input_key() -> str:
+    """
+    Data version of every scan input plus the rules/policy version.
+
+    Cheap to recompute on every rerun: local inputs are fingerprinted
+    incrementally (a stat per unchanged file), and an HTTP source is versioned
+    from its listing or validators and reused for a short TTL (see
+    engine.sources) instead of being downloaded.
+    """
+    h = xxhash.xxh3_128()
+    h.update(f"rules:{RULES_VERSION}\0".encode("utf-8"))
+    h.update(fingerprint(*ENGINE_SOURCES, POLICY_FILE, firm_profile_path()).encode("utf-8"))
+    with configured_source() as source:
+        h.update(source.data_version().encode("utf-8"))
+    return h.hexdigest()
+
+
+def _entry_path(key: str, cache_dir: Path) -> Path:
+    return cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+
+def get(key: str, cache_dir: Path = CACHE_DIR) -> ScanResult | None:
+    """Return the cached ScanResult for ``key``, or None on a miss or unreadable entry."""
+    path = _entry_path(key, cache_dir)
+    try:
+        payload = path.read_bytes()
+        result = scan_result_from_dict(json.loads(zlib.decompress(payload)))
+    except (OSError, ValueError, TypeError, zlib.error):
+        return None
+    try:
+        os.utime(path)  # mark as recently used for eviction
+    except OSError:
+        pass
+    return result
+
+
+def put(key: str, result: ScanResult, cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES) -> None:
+    """Atomically write ``result`` under ``key``, then evict old entries beyond ``max_bytes``."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    payload = zlib.compress(
+        json.dumps(scan_result_to_dict(result), separators=(",", ":")).encode("utf-8"), 6
+    )
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-", suffix=ENTRY_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, _entry_path(key, cache_dir))
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES) -> int:
+    """Delete least-recently-used entries until the cache fits in ``max_bytes``. Returns entries removed."""
+    entries = []
+    for path in cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+        if path.name.startswith(".tmp-"):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def load_or_run_scan(cache_dir: Path = CACHE_DIR, key: str | None = None) -> ScanResult:
+    """Serve the scan for the current inputs from disk, running and storing it on a miss."""
+    key = key or scan_input_key()
+    result = get(key, cache_dir)
+    if result is None:
+        result = run_scan()
+        try:
+            put(key, result, cache_dir)
+        except OSError:
+            pass  # a read-only or full disk must not break the scan
+    return result
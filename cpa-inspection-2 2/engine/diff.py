@@ -0,0 +1,93 @@
+"""Scan-to-scan diff of findings keyed by a stable finding identity.
+
+A finding's identity is its rule, the kind of location it was raised against
+(firm-level or an engagement file) and a normalized entity key: the entity
+set by per-entity rules (the person, policy or remediation entry), else the
+file id for engagement files, else the whitespace/case-normalized location.
+The identity survives re-wording of the issue text and client-name edits, so
+two scans are compared in a single O(n) pass over hashed identities.
+"""
+
+import re
+from dataclasses import astuple, dataclass, field
+
+from engine.models import Finding, ScanResult
+
+FIRM_LEVEL = "Firm-Level"
+_FILE_ID_RE = re.compile(r"\(([A-Z]+-[0-9A-Za-z-]+)\)\s*$")
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def entity_key(location: str) -> str:
+    """Normalized entity a finding points at: the file id when present, else the location text."""
+    match = _FILE_ID_RE.search(location)
+    if match:
+        return match.group(1)
+    return _NON_WORD_RE.sub("-", location.casefold()).strip("-")
+
+
+def finding_identity(finding: Finding) -> tuple[str, str, str]:
+    """Stable ``(rule_id, location kind, entity key)`` identity of one finding."""
+    scope = "firm" if finding.location == FIRM_LEVEL else "file"
+    key = entity_key(finding.entity) if finding.entity else entity_key(finding.location)
+    if finding.entity and scope == "file":
+        key = f"{entity_key(finding.location)}/{key}"
+    return finding.rule_id.upper(), scope, key
+
+
+def _index(findings: list[Finding]) -> dict:
+    """Map identity -> finding; identities a rule repeats without an entity get an occurrence suffix."""
+    indexed = {}
+    seen: dict = {}
+    for f in findings:
+        identity = finding_identity(f)
+        n = seen.get(identity, 0)
+        seen[identity] = n + 1
+        indexed[identity + (n,)] = f
+    return indexed
+
+
+@dataclass
+class ScanDiff:
+    added: list[Finding] = field(default_factory=list)
+    resolved: list[Finding] = field(default_factory=list)
+    changed: list[tuple[Finding, Finding]] = field(default_factory=list)  # (before, after)
+    unchanged_count: int = 0
+    score_delta: float = 0.0
+    post_fix_delta: float = 0.0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.resolved or self.changed or self.score_delta)
+
+
+def diff_findings(
+    old: list[Finding],
+    new: list[Finding],
+    score_delta: float = 0.0,
+    post_fix_delta: float = 0.0,
+) -> ScanDiff:
+    """Compare two finding lists by identity. Added/changed keep the new scan's order."""
+    before = _index(old)
+    after = _index(new)
+    diff = ScanDiff(score_delta=score_delta, post_fix_delta=post_fix_delta)
+    for key, f in after.items():
+        prior = before.get(key)
+        if prior is None:
+            diff.added.append(f)
+        elif astuple(prior) != astuple(f):
+            diff.changed.append((prior, f))
+        else:
+            diff.unchanged_count += 1
+    diff.resolved = [f for key, f in before.items() if key not in after]
+    return diff
+
+
+def diff_scans(old: ScanResult, new: ScanResult) -> ScanDiff:
+    """Findings added, resolved and changed from ``old`` to ``new``, plus the score deltas."""
+    return diff_findings(
+        old.all_findings,
+        new.all_findings,
+        score_delta=round(new.readiness_score - old.readiness_score, 1),
+        post_fix_delta=round(new.post_fix_score - old.post_fix_score, 1),
+    )
@@ -0,0 +1,233 @@
+"""Append-only scan history: compact per-firm snapshots with delta-encoded findings.
+
+Each snapshot row carries the scan aggregates (score, counts) as plain
+indexed columns, so trend queries never touch finding payloads. Findings are
+stored as a zlib-compressed delta against the firm's previous snapshot
+(findings added with their positions, content hashes removed), so a snapshot
+costs O(changes); the order of unchanged findings is carried over from the
+previous snapshot. A full keyframe is written every ``KEYFRAME_INTERVAL``
+snapshots to bound reconstruction cost, and whenever unchanged findings were
+reordered or a finding repeats, which a delta cannot express.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from engine.models import Finding, ScanResult
+from engine.scanner import DATA_DIR
+
+HISTORY_DB = Path(os.environ.get("CPA_SCAN_HISTORY_DB", DATA_DIR.parent / ".scan_history.db"))
+KEYFRAME_INTERVAL = 20
+
+AGGREGATE_COLUMNS = (
+    "readiness_score",
+    "post_fix_score",
+    "critical_count",
+    "warning_count",
+    "info_count",
+    "total_assertions",
+    "passed_assertions",
+    "files_scanned",
+    "findings_total",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    firm TEXT NOT NULL,
+    scanned_at TEXT NOT NULL,
+    input_key TEXT,
+    readiness_score REAL NOT NULL,
+    post_fix_score REAL NOT NULL,
+    critical_count INTEGER NOT NULL,
+    warning_count INTEGER NOT NULL,
+    info_count INTEGER NOT NULL,
+    total_assertions INTEGER NOT NULL,
+    passed_assertions INTEGER NOT NULL,
+    files_scanned INTEGER NOT NULL,
+    findings_total INTEGER NOT NULL,
+    base_id INTEGER REFERENCES snapshots (id),
+    keyframe INTEGER NOT NULL,
+    findings BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_firm_time ON snapshots (firm, scanned_at);
+"""
+
+
+def finding_hash(finding: dict) -> str:
+    """Content hash of one finding, used to encode removals in a delta."""
+    payload = json.dumps(finding, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _pack(obj) -> bytes:
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+def _delta(previous: list[str], order: list[str], findings: list[dict]) -> dict | None:
+    """Delta from the ``previous`` hash order to ``order``, or None when only a keyframe can encode it."""
+    previous_set, current_set = set(previous), set(order)
+    if len(previous_set) != len(previous) or len(current_set) != len(order):
+        return None
+    # Unchanged findings must keep their relative order; the delta does not store it
+    if [h for h in order if h in previous_set] != [h for h in previous if h in current_set]:
+        return None
+    return {
+        "added": [[i, f] for i, (h, f) in enumerate(zip(order, findings)) if h not in previous_set],
+        "removed": [h for h in previous if h not in current_set],
+    }
+
+
+class ScanHistory:
+    """SQLite-backed, append-only history of scan snapshots."""
+
+    def __init__(self, path: Path | str = HISTORY_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ScanHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _latest(self, firm: str):
+        return self.conn.execute(
+            "SELECT id, input_key, keyframe FROM snapshots WHERE firm = ? ORDER BY scanned_at DESC, id DESC LIMIT 1",
+            (firm,),
+        ).fetchone()
+
+    def _chain_length(self, snapshot_id: int) -> int:
+        """Deltas applied since the last keyframe, including ``snapshot_id`` itself."""
+        length = 0
+        current = snapshot_id
+        while current is not None:
+            base_id, keyframe = self.conn.execute(
+                "SELECT base_id, keyframe FROM snapshots WHERE id = ?", (current,)
+            ).fetchone()
+            if keyframe:
+                return length
+            length += 1
+            current = base_id
+        return length
+
+    def record(self, result: ScanResult, input_key: str | None = None, scanned_at: datetime | None = None) -> int | None:
+        """
+        Append a snapshot of ``result``. Returns its id, or None when the
+        firm's latest snapshot already has the same ``input_key``.
+        """
+        firm = result.license_number
+        scanned_at = (scanned_at or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+        findings = [asdict(f) for f in result.all_findings]
+
+        latest = self._latest(firm)
+        if latest and input_key and latest[1] == input_key:
+            return None
+
+        payload = None
+        if latest is not None and self._chain_length(latest[0]) + 1 < KEYFRAME_INTERVAL:
+            previous = [finding_hash(f) for f in self.findings(latest[0], as_dicts=True)]
+            payload = _delta(previous, [finding_hash(f) for f in findings], findings)
+        if payload is None:
+            base_id, keyframe, payload = None, 1, {"findings": findings}
+        else:
+            base_id, keyframe = latest[0], 0
+
+        with self.conn:
+            cur = self.conn.execute(
+                f"INSERT INTO snapshots (firm, scanned_at, input_key, {', '.join(AGGREGATE_COLUMNS)}, "
+                f"base_id, keyframe, findings) VALUES ({', '.join('?' * (len(AGGREGATE_COLUMNS) + 6))})",
+                (
+                    firm, scanned_at, input_key,
+                    result.readiness_score, result.post_fix_score,
+                    result.critical_count, result.warning_count, result.info_count,
+                    result.total_assertions, result.passed_assertions,
+                    result.files_scanned, len(findings),
+                    base_id, keyframe, _pack(payload),
+                ),
+            )
+        return cur.lastrowid
+
+    def aggregates(self, firm: str, start: str | None = None, end: str | None = None) -> list[dict]:
+        """Aggregate columns for ``firm`` within [start, end] (ISO timestamps), oldest first."""
+        clauses = ["firm = ?"]
+        params: list = [firm]
+        if start:
+            clauses.append("scanned_at >= ?")
+            params.append(start)
+        if end:
+            clauses.append("scanned_at <= ?")
+            params.append(end)
+        columns = ("id", "scanned_at") + AGGREGATE_COLUMNS
+        cur = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM snapshots WHERE {' AND '.join(clauses)} ORDER BY scanned_at, id",
+            params,
+        )
+        return [dict(zip(columns, row)) for row in cur]
+
+    def previous(self, firm: str) -> dict | None:
+        """
+        Aggregates of the snapshot before the firm's latest one. Consecutive
+        snapshots never share an input key, so this is the last scan of
+        different inputs.
+        """
+        columns = ("id", "scanned_at") + AGGREGATE_COLUMNS
+        row = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM snapshots WHERE firm = ? "
+            "ORDER BY scanned_at DESC, id DESC LIMIT 1 OFFSET 1",
+            (firm,),
+        ).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def findings(self, snapshot_id: int, as_dicts: bool = False) -> list:
+        """Reconstruct a snapshot's findings by replaying deltas from its keyframe."""
+        chain = []
+        current = snapshot_id
+        while current is not None:
+            row = self.conn.execute(
+                "SELECT base_id, keyframe, findings FROM snapshots WHERE id = ?", (current,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown snapshot id: {current}")
+            base_id, keyframe, blob = row
+            chain.append(_unpack(blob))
+            current = None if keyframe else base_id
+
+        keyframe_payload = chain.pop()
+        order = [finding_hash(f) for f in keyframe_payload["findings"]]
+        by_hash = dict(zip(order, keyframe_payload["findings"]))
+        for delta in reversed(chain):
+            removed = set(delta["removed"])
+            for h in removed:
+                by_hash.pop(h, None)
+            order = [h for h in order if h not in removed]
+            for position, f in delta["added"]:
+                h = finding_hash(f)
+                by_hash[h] = f
+                order.insert(position, h)
+        findings = [by_hash[h] for h in order]
+        return findings if as_dicts else [Finding(**f) for f in findings]
+
+
+def record_scan(result: ScanResult, input_key: str | None = None, path: Path | str = HISTORY_DB) -> int | None:
+    """Append ``result`` to the history database; never raises on storage errors."""
+    try:
+        with ScanHistory(path) as history:
+            return history.record(result, input_key=input_key)
+    except (OSError, sqlite3.Error):
+        return None
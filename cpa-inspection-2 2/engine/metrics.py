@@ -0,0 +1,184 @@
+"""Per-rule and per-phase scan instrumentation, exportable as JSON or Prometheus text.
+
+Instrumentation is off unless a ``ScanMetrics`` collector is active for the
+current context (``run_scan(metrics=...)``, or ``CPA_SCAN_METRICS=1`` for every
+scan). While it is off, an instrumented rule costs one context-variable lookup
+and a scan phase a shared no-op context manager.
+
+When ``CPA_SCAN_METRICS_FILE`` is set, each instrumented scan also writes its
+metrics there (Prometheus text format, or JSON for a ``.json`` path), atomically,
+so a node_exporter textfile collector or log shipper can pick them up.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+METRICS_ENV = "CPA_SCAN_METRICS"
+METRICS_FILE_ENV = "CPA_SCAN_METRICS_FILE"
+PROMETHEUS_PREFIX = "cpa_scan"
+
+_active: contextvars.ContextVar["ScanMetrics | None"] = contextvars.ContextVar("scan_metrics", default=None)
+_NULL_PHASE = contextlib.nullcontext()
+
+# Most recently completed instrumented scan in this process
+last_scan_metrics: "ScanMetrics | None" = None
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    seconds: float = 0.0
+    findings: int = 0
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class ScanMetrics:
+    """Timings and counters collected over one scan."""
+
+    rules: dict[str, RuleStats] = field(default_factory=dict)
+    phases: dict[str, PhaseStats] = field(default_factory=dict)
+    started_at: float = 0.0  # unix time
+    total_seconds: float = 0.0
+
+    def record_rule(self, name: str, elapsed_ns: int, findings: int) -> None:
+        stats = self.rules.get(name)
+        if stats is None:
+            stats = self.rules[name] = RuleStats()
+        stats.calls += 1
+        stats.seconds += elapsed_ns / 1e9
+        stats.findings += findings
+
+    def record_phase(self, name: str, elapsed_ns: int) -> None:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stats.calls += 1
+        stats.seconds += elapsed_ns / 1e9
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "total_seconds": self.total_seconds,
+            "phases": {name: vars(s).copy() for name, s in self.phases.items()},
+            "rules": {name: vars(s).copy() for name, s in self.rules.items()},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """Prometheus text exposition format (one gauge family per measurement)."""
+        lines = []
+
+        def family(name: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        family("duration_seconds", "Wall time of the last instrumented scan.", [("", self.total_seconds)])
+        family("last_run_timestamp_seconds", "Unix time the last instrumented scan started.", [("", self.started_at)])
+        family("phase_seconds", "Wall time per scan phase.",
+               [(f'{{phase="{n}"}}', s.seconds) for n, s in self.phases.items()])
+        family("rule_seconds", "Wall time per rule, summed over its calls.",
+               [(f'{{rule="{n}"}}', s.seconds) for n, s in self.rules.items()])
+        family("rule_calls", "Invocations per rule.",
+               [(f'{{rule="{n}"}}', s.calls) for n, s in self.rules.items()])
+        family("rule_findings", "Findings emitted per rule.",
+               [(f'{{rule="{n}"}}', s.findings) for n, s in self.rules.items()])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | os.PathLike) -> None:
+        """Atomically write the metrics to ``path`` (JSON for .json, else Prometheus text)."""
+        path = Path(path)
+        text = self.to_json() if path.suffix == ".json" else self.to_prometheus()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+
+def enabled_by_env() -> bool:
+    return os.environ.get(METRICS_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+@contextlib.contextmanager
+def collecting(metrics: ScanMetrics):
+    """Make ``metrics`` the active collector for the duration of one scan."""
+    global last_scan_metrics
+    token = _active.set(metrics)
+    metrics.started_at = time.time()
+    start = time.perf_counter_ns()
+    try:
+        yield metrics
+    finally:
+        metrics.total_seconds = (time.perf_counter_ns() - start) / 1e9
+        _active.reset(token)
+    last_scan_metrics = metrics
+    export_path = os.environ.get(METRICS_FILE_ENV)
+    if export_path:
+        try:
+            metrics.write(export_path)
+        except OSError as exc:  # metrics must never break a scan
+            print(f"Could not write scan metrics to {export_path}: {exc}", file=sys.stderr)
+
+
+def phase(name: str):
+    """Context manager timing one scan phase (a shared no-op when not collecting)."""
+    metrics = _active.get()
+    if metrics is None:
+        return _NULL_PHASE
+    return _Phase(metrics, name)
+
+
+class _Phase:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: ScanMetrics, name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record_phase(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+def instrumented_rule(rule):
+    """Decorator recording a rule's wall time, call count and findings emitted."""
+    name = rule.__name__
+
+    @functools.wraps(rule)
+    def wrapper(*args, **kwargs):
+        metrics = _active.get()
+        if metrics is None:
+            return rule(*args, **kwargs)
+        start = time.perf_counter_ns()
+        findings = rule(*args, **kwargs)
+        metrics.record_rule(name, time.perf_counter_ns() - start, len(findings))
+        return findings
+
+    return wrapper
@@ -1,7 +1,7 @@
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass
 
 
-@dataclass
+@dataclass(frozen=True)
 class Finding:
     rule_id: str
     description: str
@@ -11,13 +11,14 @@ class Finding:
     issue: str
     remediation: str
     estimated_fix_time: str
+    entity: str = ""  # person, policy or log entry for rules that raise one finding per entity
 
 
-@dataclass
+@dataclass(frozen=True)
 class ComponentResult:
     name: str
     description: str
-    findings: list[Finding] = field(default_factory=list)
+    findings: tuple[Finding, ...] = ()
 
     @property
     def status(self) -> str:
@@ -37,7 +38,7 @@ class ComponentResult:
         return sum(1 for f in self.findings if f.severity == "warning")
 
 
-@dataclass
+@dataclass(frozen=True)
 class FileResult:
     file_id: str
     client_name: str
@@ -48,10 +49,10 @@ class FileResult:
     assertions_passed: int
     assertions_total: int
     overall_status: str
-    findings: list[Finding] = field(default_factory=list)
+    findings: tuple[Finding, ...] = ()
 
 
-@dataclass
+@dataclass(frozen=True)
 class ScanResult:
     firm_name: str
     license_number: str
@@ -68,6 +69,28 @@ class ScanResult:
     post_fix_score: float = 0.0
     post_fix_outcome: str = ""
     estimated_fix_hours: float = 0.0
-    components: list[ComponentResult] = field(default_factory=list)
-    file_results: list[FileResult] = field(default_factory=list)
-    all_findings: list[Finding] = field(default_factory=list)
+    components: tuple[ComponentResult, ...] = ()
+    file_results: tuple[FileResult, ...] = ()
+    all_findings: tuple[Finding, ...] = ()
+    skipped_documents: tuple[str, ...] = ()  # firm-level documents of an unknown type, with the reason
+
+
+def scan_result_to_dict(result: ScanResult) -> dict:
+    """Plain-dict form of a ScanResult, safe to serialize as JSON."""
+    return asdict(result)
+
+
+def scan_result_from_dict(data: dict) -> ScanResult:
+    """Rebuild a frozen ScanResult (and its nested findings) from scan_result_to_dict output."""
+    data = dict(data)
+    data["components"] = tuple(
+        ComponentResult(**{**c, "findings": tuple(Finding(**f) for f in c["findings"])})
+        for c in data.get("components", ())
+    )
+    data["file_results"] = tuple(
+        FileResult(**{**fr, "findings": tuple(Finding(**f) for f in fr["findings"])})
+        for fr in data.get("file_results", ())
+    )
+    data["all_findings"] = tuple(Finding(**f) for f in data.get("all_findings", ()))
+    data["skipped_documents"] = tuple(data.get("skipped_documents", ()))
+    return ScanResult(**data)
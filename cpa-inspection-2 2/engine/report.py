@@ -1,16 +1,18 @@
 """Generate inspection readiness report text from scan results."""
 
 from datetime import date
-from pathlib import Path
-import sys
 
-from engine.models import ScanResult
+from branding import powered_by_text
+from engine.models import Finding, ScanResult
 
-ROOT_DIR = Path(__file__).resolve().parents[2]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
 
-from branding import powered_by_text
+SEVERITY_ORDER = ("critical", "warning", "info")
+
+
+def prioritized_findings(result: ScanResult) -> list[tuple[int, Finding]]:
+    """All findings as (priority, finding): critical, then warning, then info, in scan order within each."""
+    ordered = [f for severity in SEVERITY_ORDER for f in result.all_findings if f.severity == severity]
+    return list(enumerate(ordered, 1))
 
 
 def generate_report_text(result: ScanResult) -> str:
@@ -82,26 +84,8 @@ def generate_report_text(result: ScanResult) -> str:
     lines.append("-" * 70)
     lines.append("")
 
-    critical_findings = [f for f in result.all_findings if f.severity == "critical"]
-    warning_findings = [f for f in result.all_findings if f.severity == "warning"]
-    info_findings = [f for f in result.all_findings if f.severity == "info"]
-
-    for i, f in enumerate(critical_findings, 1):
-        lines.append(f"{i}. [CRITICAL] {f.rule_id} — {f.location}")
-        lines.append(f"   Issue: {f.issue}")
-        lines.append(f"   Fix: {f.remediation}")
-        lines.append(f"   Est. Time: {f.estimated_fix_time}")
-        lines.append("")
-
-    for i, f in enumerate(warning_findings, len(critical_findings) + 1):
-        lines.append(f"{i}. [WARNING] {f.rule_id} — {f.location}")
-        lines.append(f"   Issue: {f.issue}")
-        lines.append(f"   Fix: {f.remediation}")
-        lines.append(f"   Est. Time: {f.estimated_fix_time}")
-        lines.append("")
-
-    for i, f in enumerate(info_findings, len(critical_findings) + len(warning_findings) + 1):
-        lines.append(f"{i}. [INFO] {f.rule_id} — {f.location}")
+    for i, f in prioritized_findings(result):
+        lines.append(f"{i}. [{f.severity.upper()}] {f.rule_id} — {f.location}")
         lines.append(f"   Issue: {f.issue}")
         lines.append(f"   Fix: {f.remediation}")
         lines.append(f"   Est. Time: {f.estimated_fix_time}")
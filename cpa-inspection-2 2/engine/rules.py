@@ -1,5 +1,6 @@
 """CPA Practice Inspection rules — hardcoded checks against JSON document metadata."""
 
+from engine.metrics import instrumented_rule
 from engine.models import Finding
 
 
@@ -7,6 +8,7 @@ from engine.models import Finding
 # Firm-Level Rules
 # ---------------------------------------------------------------------------
 
+@instrumented_rule
 def check_governance(docs: dict) -> list[Finding]:
     findings = []
     gov = docs.get("governance_policies", {})
@@ -38,6 +40,7 @@ def check_governance(docs: dict) -> list[Finding]:
     return findings
 
 
+@instrumented_rule
 def check_ethics(docs: dict) -> list[Finding]:
     findings = []
     indep = docs.get("independence_declarations", {})
@@ -67,6 +70,7 @@ def check_ethics(docs: dict) -> list[Finding]:
                 issue=d.get("issue", f"{d['person']}'s declaration was signed late."),
                 remediation="Ensure all declarations are signed at the start of the coverage period, before any engagement work begins.",
                 estimated_fix_time="30 minutes",
+                entity=d["person"],
             ))
 
     # ETH-03: Conflict register
@@ -82,6 +86,7 @@ def check_ethics(docs: dict) -> list[Finding]:
     return findings
 
 
+@instrumented_rule
 def check_acceptance(docs: dict) -> list[Finding]:
     findings = []
     forms = docs.get("client_acceptance_forms", {}).get("forms", [])
@@ -126,6 +131,7 @@ def check_acceptance(docs: dict) -> list[Finding]:
     return findings
 
 
+@instrumented_rule
 def check_resources(docs: dict) -> list[Finding]:
     findings = []
     cpd = docs.get("cpd_records", {})
@@ -159,6 +165,7 @@ def check_resources(docs: dict) -> list[Finding]:
     return findings
 
 
+@instrumented_rule
 def check_communication(docs: dict) -> list[Finding]:
     findings = []
     pdl = docs.get("policy_distribution_log", {})
@@ -183,6 +190,7 @@ def check_communication(docs: dict) -> list[Finding]:
                     issue=dist.get("issue", f"Missing acknowledgment from: {', '.join(missing)}"),
                     remediation="Distribute policies to new hires and obtain written acknowledgment.",
                     estimated_fix_time="30 minutes",
+                    entity=" ".join(str(v) for v in (dist.get("policy"), dist.get("date_distributed")) if v),
                 ))
 
     complaints = docs.get("complaints_procedure", {})
@@ -197,6 +205,7 @@ def check_communication(docs: dict) -> list[Finding]:
     return findings
 
 
+@instrumented_rule
 def check_monitoring(docs: dict) -> list[Finding]:
     findings = []
     mon = docs.get("monitoring_log", {})
@@ -258,6 +267,7 @@ def check_monitoring(docs: dict) -> list[Finding]:
                 issue=e.get("issue", f"Open deficiency without corrective action: {e.get('deficiency', '')}"),
                 remediation="Document corrective action for each identified deficiency. The inspector will flag open items with no response.",
                 estimated_fix_time="1 hour",
+                entity=str(e["id"]) if e.get("id") is not None else e.get("deficiency", ""),
             ))
 
     missing_root_cause = [e for e in entries if e.get("status") == "open" and not e.get("root_cause")]
@@ -277,6 +287,7 @@ def check_monitoring(docs: dict) -> list[Finding]:
 # Engagement File Rules
 # ---------------------------------------------------------------------------
 
+@instrumented_rule
 def check_engagement_file(file_data: dict) -> list[Finding]:
     findings = []
     client = file_data.get("client_name", "Unknown")
@@ -1,9 +1,14 @@
 """Core scanning logic — loads CPA documents and runs inspection rules."""
 
+import contextlib
 import json
+import os
 from pathlib import Path
 
+from engine import metrics as scan_metrics
 from engine.models import ScanResult, ComponentResult, FileResult, Finding
+from engine.sources import SOURCE_ENV_VAR, configured_source
+from engine.store import STORE_ENV_VAR, DocumentStore, configured_store_path
 from engine.rules import (
     check_governance,
     check_ethics,
@@ -15,6 +20,7 @@ from engine.rules import (
 )
 
 DATA_DIR = Path(__file__).parent.parent / "data"
+FIRM_PROFILE_ENV_VAR = "CPA_FIRM_PROFILE"
 
 
 def load_json(path: Path) -> dict:
@@ -22,24 +28,83 @@ def load_json(path: Path) -> dict:
         return json.load(f)
 
 
+def firm_profile_path() -> Path:
+    """The firm profile selected by CPA_FIRM_PROFILE, or the bundled one."""
+    return Path(os.environ.get(FIRM_PROFILE_ENV_VAR) or DATA_DIR / "firm_profile.json")
+
+
+def is_data_root(root: Path) -> bool:
+    """A data root holds ``firm_profile.json`` and a ``documents/`` tree, like the bundled ``data/``."""
+    return (root / "firm_profile.json").is_file() and (root / "documents").is_dir()
+
+
+@contextlib.contextmanager
+def scan_inputs(store: str | None = None, source: str | None = None, firm_profile: str | None = None):
+    """
+    Select the scanner's inputs for the duration of the block.
+
+    The arguments mean what CPA_DOCUMENT_STORE, CPA_DOCUMENT_SOURCE and
+    CPA_FIRM_PROFILE do; None leaves that input at its default.
+    """
+    overrides = {STORE_ENV_VAR: store, SOURCE_ENV_VAR: source, FIRM_PROFILE_ENV_VAR: firm_profile}
+    saved = {name: os.environ.get(name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def data_root(root: Path | None):
+    """Point the scanner's inputs at ``root`` for the duration of the block (no-op for None)."""
+    if root is None:
+        return contextlib.nullcontext()
+    return scan_inputs(source=str(root / "documents"), firm_profile=str(root / "firm_profile.json"))
+
+
+def _open_store() -> DocumentStore | None:
+    """Open the SQLite document store when CPA_DOCUMENT_STORE points at one."""
+    path = configured_store_path()
+    return DocumentStore(path) if path else None
+
+
 def load_firm_docs() -> dict:
     """Load all firm-level documents into a dict keyed by document_type."""
-    firm_dir = DATA_DIR / "documents" / "firm_level"
-    docs = {}
-    for p in firm_dir.glob("*.json"):
-        data = load_json(p)
-        doc_type = data.get("document_type", p.stem)
-        docs[doc_type] = data
-    return docs
+    with configured_source() as source:
+        return source.firm_docs()
 
 
 def load_engagement_files() -> list[dict]:
-    """Load all engagement file JSONs."""
-    eng_dir = DATA_DIR / "documents" / "engagement_files"
-    files = []
-    for p in sorted(eng_dir.glob("*.json")):
-        files.append(load_json(p))
-    return files
+    """Load all engagement file JSONs, ordered by document name."""
+    with configured_source() as source:
+        return source.engagement_files()
+
+
+def load_documents() -> tuple[dict, list[dict]]:
+    """Load firm-level documents and engagement files in one concurrent fetch."""
+    with configured_source() as source:
+        return source.documents()
+
+
+def load_engagement_file(file_id: str) -> dict | None:
+    """Load one engagement file by file_id (an indexed lookup when the store is enabled)."""
+    store = _open_store()
+    if store:
+        with store:
+            return store.engagement_file(file_id)
+
+    for ef in load_engagement_files():
+        if ef.get("file_id") == file_id:
+            return ef
+    return None
 
 
 def _count_bool_checks(data: dict, depth: int = 0) -> tuple[int, int]:
@@ -99,114 +164,137 @@ def _parse_total_hours(findings: list[Finding]) -> float:
     return round(total, 1)
 
 
-def run_scan() -> ScanResult:
-    """Execute the full CPA practice inspection readiness scan."""
-    firm_profile = load_json(DATA_DIR / "firm_profile.json")
-    firm_docs = load_firm_docs()
-    engagement_files = load_engagement_files()
+def run_scan(metrics: scan_metrics.ScanMetrics | None = None) -> ScanResult:
+    """
+    Execute the full CPA practice inspection readiness scan.
+
+    Pass a ``ScanMetrics`` (or set CPA_SCAN_METRICS=1) to record per-phase and
+    per-rule timings into it; see engine.metrics.
+    """
+    if metrics is None and scan_metrics.enabled_by_env():
+        metrics = scan_metrics.ScanMetrics()
+    if metrics is None:
+        return _run_scan()
+    with scan_metrics.collecting(metrics):
+        return _run_scan()
+
+
+def _run_scan() -> ScanResult:
+    phase = scan_metrics.phase
+
+    with phase("load"):
+        firm_profile = load_json(firm_profile_path())
+        with configured_source() as source:
+            firm_docs, engagement_files = source.documents()
+            skipped_documents = source.skipped_documents
 
     # --- Firm-level checks ---
-    components = []
-
-    gov_findings = check_governance(firm_docs)
-    components.append(ComponentResult(
-        name="Governance & Leadership",
-        description="CSQM 1 Component 1 — Firm governance, leadership, and culture supporting quality",
-        findings=gov_findings,
-    ))
-
-    eth_findings = check_ethics(firm_docs)
-    components.append(ComponentResult(
-        name="Ethics & Independence",
-        description="CSQM 1 Component 2 — Ethical requirements including independence",
-        findings=eth_findings,
-    ))
-
-    acc_findings = check_acceptance(firm_docs)
-    components.append(ComponentResult(
-        name="Client Acceptance & Continuance",
-        description="CSQM 1 Component 3 — Accepting and continuing client relationships",
-        findings=acc_findings,
-    ))
-
-    res_findings = check_resources(firm_docs)
-    components.append(ComponentResult(
-        name="Resources",
-        description="CSQM 1 Component 4 — Human resources, intellectual resources, and CPD",
-        findings=res_findings,
-    ))
-
-    com_findings = check_communication(firm_docs)
-    components.append(ComponentResult(
-        name="Information & Communication",
-        description="CSQM 1 Component 5 — Information systems, policy communication, and complaints",
-        findings=com_findings,
-    ))
-
-    mon_findings = check_monitoring(firm_docs)
-    components.append(ComponentResult(
-        name="Monitoring & Remediation",
-        description="CSQM 1 Component 7 — Monitoring activities and remediation of deficiencies",
-        findings=mon_findings,
-    ))
+    with phase("firm_rules"):
+        components = []
+
+        gov_findings = check_governance(firm_docs)
+        components.append(ComponentResult(
+            name="Governance & Leadership",
+            description="CSQM 1 Component 1 — Firm governance, leadership, and culture supporting quality",
+            findings=tuple(gov_findings),
+        ))
 
-    # --- Engagement file checks ---
-    file_results = []
-    for ef in engagement_files:
-        ef_findings = check_engagement_file(ef)
-        file_results.append(FileResult(
-            file_id=ef.get("file_id", ""),
-            client_name=ef.get("client_name", ""),
-            engagement_type=ef.get("engagement_type", ""),
-            standard=ef.get("standard", ""),
-            engagement_partner=ef.get("engagement_partner", ""),
-            prepared_by=ef.get("prepared_by", ""),
-            assertions_passed=ef.get("assertions_passed", 0),
-            assertions_total=ef.get("assertions_total", 0),
-            overall_status=ef.get("overall_status", ""),
-            findings=ef_findings,
+        eth_findings = check_ethics(firm_docs)
+        components.append(ComponentResult(
+            name="Ethics & Independence",
+            description="CSQM 1 Component 2 — Ethical requirements including independence",
+            findings=tuple(eth_findings),
+        ))
+
+        acc_findings = check_acceptance(firm_docs)
+        components.append(ComponentResult(
+            name="Client Acceptance & Continuance",
+            description="CSQM 1 Component 3 — Accepting and continuing client relationships",
+            findings=tuple(acc_findings),
         ))
 
+        res_findings = check_resources(firm_docs)
+        components.append(ComponentResult(
+            name="Resources",
+            description="CSQM 1 Component 4 — Human resources, intellectual resources, and CPD",
+            findings=tuple(res_findings),
+        ))
+
+        com_findings = check_communication(firm_docs)
+        components.append(ComponentResult(
+            name="Information & Communication",
+            description="CSQM 1 Component 5 — Information systems, policy communication, and complaints",
+            findings=tuple(com_findings),
+        ))
+
+        mon_findings = check_monitoring(firm_docs)
+        components.append(ComponentResult(
+            name="Monitoring & Remediation",
+            description="CSQM 1 Component 7 — Monitoring activities and remediation of deficiencies",
+            findings=tuple(mon_findings),
+        ))
+
+    # --- Engagement file checks ---
+    with phase("engagement_rules"):
+        file_results = []
+        for ef in engagement_files:
+            ef_findings = check_engagement_file(ef)
+            file_results.append(FileResult(
+                file_id=ef.get("file_id", ""),
+                client_name=ef.get("client_name", ""),
+                engagement_type=ef.get("engagement_type", ""),
+                standard=ef.get("standard", ""),
+                engagement_partner=ef.get("engagement_partner", ""),
+                prepared_by=ef.get("prepared_by", ""),
+                assertions_passed=ef.get("assertions_passed", 0),
+                assertions_total=ef.get("assertions_total", 0),
+                overall_status=ef.get("overall_status", ""),
+                findings=tuple(ef_findings),
+            ))
+
     # --- Aggregate ---
-    all_findings: list[Finding] = []
-    for c in components:
-        all_findings.extend(c.findings)
-    for fr in file_results:
-        all_findings.extend(fr.findings)
+    with phase("aggregate"):
+        all_findings: list[Finding] = []
+        for c in components:
+            all_findings.extend(c.findings)
+        for fr in file_results:
+            all_findings.extend(fr.findings)
 
-    critical_count = sum(1 for f in all_findings if f.severity == "critical")
-    warning_count = sum(1 for f in all_findings if f.severity == "warning")
-    info_count = sum(1 for f in all_findings if f.severity == "info")
+        critical_count = sum(1 for f in all_findings if f.severity == "critical")
+        warning_count = sum(1 for f in all_findings if f.severity == "warning")
+        info_count = sum(1 for f in all_findings if f.severity == "info")
 
     # Granular assertion counting — each boolean check field is one assertion
-    total_assertions, passed_assertions = _count_assertions(firm_docs, engagement_files)
-
-    # Score per spec: base_score - penalty
-    base_score = passed_assertions / total_assertions if total_assertions > 0 else 0
-    penalty = critical_count * 0.012 + warning_count * 0.002
-    readiness_score = max(0, base_score - penalty)
-    readiness_score = round(readiness_score * 100, 1)
-
-    # Predicted outcome
-    if critical_count > 0:
-        predicted_outcome = "Does Not Meet Requirements"
-    elif warning_count > 3:
-        predicted_outcome = "Meets Requirements (with notes)"
-    else:
-        predicted_outcome = "Meets Requirements"
-
-    # Post-fix projection: what score/outcome if all critical items are fixed
-    post_fix_penalty = warning_count * 0.002  # only warnings remain
-    post_fix_score_raw = base_score - post_fix_penalty
-    post_fix_score = round(max(0, post_fix_score_raw) * 100, 1)
-
-    if warning_count > 3:
-        post_fix_outcome = "Meets Requirements (with notes)"
-    else:
-        post_fix_outcome = "Meets Requirements"
-
-    # Estimated total fix hours from findings
-    estimated_fix_hours = _parse_total_hours(all_findings)
+    with phase("count_assertions"):
+        total_assertions, passed_assertions = _count_assertions(firm_docs, engagement_files)
+
+    with phase("scoring"):
+        # Score per spec: base_score - penalty
+        base_score = passed_assertions / total_assertions if total_assertions > 0 else 0
+        penalty = critical_count * 0.012 + warning_count * 0.002
+        readiness_score = max(0, base_score - penalty)
+        readiness_score = round(readiness_score * 100, 1)
+
+        # Predicted outcome
+        if critical_count > 0:
+            predicted_outcome = "Does Not Meet Requirements"
+        elif warning_count > 3:
+            predicted_outcome = "Meets Requirements (with notes)"
+        else:
+            predicted_outcome = "Meets Requirements"
+
+        # Post-fix projection: what score/outcome if all critical items are fixed
+        post_fix_penalty = warning_count * 0.002  # only warnings remain
+        post_fix_score_raw = base_score - post_fix_penalty
+        post_fix_score = round(max(0, post_fix_score_raw) * 100, 1)
+
+        if warning_count > 3:
+            post_fix_outcome = "Meets Requirements (with notes)"
+        else:
+            post_fix_outcome = "Meets Requirements"
+
+        # Estimated total fix hours from findings
+        estimated_fix_hours = _parse_total_hours(all_findings)
 
     return ScanResult(
         firm_name=firm_profile["firm_name"],
@@ -224,7 +312,8 @@ def run_scan() -> ScanResult:
         post_fix_score=post_fix_score,
         post_fix_outcome=post_fix_outcome,
         estimated_fix_hours=estimated_fix_hours,
-        components=components,
-        file_results=file_results,
-        all_findings=all_findings,
+        components=tuple(components),
+        file_results=tuple(file_results),
+        all_findings=tuple(all_findings),
+        skipped_documents=skipped_documents,
     )
@@ -0,0 +1,312 @@
+"""Schemas for CPA documents, used to validate them with msgspec when they are loaded.
+
+This is a validation layer only: the rules and pages work on the plain dicts.
+Each firm-level document type is declared as a ``msgspec.Struct`` tagged by
+its ``document_type`` field, and engagement files share one schema with a
+``checks`` section. Loading a document parses it once with msgspec, checks
+the dict against its schema (every declared field's type, required keys and
+ISO dates) and returns the dict; the converted struct is discarded. A malformed
+document fails at load time with its name and the JSON path of the bad value,
+rather than deep inside a rule or a page. A firm-level document whose
+``document_type`` no schema declares raises ``UnknownDocumentTypeError``, which
+the sources use to skip and report that one document instead of failing the
+scan.
+
+Fields not declared here are allowed and kept in the dict; the assertion count
+in engine.scanner walks every boolean field.
+"""
+
+from datetime import date
+
+import msgspec
+
+
+class DocumentValidationError(ValueError):
+    """A document does not match its schema."""
+
+    def __init__(self, name: str, detail: str):
+        super().__init__(f"{name}: {detail}")
+        self.name = name
+        self.detail = detail
+
+
+class UnknownDocumentTypeError(DocumentValidationError):
+    """A firm-level document declares a document_type that no schema (and so no rule) covers."""
+
+
+class _Record(msgspec.Struct, kw_only=True):
+    status: str | None = None
+    issue: str | None = None
+
+
+# ---------------------------------------------------------------------------
+# Firm-level documents
+# ---------------------------------------------------------------------------
+
+class _FirmDocument(msgspec.Struct, kw_only=True, tag_field="document_type"):
+    status: str | None = None
+    issue: str | None = None
+
+
+class GovernancePolicies(_FirmDocument, tag="governance_policies"):
+    tone_at_top_policy: bool | None = None
+    quality_responsibility_assigned_to: str | None = None
+    quality_in_performance_reviews: bool | None = None
+    strategic_quality_review_documented: bool | None = None
+    commercial_override_policy: bool | None = None
+    last_reviewed: date | None = None
+
+
+class Declaration(_Record):
+    person: str
+    signed: bool | None = None
+    date_signed: date | None = None
+    period_covered: str | None = None
+
+
+class IndependenceDeclarations(_FirmDocument, tag="independence_declarations"):
+    declarations: list[Declaration] = []
+
+
+class ConflictEntry(_Record):
+    conflict: str | None = None
+    threat_type: str | None = None
+    safeguard: str | None = None
+    documented: bool | None = None
+
+
+class ConflictRegister(_FirmDocument, tag="conflict_register"):
+    exists: bool | None = None
+    last_updated: date | None = None
+    entries: list[ConflictEntry] = []
+
+
+class AcceptanceForm(_Record):
+    client: str
+    form_exists: bool | None = None
+    risk_assessment: bool | None = None
+    competence_eval: bool | None = None
+    integrity_eval: bool | None = None
+    aml_check: bool | None = None
+
+
+class ClientAcceptanceForms(_FirmDocument, tag="client_acceptance_forms"):
+    forms: list[AcceptanceForm] = []
+
+
+class CpdRecord(_Record):
+    person: str
+    courses: list[str] = []
+
+
+class CpdRecords(_FirmDocument, tag="cpd_records"):
+    requirement_hours_per_year: int | None = None
+    records: list[CpdRecord] = []
+
+
+class Distribution(_Record):
+    policy: str | None = None
+    date_distributed: date | None = None
+    method: str | None = None
+    acknowledged_by: list[str] = []
+    missing_acknowledgment: list[str] = []
+
+
+class PolicyDistributionLog(_FirmDocument, tag="policy_distribution_log"):
+    distributions: list[Distribution] = []
+
+
+class ComplaintsProcedure(_FirmDocument, tag="complaints_procedure"):
+    procedure_exists: bool | None = None
+    documented_in_soqm: bool | None = None
+    complaints_received: int | None = None
+
+
+class MonitoringActivity(_Record):
+    performed: bool | None = None
+    date_performed: date | None = None
+    performed_by: str | None = None
+    reviewer_independent: bool | None = None
+    files_reviewed: list[str] = []
+    findings: list[dict] = []
+
+
+class MonitoringLog(_FirmDocument, tag="monitoring_log"):
+    annual_file_monitoring: MonitoringActivity | None = None
+    completed_engagement_monitoring: MonitoringActivity | None = None
+    soqm_evaluation: MonitoringActivity | None = None
+
+
+class Evaluation(_Record):
+    period: str | None = None
+    date_performed: date | None = None
+    performed_by: str | None = None
+    conclusion: str | None = None
+    documented: bool | None = None
+
+
+class SoqmEvaluation(_FirmDocument, tag="soqm_evaluation"):
+    evaluations: list[Evaluation] = []
+    latest_evaluation_date: date | None = None
+    months_since_latest: int | None = None
+    overdue: bool | None = None
+
+
+class SoqmManual(_FirmDocument, tag="soqm_manual"):
+    title: str | None = None
+    version: str | None = None
+    created_date: date | None = None
+    last_updated: date | None = None
+    author: str | None = None
+    components_addressed: list[int] = []
+    has_quality_objectives: bool | None = None
+    has_risk_register: bool | None = None
+    has_response_policies: bool | None = None
+
+
+class RemediationEntry(_Record):
+    id: int | str | None = None
+    source: str | None = None
+    deficiency: str | None = None
+    date_identified: date | None = None
+    root_cause: str | None = None
+    corrective_action: str | None = None
+    action_date: date | None = None
+    followup_verified: bool | None = None
+
+
+class RemediationLog(_FirmDocument, tag="remediation_log"):
+    entries: list[RemediationEntry] = []
+
+
+FIRM_DOCUMENT_TYPES = {
+    cls.__struct_config__.tag: cls
+    for cls in (
+        GovernancePolicies, IndependenceDeclarations, ConflictRegister, ClientAcceptanceForms,
+        CpdRecords, PolicyDistributionLog, ComplaintsProcedure, MonitoringLog,
+        SoqmEvaluation, SoqmManual, RemediationLog,
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Engagement files
+# ---------------------------------------------------------------------------
+
+class EngagementLetter(_Record):
+    exists: bool | None = None
+    signed_by_client: bool | None = None
+    signed_by_firm: bool | None = None
+    date_signed: date | None = None
+    work_start_date: date | None = None
+    references_csrs_4200: bool | None = None
+    identifies_framework: str | None = None
+
+
+class IndependenceCheck(_Record):
+    assessment_documented: bool | None = None
+    threats_evaluated: bool | None = None
+    safeguards_applied: str | None = None
+    declaration_on_file: bool | None = None
+
+
+class FinancialStatementsCheck(_Record):
+    framework_compliant: bool | None = None
+    basis_of_accounting_note: bool | None = None
+    comparatives_correct: bool | None = None
+
+
+class ReportCheck(_Record):
+    not_old_section_9200: bool | None = None
+    dated: date | None = None
+    signed: bool | None = None
+
+
+class FileAssemblyCheck(_Record):
+    assembled_within_60_days: bool | None = None
+    assembly_date: date | None = None
+    report_date: date | None = None
+    days_elapsed: int | None = None
+
+
+class ProcedureCheck(_Record):
+    performed: bool | None = None
+    obtained: bool | None = None
+    documented: bool | None = None
+
+
+class FileIssue(msgspec.Struct, kw_only=True):
+    severity: str
+    component: str | None = None
+    description: str
+
+
+class EngagementChecks(msgspec.Struct, kw_only=True):
+    engagement_letter: EngagementLetter | None = None
+    independence: IndependenceCheck | None = None
+    knowledge_of_client: _Record | None = None
+    compilation_procedures: _Record | None = None
+    financial_statements: FinancialStatementsCheck | None = None
+    report: ReportCheck | None = None
+    file_assembly: FileAssemblyCheck | None = None
+    analytical_procedures: ProcedureCheck | None = None
+    inquiries_of_management: ProcedureCheck | None = None
+    management_representation_letter: ProcedureCheck | None = None
+
+
+class EngagementFile(msgspec.Struct, kw_only=True):
+    file_id: str
+    client_name: str
+    engagement_type: str
+    standard: str | None = None
+    fiscal_year_end: date | None = None
+    engagement_partner: str | None = None
+    prepared_by: str | None = None
+    checks: EngagementChecks = msgspec.field(default_factory=EngagementChecks)
+    overall_status: str | None = None
+    assertions_passed: int = 0
+    assertions_total: int = 0
+    issues: list[FileIssue] = []
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+_json_decoder = msgspec.json.Decoder()
+
+
+def _parse(name: str, raw: bytes | str) -> dict:
+    try:
+        data = _json_decoder.decode(raw)
+    except msgspec.DecodeError as e:
+        raise DocumentValidationError(name, f"invalid JSON ({e})") from e
+    if not isinstance(data, dict):
+        raise DocumentValidationError(name, "expected a JSON object")
+    return data
+
+
+def _validate(name: str, data: dict, schema: type[msgspec.Struct]) -> None:
+    """Raise DocumentValidationError unless ``data`` converts to ``schema``; the result is not kept."""
+    try:
+        msgspec.convert(data, schema)
+    except msgspec.ValidationError as e:
+        raise DocumentValidationError(name, str(e)) from e
+
+
+def decode_firm_document(name: str, raw: bytes | str) -> dict:
+    """Parsed and validated firm-level document. Documents without a document_type are not checked."""
+    data = _parse(name, raw)
+    if "document_type" in data:
+        schema = FIRM_DOCUMENT_TYPES.get(data["document_type"])
+        if schema is None:
+            raise UnknownDocumentTypeError(name, f"unknown document_type {data['document_type']!r}")
+        _validate(name, data, schema)
+    return data
+
+
+def decode_engagement_file(name: str, raw: bytes | str) -> dict:
+    """Parsed and validated engagement file."""
+    data = _parse(name, raw)
+    _validate(name, data, EngagementFile)
+    return data
@@ -0,0 +1,150 @@
+"""In-memory search index over engagement files: prefix and fuzzy term matching plus facet counts.
+
+Built once per scan. Every indexed field value is split into lowercase tokens
+held in an inverted index (token -> file positions); a sorted token list serves
+prefix lookups by bisection, and a trigram index narrows fuzzy candidates
+before they are scored, so a query touches only the tokens it could match.
+"""
+
+import bisect
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+
+from engine.models import FileResult
+
+SEARCH_FIELDS = (
+    "file_id",
+    "client_name",
+    "engagement_partner",
+    "prepared_by",
+    "engagement_type",
+    "overall_status",
+)
+FACET_FIELDS = ("engagement_type", "overall_status", "engagement_partner")
+
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+FUZZY_MIN_RATIO = 0.75
+FUZZY_MIN_LENGTH = 3
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class SearchResults:
+    hits: list[int]  # positions into the indexed file list, best match first
+    total: int
+    facets: dict[str, Counter] = field(default_factory=dict)
+
+
+class FileSearchIndex:
+    """Search index over a sequence of FileResults (positions refer back into it)."""
+
+    def __init__(self, files: tuple[FileResult, ...] | list[FileResult]):
+        self.files = tuple(files)
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._field_values: dict[str, list[str]] = {f: [] for f in SEARCH_FIELDS}
+        for pos, fr in enumerate(self.files):
+            for name in SEARCH_FIELDS:
+                value = str(getattr(fr, name) or "")
+                self._field_values[name].append(value)
+                for token in tokenize(value):
+                    self._postings[token].add(pos)
+            # The whole file id also matches as one token ("file-003")
+            self._postings[fr.file_id.casefold()].add(pos)
+
+        self._tokens = sorted(self._postings)
+        self._trigram_index: dict[str, list[str]] = defaultdict(list)
+        for token in self._tokens:
+            if len(token) >= FUZZY_MIN_LENGTH:
+                for gram in _trigrams(token):
+                    self._trigram_index[gram].append(token)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    # ------------------------------------------------------------------
+    # Term matching
+    # ------------------------------------------------------------------
+
+    def _prefix_tokens(self, term: str) -> list[str]:
+        start = bisect.bisect_left(self._tokens, term)
+        end = bisect.bisect_left(self._tokens, term + "\uffff")
+        return self._tokens[start:end]
+
+    def _fuzzy_tokens(self, term: str) -> list[tuple[str, float]]:
+        if len(term) < FUZZY_MIN_LENGTH:
+            return []
+        grams = _trigrams(term)
+        shared = Counter(tok for gram in grams for tok in self._trigram_index.get(gram, ()))
+        matches = []
+        for token, count in shared.items():
+            if count < len(grams) // 2:
+                continue
+            ratio = SequenceMatcher(None, term, token).ratio()
+            if ratio >= FUZZY_MIN_RATIO:
+                matches.append((token, ratio))
+        return matches
+
+    def _match_term(self, term: str) -> dict[int, float]:
+        """Best score per file position for one query term."""
+        scores: dict[int, float] = {}
+
+        def credit(token: str, score: float) -> None:
+            for pos in self._postings[token]:
+                if score > scores.get(pos, 0.0):
+                    scores[pos] = score
+
+        for token in self._prefix_tokens(term):
+            credit(token, EXACT_SCORE if token == term else PREFIX_SCORE)
+        for token, ratio in self._fuzzy_tokens(term):
+            credit(token, ratio)
+        return scores
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str = "", filters: dict[str, set[str]] | None = None, limit: int = 50) -> SearchResults:
+        """
+        Files matching every term of ``query`` (prefix or fuzzy) and every
+        facet filter, best first. Facet counts cover the query matches before
+        facet filters are applied, so each facet shows what selecting it yields.
+        """
+        terms = tokenize(query)
+        if terms:
+            totals: dict[int, float] | None = None
+            for term in terms:
+                term_scores = self._match_term(term)
+                if totals is None:
+                    totals = term_scores
+                else:
+                    totals = {pos: s + term_scores[pos] for pos, s in totals.items() if pos in term_scores}
+                if not totals:
+                    break
+            candidates = sorted(totals or {}, key=lambda pos: (-(totals or {})[pos], pos))
+        else:
+            candidates = list(range(len(self.files)))
+
+        facets = {
+            name: Counter(self._field_values[name][pos] for pos in candidates)
+            for name in FACET_FIELDS
+        }
+
+        for name, allowed in (filters or {}).items():
+            if allowed:
+                values = self._field_values[name]
+                candidates = [pos for pos in candidates if values[pos] in allowed]
+
+        return SearchResults(hits=candidates[:limit], total=len(candidates), facets=facets)
@@ -0,0 +1,413 @@
+"""Pluggable document sources for firm-level and engagement file documents.
+
+A source lists the document names in a scope (``firm_level`` or
+``engagement_files``) and fetches their JSON bodies, which are validated
+against engine.schemas as they are parsed. Fetches for a scope run
+concurrently on an asyncio event loop, so remote latency is paid once per
+batch rather than once per document.
+
+``CPA_DOCUMENT_STORE`` (SQLite, see engine.store) takes precedence; otherwise
+``CPA_DOCUMENT_SOURCE`` selects a directory or an ``http(s)://`` base URL, and
+the bundled ``data/documents`` directory is the default. An HTTP source expects::
+
+    GET {base}/{scope}/          -> JSON list of document names, or
+                                    {"documents": [...], "version": "..."}
+    GET {base}/{scope}/{name}    -> the document JSON
+
+``version`` is an opaque token that changes whenever a document in the scope
+does. With it, an HTTP source's data version costs one listing request per
+scope; without it, one HEAD request per document for its ETag or
+Last-Modified (a document with neither is fetched and hashed). Either way the
+version is reused for ``CPA_DOCUMENT_SOURCE_VERSION_TTL`` seconds, so a page
+rerun does not go to the network each time.
+
+Serve a local directory in that layout (a stand-in for the object store) with::
+
+    python -m engine.sources serve [port] [documents_dir]
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+import xxhash
+
+from engine.schemas import UnknownDocumentTypeError, decode_engagement_file, decode_firm_document
+from engine.store import ENGAGEMENT_FILES, FIRM_LEVEL, DocumentStore, configured_store_path
+from fingerprint import fingerprint
+
+SOURCE_ENV_VAR = "CPA_DOCUMENT_SOURCE"
+DEFAULT_DOCUMENTS_DIR = Path(__file__).parent.parent / "data" / "documents"
+SCOPES = (FIRM_LEVEL, ENGAGEMENT_FILES)
+
+HTTP_MAX_CONNECTIONS = int(os.environ.get("CPA_DOCUMENT_SOURCE_CONNECTIONS", 16))
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("CPA_DOCUMENT_SOURCE_TIMEOUT", 10))
+HTTP_VERSION_TTL_SECONDS = float(os.environ.get("CPA_DOCUMENT_SOURCE_VERSION_TTL", 30))
+
+
+class DocumentSourceError(RuntimeError):
+    """A document could not be listed or fetched from its source."""
+
+
+def run_sync(coro):
+    """Run ``coro`` to completion from synchronous code, even inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+class DocumentSource:
+    """Base class: subclasses implement ``list_names`` and ``fetch_raw``."""
+
+    # Firm-level documents the last parse skipped, with the reason; see engine.schemas
+    skipped_documents: tuple[str, ...] = ()
+
+    def list_names(self, scope: str) -> list[str]:
+        raise NotImplementedError
+
+    def fetch_raw(self, scope: str, name: str) -> bytes:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "DocumentSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def fetch_scope(self, scope: str) -> list[tuple[str, bytes]]:
+        """Fetch every document in ``scope`` concurrently, as (name, raw bytes) sorted by name."""
+        names = sorted(await asyncio.to_thread(self.list_names, scope))
+        bodies = await asyncio.gather(*(asyncio.to_thread(self.fetch_raw, scope, n) for n in names))
+        return list(zip(names, bodies))
+
+    async def fetch_all(self) -> dict[str, list[tuple[str, bytes]]]:
+        """Fetch both scopes concurrently."""
+        results = await asyncio.gather(*(self.fetch_scope(scope) for scope in SCOPES))
+        return dict(zip(SCOPES, results))
+
+    # ------------------------------------------------------------------
+    # Parsed views, in the shapes load_firm_docs / load_engagement_files return
+    # ------------------------------------------------------------------
+
+    def _firm_docs(self, raw: list[tuple[str, bytes]]) -> dict:
+        docs, skipped = {}, []
+        for name, body in raw:
+            try:
+                data = decode_firm_document(f"{FIRM_LEVEL}/{name}", body)
+            except UnknownDocumentTypeError as e:
+                skipped.append(str(e))
+                continue
+            docs[data.get("document_type", Path(name).stem)] = data
+        self.skipped_documents = tuple(skipped)
+        return docs
+
+    @staticmethod
+    def _engagement_files(raw: list[tuple[str, bytes]]) -> list[dict]:
+        return [decode_engagement_file(f"{ENGAGEMENT_FILES}/{name}", body) for name, body in raw]
+
+    def firm_docs(self) -> dict:
+        return self._firm_docs(run_sync(self.fetch_scope(FIRM_LEVEL)))
+
+    def engagement_files(self) -> list[dict]:
+        return self._engagement_files(run_sync(self.fetch_scope(ENGAGEMENT_FILES)))
+
+    def documents(self) -> tuple[dict, list[dict]]:
+        """Firm docs and engagement files fetched in one concurrent batch."""
+        raw = run_sync(self.fetch_all())
+        return self._firm_docs(raw[FIRM_LEVEL]), self._engagement_files(raw[ENGAGEMENT_FILES])
+
+    def data_version(self) -> str:
+        """Fingerprint of every document. The generic version fetches and hashes them all."""
+        h = xxhash.xxh3_128()
+        for scope, docs in run_sync(self.fetch_all()).items():
+            for name, body in docs:
+                h.update(f"{scope}/{name}\0".encode("utf-8"))
+                h.update(body)
+                h.update(b"\0")
+        return h.hexdigest()
+
+
+class FilesystemSource(DocumentSource):
+    """Documents as ``<root>/<scope>/*.json`` files."""
+
+    def __init__(self, root: Path | str = DEFAULT_DOCUMENTS_DIR):
+        self.root = Path(root)
+
+    def list_names(self, scope: str) -> list[str]:
+        return [p.name for p in (self.root / scope).glob("*.json")]
+
+    def fetch_raw(self, scope: str, name: str) -> bytes:
+        try:
+            return (self.root / scope / name).read_bytes()
+        except OSError as e:
+            raise DocumentSourceError(f"Cannot read {scope}/{name}: {e}") from e
+
+    def data_version(self) -> str:
+        # Incremental: only files whose stat changed since the last call are re-read.
+        return fingerprint(*(self.root / scope for scope in SCOPES), suffixes=(".json",))
+
+
+class StoreSource(DocumentSource):
+    """Documents held in the SQLite document store (engine.store), over one connection for the source's life."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.store = DocumentStore(self.path)
+        # Scopes are fetched from worker threads; sqlite3 connections are not safe for concurrent use
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            return self.store.conn.execute(sql, params).fetchall()
+
+    def list_names(self, scope: str) -> list[str]:
+        return [r[0] for r in self._query("SELECT source FROM documents WHERE scope = ?", (scope,))]
+
+    def fetch_raw(self, scope: str, name: str) -> bytes:
+        rows = self._query("SELECT body FROM documents WHERE scope = ? AND source = ?", (scope, name))
+        if not rows:
+            raise DocumentSourceError(f"No document {scope}/{name} in {self.path}")
+        return rows[0][0].encode("utf-8")
+
+    # A single query per scope beats per-document fetches for a local database.
+    async def fetch_scope(self, scope: str) -> list[tuple[str, bytes]]:
+        rows = await asyncio.to_thread(
+            self._query, "SELECT source, body FROM documents WHERE scope = ? ORDER BY source", (scope,)
+        )
+        return [(source, body.encode("utf-8")) for source, body in rows]
+
+    def data_version(self) -> str:
+        return fingerprint(self.path)
+
+    def close(self) -> None:
+        self.store.close()
+
+
+class HttpSource(DocumentSource):
+    """
+    Documents behind an HTTP(S) endpoint (object store gateway or DMS API).
+
+    Keeps a pool of up to ``max_connections`` persistent keep-alive
+    connections; concurrent fetches each borrow one and return it afterwards.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        headers: dict | None = None,
+    ):
+        parts = urlsplit(base_url.rstrip("/"))
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported document source URL: {base_url}")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.base_path = parts.path
+        self.timeout = timeout
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.netloc, timeout=self.timeout)
+
+    # Base URL -> (checked at, data version), shared by every HttpSource in the process
+    _versions: dict[str, tuple[float, str]] = {}
+    _versions_lock = threading.Lock()
+
+    def _request(self, method: str, path: str) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Status, headers and body of one request on a pooled connection."""
+        with self._slots:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._new_connection()
+            for attempt in (1, 2):
+                try:
+                    conn.request(method, path, headers=self.headers)
+                    response = conn.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                    # The server closed an idle pooled connection; retry once on a fresh one.
+                    conn.close()
+                    if attempt == 2:
+                        raise DocumentSourceError(f"{method} {path} failed: {e}") from e
+                    conn = self._new_connection()
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    raise DocumentSourceError(f"{method} {path} failed: {e}") from e
+            if response.will_close:
+                conn.close()
+            else:
+                self._pool.put(conn)
+        return response.status, response.headers, body
+
+    def _get(self, path: str) -> bytes:
+        status, _, body = self._request("GET", path)
+        if status != 200:
+            raise DocumentSourceError(f"GET {path} returned HTTP {status}")
+        return body
+
+    def _listing(self, scope: str) -> tuple[list[str], str | None]:
+        """Document names in ``scope`` and the listing's version token, if it has one."""
+        listing = json.loads(self._get(f"{self.base_path}/{quote(scope)}/"))
+        version = None
+        if isinstance(listing, dict):
+            version = listing.get("version")
+            listing = listing.get("documents", [])
+        return [name for name in listing if name.endswith(".json")], version
+
+    def list_names(self, scope: str) -> list[str]:
+        return self._listing(scope)[0]
+
+    def fetch_raw(self, scope: str, name: str) -> bytes:
+        return self._get(f"{self.base_path}/{quote(scope)}/{quote(name)}")
+
+    def _validator(self, scope: str, name: str) -> bytes:
+        """A document's ETag or Last-Modified from a HEAD request, or its bytes when it has neither."""
+        status, headers, _ = self._request("HEAD", f"{self.base_path}/{quote(scope)}/{quote(name)}")
+        validator = headers.get("ETag") or headers.get("Last-Modified")
+        if status == 200 and validator:
+            return f"validator:{validator}".encode("utf-8")
+        return self.fetch_raw(scope, name)
+
+    async def _scope_version(self, scope: str) -> list[tuple[str, bytes]]:
+        names, version = await asyncio.to_thread(self._listing, scope)
+        if version is not None:
+            return [("", f"version:{version}".encode("utf-8"))]
+        names.sort()
+        validators = await asyncio.gather(*(asyncio.to_thread(self._validator, scope, n) for n in names))
+        return list(zip(names, validators))
+
+    def data_version(self) -> str:
+        """Version from listing tokens or per-document validators, reused for HTTP_VERSION_TTL_SECONDS."""
+        base_url = f"{self.scheme}://{self.netloc}{self.base_path}"
+        now = time.monotonic()
+        with self._versions_lock:
+            cached = self._versions.get(base_url)
+        if cached and now - cached[0] < HTTP_VERSION_TTL_SECONDS:
+            return cached[1]
+
+        async def scopes():
+            return await asyncio.gather(*(self._scope_version(scope) for scope in SCOPES))
+
+        h = xxhash.xxh3_128()
+        for scope, entries in zip(SCOPES, run_sync(scopes())):
+            for name, token in entries:
+                h.update(f"{scope}/{name}\0".encode("utf-8"))
+                h.update(token)
+                h.update(b"\0")
+        version = h.hexdigest()
+        with self._versions_lock:
+            self._versions[base_url] = (now, version)
+        return version
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def configured_source() -> DocumentSource:
+    """The document source selected by CPA_DOCUMENT_STORE / CPA_DOCUMENT_SOURCE, or the bundled files."""
+    store_path = configured_store_path()
+    if store_path:
+        return StoreSource(store_path)
+    location = os.environ.get(SOURCE_ENV_VAR, "")
+    if location.startswith(("http://", "https://")):
+        return HttpSource(location)
+    if location:
+        # A mistyped path would otherwise scan as a firm with no documents
+        if not Path(location).is_dir():
+            raise DocumentSourceError(f"{SOURCE_ENV_VAR}={location} is not a directory")
+        return FilesystemSource(location)
+    return FilesystemSource(DEFAULT_DOCUMENTS_DIR)
+
+
+# ----------------------------------------------------------------------
+# Local stand-in server
+# ----------------------------------------------------------------------
+
+def serve(port: int = 8765, documents_dir: Path = DEFAULT_DOCUMENTS_DIR) -> None:
+    """
+    Serve ``documents_dir`` in the HTTP source layout on localhost (HTTP/1.1, keep-alive).
+
+    Listings carry a version token and documents an ETag, both content fingerprints.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    root = Path(documents_dir).resolve()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, send_body: bool) -> None:
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if len(parts) == 1 and parts[0] in SCOPES:
+                body = json.dumps({
+                    "documents": sorted(p.name for p in (root / parts[0]).glob("*.json")),
+                    "version": fingerprint(root / parts[0], suffixes=(".json",)),
+                }).encode("utf-8")
+                etag = None
+            elif len(parts) == 2 and parts[0] in SCOPES and (root / parts[0] / parts[1]).is_file():
+                path = root / parts[0] / parts[1]
+                body = path.read_bytes()
+                etag = f'"{fingerprint(path)}"'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+        def log_message(self, *args):
+            pass
+
+    with ThreadingHTTPServer(("127.0.0.1", port), Handler) as server:
+        print(f"Serving {root} at http://127.0.0.1:{port}/")
+        print(f"Set {SOURCE_ENV_VAR}=http://127.0.0.1:{port} to scan from it.")
+        server.serve_forever()
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] != "serve":
+        print("usage: python -m engine.sources serve [port] [documents_dir]")
+        return 2
+    port = int(argv[1]) if len(argv) > 1 else 8765
+    documents_dir = Path(argv[2]) if len(argv) > 2 else DEFAULT_DOCUMENTS_DIR
+    serve(port, documents_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
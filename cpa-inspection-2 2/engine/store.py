@@ -0,0 +1,120 @@
+"""Optional SQLite document store for firm-level and engagement file documents.
+
+Documents are kept as JSON (queried through SQLite's JSON1 functions) with
+indexed generated columns for the fields the scanner looks documents up by.
+Build or refresh the store from the JSON layout with::
+
+    python -m engine.store [path/to/documents.db]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+from engine.schemas import UnknownDocumentTypeError, decode_engagement_file, decode_firm_document
+
+STORE_ENV_VAR = "CPA_DOCUMENT_STORE"
+
+FIRM_LEVEL = "firm_level"
+ENGAGEMENT_FILES = "engagement_files"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    scope TEXT NOT NULL,
+    source TEXT NOT NULL,
+    body TEXT NOT NULL CHECK (json_valid(body)),
+    document_type TEXT GENERATED ALWAYS AS (json_extract(body, '$.document_type')) VIRTUAL,
+    file_id TEXT GENERATED ALWAYS AS (json_extract(body, '$.file_id')) VIRTUAL,
+    UNIQUE (scope, source)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_scope_source ON documents (scope, source);
+CREATE INDEX IF NOT EXISTS idx_documents_document_type ON documents (document_type);
+CREATE INDEX IF NOT EXISTS idx_documents_file_id ON documents (file_id);
+"""
+
+def configured_store_path() -> Path | None:
+    """Return the store path from CPA_DOCUMENT_STORE, or None when it is unset."""
+    path = os.environ.get(STORE_ENV_VAR)
+    if not path:
+        return None
+    # A mistyped path would otherwise scan the fallback documents without a word
+    if not Path(path).is_file():
+        raise FileNotFoundError(f"{STORE_ENV_VAR}={path} is not a database file")
+    return Path(path)
+
+
+class DocumentStore:
+    """Thin wrapper around one SQLite connection holding CPA documents."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "DocumentStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, documents_dir: Path) -> int:
+        """Validate and bulk-import firm_level/ and engagement_files/ JSON, replacing prior contents. Returns row count."""
+        decoders = {FIRM_LEVEL: decode_firm_document, ENGAGEMENT_FILES: decode_engagement_file}
+        rows = []
+        for scope in (FIRM_LEVEL, ENGAGEMENT_FILES):
+            for p in sorted((documents_dir / scope).glob("*.json")):
+                raw = p.read_bytes()
+                try:
+                    data = decoders[scope](f"{scope}/{p.name}", raw)
+                except UnknownDocumentTypeError:
+                    data = json.loads(raw)  # kept; scans skip and report it
+                rows.append((scope, p.name, json.dumps(data)))
+        with self.conn:
+            self.conn.execute("DELETE FROM documents")
+            self.conn.executemany("INSERT INTO documents (scope, source, body) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def firm_docs(self) -> dict:
+        """Firm-level documents keyed by document_type (file stem when absent), as load_firm_docs returns."""
+        cur = self.conn.execute(
+            "SELECT source, document_type, body FROM documents WHERE scope = ? ORDER BY source",
+            (FIRM_LEVEL,),
+        )
+        return {doc_type or Path(source).stem: json.loads(body) for source, doc_type, body in cur}
+
+    def engagement_file(self, file_id: str) -> dict | None:
+        cur = self.conn.execute(
+            "SELECT body FROM documents WHERE scope = ? AND file_id = ? LIMIT 1",
+            (ENGAGEMENT_FILES, file_id),
+        )
+        row = cur.fetchone()
+        return json.loads(row[0]) if row else None
+
+
+def main(argv: list[str]) -> int:
+    from engine.scanner import DATA_DIR
+
+    db_path = Path(argv[0]) if argv else DATA_DIR / "documents.db"
+    with DocumentStore(db_path) as store:
+        count = store.ingest(DATA_DIR / "documents")
+    print(f"Ingested {count} documents into {db_path}")
+    print(f"Set {STORE_ENV_VAR}={db_path} to scan from the store.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
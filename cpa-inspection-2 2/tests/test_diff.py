@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.diff import diff_findings, finding_identity
+from engine.rules import check_communication, check_ethics, check_monitoring
+
+
+def _late(person: str) -> dict:
+    return {"person": person, "signed": True, "status": "late", "issue": f"{person} signed late."}
+
+
+def _ethics(*people: str) -> list:
+    docs = {
+        "independence_declarations": {"declarations": [_late(p) for p in people]},
+        "conflict_register": {"exists": True},
+    }
+    return check_ethics(docs)
+
+
+def test_fixing_one_per_person_finding_resolves_only_that_person():
+    before = _ethics("Alice", "Bob")
+    after = _ethics("Bob")
+
+    diff = diff_findings(before, after)
+
+    assert [f.entity for f in diff.resolved] == ["Alice"]
+    assert diff.added == []
+    assert diff.changed == []
+    assert diff.unchanged_count == 1
+
+
+def test_reordered_per_entity_findings_are_unchanged():
+    diff = diff_findings(_ethics("Alice", "Bob", "Carol"), _ethics("Carol", "Alice", "Bob"))
+    assert not diff.has_changes
+    assert diff.unchanged_count == 3
+
+
+def test_reworded_issue_for_the_same_person_is_a_change():
+    before = _ethics("Alice", "Bob")
+    after = _ethics("Alice", "Bob")
+    after[1] = type(after[1])(**{**after[1].__dict__, "issue": "Bob signed three months late."})
+
+    diff = diff_findings(before, after)
+
+    assert [(b.entity, a.entity) for b, a in diff.changed] == [("Bob", "Bob")]
+    assert diff.resolved == [] and diff.added == []
+
+
+def test_one_remediation_entry_closed_among_several():
+    def monitoring(*entry_ids):
+        entries = [{"id": i, "status": "open", "deficiency": f"Deficiency {i}", "root_cause": "x"} for i in entry_ids]
+        docs = {
+            "monitoring_log": {
+                "annual_file_monitoring": {"performed": True},
+                "completed_engagement_monitoring": {"performed": True, "reviewer_independent": True},
+            },
+            "remediation_log": {"entries": entries},
+        }
+        return check_monitoring(docs)
+
+    diff = diff_findings(monitoring(1, 2, 3), monitoring(1, 3))
+    assert [f.entity for f in diff.resolved] == ["2"]
+    assert diff.unchanged_count == 2 and not diff.added and not diff.changed
+
+
+def test_distributions_are_told_apart_by_policy():
+    def communication(*policies):
+        docs = {
+            "policy_distribution_log": {
+                "distributions": [{"policy": p, "missing_acknowledgment": ["Tyler"]} for p in policies],
+            },
+            "complaints_procedure": {"procedure_exists": True},
+        }
+        return check_communication(docs)
+
+    findings = communication("SoQM Manual", "Ethics Policy")
+    assert len({finding_identity(f) for f in findings}) == 2
+    diff = diff_findings(findings, communication("Ethics Policy"))
+    assert [f.entity for f in diff.resolved] == ["SoQM Manual"]
@@ -0,0 +1,35 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.scanner import DATA_DIR, data_root, run_scan
+from engine.schemas import DocumentValidationError, UnknownDocumentTypeError, decode_firm_document
+
+
+def test_unknown_document_type_is_reported_not_validated():
+    with pytest.raises(UnknownDocumentTypeError, match="insurance_register"):
+        decode_firm_document("firm_level/insurance.json", b'{"document_type": "insurance_register"}')
+
+
+def test_known_document_type_is_still_validated():
+    with pytest.raises(DocumentValidationError, match=r"\$\.last_reviewed"):
+        decode_firm_document("firm_level/gov.json", b'{"document_type": "governance_policies", "last_reviewed": 5}')
+
+
+def test_scan_skips_and_reports_an_unknown_firm_document(tmp_path):
+    shutil.copy(DATA_DIR / "firm_profile.json", tmp_path / "firm_profile.json")
+    shutil.copytree(DATA_DIR / "documents", tmp_path / "documents")
+    with data_root(tmp_path):
+        baseline = run_scan()
+    (tmp_path / "documents" / "firm_level" / "insurance.json").write_text(
+        json.dumps({"document_type": "insurance_register", "policies": []})
+    )
+    with data_root(tmp_path):
+        result = run_scan()
+    assert result.skipped_documents == ("firm_level/insurance.json: unknown document_type 'insurance_register'",)
+    assert result.all_findings == baseline.all_findings
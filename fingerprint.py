@@ -0,0 +1,98 @@
+"""Data-version fingerprints shared by both scanners.
+
+A fingerprint is a 128-bit xxHash (XXH3) of a data root's file manifest
+(relative paths) and file contents. Per-file content digests are memoized by
+``(size, mtime_ns, inode)``, so re-fingerprinting an unchanged root costs one
+``stat`` per file and only edited files are re-read. The memo keeps the
+``FINGERPRINT_MAX_FILES`` most recently used files, so a long-lived process
+that sees many data roots does not grow without bound. Caches key on the
+fingerprint instead of being cleared by hand.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+import xxhash
+
+_SKIP_DIRS = {"__pycache__", ".git"}
+
+MAX_FILES = int(os.environ.get("FINGERPRINT_MAX_FILES", 100_000))
+
+# Least recently used first
+_file_digests: OrderedDict[str, tuple[tuple[int, int, int], bytes]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def file_digest(path: str | os.PathLike, stat: os.stat_result | None = None) -> bytes:
+    """XXH3-128 digest of one file's bytes, reused while its size, mtime and inode are unchanged."""
+    path = os.fspath(path)
+    stat = stat or os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    with _lock:
+        cached = _file_digests.get(path)
+        if cached and cached[0] == key:
+            _file_digests.move_to_end(path)
+            return cached[1]
+
+    h = xxhash.xxh3_128()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.digest()
+    with _lock:
+        _file_digests[path] = (key, digest)
+        _file_digests.move_to_end(path)
+        while len(_file_digests) > MAX_FILES:
+            _file_digests.popitem(last=False)
+    return digest
+
+
+def _manifest(root: Path, suffixes: tuple[str, ...] | None) -> Iterable[tuple[str, str]]:
+    """(relative name, absolute path) for every fingerprinted file under ``root``."""
+    if root.is_file():
+        yield root.name, str(root)
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS and not d.startswith("."))
+        for name in sorted(filenames):
+            if name.startswith(".") or (suffixes and not name.endswith(suffixes)):
+                continue
+            full = os.path.join(dirpath, name)
+            yield os.path.relpath(full, root), full
+
+
+def fingerprint(*roots: str | os.PathLike, suffixes: tuple[str, ...] | None = None) -> str:
+    """
+    Hex data version of the given files and directory trees.
+
+    Directories are walked recursively (hidden entries and ``__pycache__``
+    skipped), optionally keeping only names ending in ``suffixes``. Missing
+    roots contribute a marker rather than raising, so a file appearing or
+    disappearing changes the fingerprint.
+    """
+    h = xxhash.xxh3_128()
+    for root in roots:
+        root = Path(root)
+        h.update(f"root:{root.name}\0".encode("utf-8"))
+        if not root.exists():
+            h.update(b"missing\0")
+            continue
+        for rel, full in _manifest(root, suffixes):
+            h.update(rel.encode("utf-8"))
+            h.update(b"\0")
+            try:
+                h.update(file_digest(full))
+            except FileNotFoundError:  # removed mid-walk
+                h.update(b"missing")
+    return h.hexdigest()
+
+
+def clear() -> None:
+    """Forget memoized file digests (forces every file to be re-read)."""
+    with _lock:
+        _file_digests.clear()
@@ -0,0 +1,414 @@
+"""Concurrent-session load test for the unified app.
+
+Starts the app as a real Streamlit server (one replica) and drives it with N
+simulated reviewers, each a websocket client on its own thread speaking the
+same protocol as the browser: a user opens the app, then keeps navigating
+between CPA and SR&ED pages with exponential think times until the test ends.
+Every click is a script rerun on the server; its latency is the time from
+sending the rerun to receiving ``script_finished``, which is what a reviewer
+waits for. Browser rendering is not simulated.
+
+Reports rerun throughput, latency percentiles (initial loads separately from
+navigation reruns, and per page), payload sizes, and server memory per
+session (RSS growth while the sessions are connected)::
+
+    python loadtest.py --users 10 --duration 120 --think 5
+    # how many reviewers fit one replica at p95 <= 1s:
+    python loadtest.py --sweep 1 5 10 20 40 --duration 60 --slo-p95 1.0
+    # against a server that is already running (memory needs its pid):
+    python loadtest.py --url http://localhost:8501 --server-pid 12345 --users 20
+
+``--think 0`` removes think time entirely and measures saturation throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.sync.client import connect
+
+from memory_usage import format_bytes
+
+APP = Path(__file__).resolve().parent / "app.py"
+MODE_LABEL = "Functionality"
+CPA_MODE = "CPA Practice Inspection"
+SRED_MODE = "SR&ED Claim Readiness"
+PAGE_LABELS = {CPA_MODE: "Navigate", SRED_MODE: "SR&ED Section"}
+LANDING_PAGES = {CPA_MODE: "Dashboard", SRED_MODE: "Overview"}
+
+DEFAULT_TIMEOUT = 300.0  # seconds per rerun; a cold scan runs inside the first one
+SERVER_START_TIMEOUT = 60.0
+
+
+@dataclass
+class Sample:
+    user: int
+    kind: str  # "initial" or "navigate"
+    mode: str
+    page: str
+    seconds: float
+    bytes: int
+    error: str | None = None
+
+
+@dataclass
+class UserReport:
+    user: int
+    samples: list[Sample] = field(default_factory=list)
+    failed: str | None = None  # the user stopped early on an unexpected error
+
+
+@dataclass
+class Scenario:
+    duration: float
+    think: float
+    think_min: float
+    cpa_share: float
+    ramp_up: float
+    timeout: float
+    seed: int
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_healthy(base_url: str, process: subprocess.Popen | None) -> None:
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError(f"{base_url} did not become healthy within {SERVER_START_TIMEOUT:.0f}s")
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Run the unified app headless on ``port``, with its output discarded."""
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(APP),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=APP.parent,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def server_rss(pid: int | None) -> int | None:
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class Session:
+    """One browser session: a websocket speaking Streamlit's BackMsg / ForwardMsg protocol."""
+
+    def __init__(self, ws_url: str, timeout: float):
+        self.ws_url = ws_url
+        self.timeout = timeout
+        self.widgets: dict[str, tuple[str, list[str]]] = {}  # label -> (widget id, options)
+
+    def __enter__(self):
+        self._connection = connect(self.ws_url, subprotocols=["streamlit"], max_size=None, open_timeout=self.timeout)
+        self.ws = self._connection.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._connection.__exit__(*exc)
+
+    def rerun(self, values: dict[str, str]) -> tuple[float, int, str | None]:
+        """Rerun with the given widget values (by label); returns seconds, bytes received, error."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        for label, value in values.items():
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = self.widgets[label][0]
+            widget.string_value = value
+
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        received = 0
+        errors = []
+        while True:
+            data = self.ws.recv(timeout=self.timeout)
+            received += len(data)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in ("radio", "selectbox"):
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.label] = (widget.id, list(widget.options))
+                elif element_type == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+            elif kind == "script_finished":
+                elapsed = time.perf_counter() - start
+                return elapsed, received, "; ".join(errors)[:200] or None
+
+
+def _think_time(rng: random.Random, scenario: Scenario) -> float:
+    if scenario.think <= 0:
+        return 0.0
+    return min(max(rng.expovariate(1 / scenario.think), scenario.think_min), scenario.think * 4)
+
+
+def _page_name(option: str) -> str:
+    # CPA page labels carry an icon prefix ("\U0001f3e0 Dashboard")
+    return option.split(" ", 1)[-1] if option[:1] and not option[:1].isalnum() else option
+
+
+def run_user(user: int, ws_url: str, scenario: Scenario, deadline: float, report: UserReport, done: threading.Barrier) -> None:
+    """One simulated reviewer: open the app, then navigate with think times until ``deadline``."""
+    rng = random.Random(scenario.seed * 1_000_003 + user)
+    connected = False
+    try:
+        with Session(ws_url, scenario.timeout) as session:
+            connected = True
+            try:
+                _navigate(user, session, rng, scenario, deadline, report)
+            finally:
+                # Stay connected until every user is done, so server memory is sampled with all sessions alive
+                _wait(done)
+    except Exception as exc:  # one broken session must not hide the others' numbers
+        report.failed = f"{type(exc).__name__}: {exc}"
+    if not connected:
+        _wait(done)
+
+
+def _wait(barrier: threading.Barrier) -> None:
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+
+
+def _navigate(user: int, session: Session, rng: random.Random, scenario: Scenario, deadline: float, report: UserReport) -> None:
+    seconds, received, error = session.rerun({})
+    mode = CPA_MODE
+    pages = {CPA_MODE: None, SRED_MODE: None}  # page option last sent per mode
+    report.samples.append(Sample(user, "initial", mode, LANDING_PAGES[mode], seconds, received, error))
+
+    while time.monotonic() + (pause := _think_time(rng, scenario)) < deadline:
+        time.sleep(pause)
+        target = CPA_MODE if rng.random() < scenario.cpa_share else SRED_MODE
+        if target != mode:
+            # Switching functionality is a rerun of its own, landing on that mode's last page
+            mode = target
+            page = pages[mode]
+        else:
+            options = session.widgets[PAGE_LABELS[mode]][1]
+            page = pages[mode] = rng.choice([o for o in options if o != pages[mode]])
+        values = {MODE_LABEL: mode}
+        if page is not None:
+            values[PAGE_LABELS[mode]] = page
+        seconds, received, error = session.rerun(values)
+        name = _page_name(page) if page is not None else LANDING_PAGES[mode]
+        report.samples.append(Sample(user, "navigate", mode, name, seconds, received, error))
+
+
+def run_level(users: int, ws_url: str, server_pid: int | None, scenario: Scenario) -> dict:
+    """Run ``users`` concurrent sessions for ``scenario.duration`` seconds and summarize."""
+    reports = [UserReport(user) for user in range(users)]
+    done = threading.Barrier(users + 1)
+    rss_before = server_rss(server_pid)
+    start = time.monotonic()
+    deadline = start + scenario.duration
+    threads = []
+    for user, report in enumerate(reports):
+        thread = threading.Thread(target=run_user, args=(user, ws_url, scenario, deadline, report, done), daemon=True)
+        threads.append(thread)
+        thread.start()
+        if scenario.ramp_up and users > 1:
+            time.sleep(scenario.ramp_up / (users - 1))
+    done.wait()
+    elapsed = time.monotonic() - start
+    rss_after = server_rss(server_pid)
+    for thread in threads:
+        thread.join()
+    return summarize(users, reports, elapsed, rss_before, rss_after)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def summarize(users: int, reports: list[UserReport], elapsed: float, rss_before: int | None, rss_after: int | None) -> dict:
+    samples = [s for r in reports for s in r.samples]
+    navigation = [s for s in samples if s.kind == "navigate"]
+    by_page: dict[str, list[Sample]] = {}
+    for s in navigation:
+        by_page.setdefault(f"{'CPA' if s.mode == CPA_MODE else 'SR&ED'} / {s.page}", []).append(s)
+    rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    return {
+        "users": users,
+        "elapsed_seconds": elapsed,
+        "reruns": len(samples),
+        "throughput_per_second": len(samples) / elapsed if elapsed else 0.0,
+        "errors": sum(1 for s in samples if s.error),
+        "failed_users": {r.user: r.failed for r in reports if r.failed},
+        "initial": percentiles([s.seconds for s in samples if s.kind == "initial"]),
+        "navigate": percentiles([s.seconds for s in navigation]),
+        "pages": {
+            page: {**percentiles([s.seconds for s in group]), "mean_bytes": statistics.fmean(s.bytes for s in group)}
+            for page, group in sorted(by_page.items())
+        },
+        "server_rss_before": rss_before,
+        "server_rss_after": rss_after,
+        "server_rss_per_session": rss_delta / users if rss_delta is not None and users else None,
+        "error_samples": [asdict(s) for s in samples if s.error][:10],
+    }
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def print_level(summary: dict) -> None:
+    print(f"\n== {summary['users']} users, {summary['elapsed_seconds']:.0f}s ==")
+    print(f"reruns {summary['reruns']} ({summary['throughput_per_second']:.2f}/s), errors {summary['errors']}")
+    for label, stats in (("initial load", summary["initial"]), ("navigation", summary["navigate"])):
+        if stats["count"]:
+            print(f"{label:<14} p50 {_ms(stats['p50'])} ms  p95 {_ms(stats['p95'])} ms  "
+                  f"p99 {_ms(stats['p99'])} ms  max {_ms(stats['max'])} ms  (n={stats['count']})")
+    if summary["server_rss_after"] is not None:
+        per_session = summary["server_rss_per_session"]
+        print(f"server RSS     {format_bytes(summary['server_rss_after'])} with all sessions connected "
+              f"({format_bytes(int(per_session))} growth per session)")
+    if summary["pages"]:
+        print(f"{'page':<36} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'payload':>10}")
+        for page, stats in summary["pages"].items():
+            print(f"{page:<36} {stats['count']:>5} {_ms(stats['p50']):>8} {_ms(stats['p95']):>8} "
+                  f"{_ms(stats['p99']):>8} {format_bytes(int(stats['mean_bytes'])):>10}")
+    for user, failure in summary["failed_users"].items():
+        print(f"user {user} stopped: {failure}", file=sys.stderr)
+    for sample in summary["error_samples"][:3]:
+        print(f"error on {sample['mode']} / {sample['page']}: {sample['error']}", file=sys.stderr)
+
+
+def print_sweep(summaries: list[dict], slo_p95: float | None) -> None:
+    print(f"\n{'users':>6} {'reruns/s':>9} {'nav p50':>8} {'nav p95':>8} {'nav p99':>8} {'errors':>7}")
+    for s in summaries:
+        nav = s["navigate"]
+        print(f"{s['users']:>6} {s['throughput_per_second']:>9.2f} {_ms(nav.get('p50')):>8} "
+              f"{_ms(nav.get('p95')):>8} {_ms(nav.get('p99')):>8} {s['errors']:>7}")
+    if slo_p95 is not None:
+        within = [s["users"] for s in summaries
+                  if s["navigate"]["count"] and s["navigate"]["p95"] <= slo_p95 and not s["errors"]]
+        if within:
+            print(f"\nLargest level within navigation p95 <= {slo_p95 * 1000:.0f} ms: {max(within)} users")
+        else:
+            print(f"\nNo level met navigation p95 <= {slo_p95 * 1000:.0f} ms")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    level = parser.add_mutually_exclusive_group()
+    level.add_argument("--users", type=int, default=5, help="concurrent sessions")
+    level.add_argument("--sweep", type=int, nargs="+", help="run successive levels of concurrent sessions")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds per level")
+    parser.add_argument("--think", type=float, default=5.0, help="mean think time between clicks (seconds)")
+    parser.add_argument("--think-min", type=float, default=1.0, help="shortest think time (seconds)")
+    parser.add_argument("--cpa-share", type=float, default=0.5, help="share of clicks that go to CPA pages")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which sessions start")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds allowed per rerun")
+    parser.add_argument("--slo-p95", type=float, help="navigation p95 target (seconds) for --sweep")
+    parser.add_argument("--url", help="test a running server instead of starting one (e.g. http://localhost:8501)")
+    parser.add_argument("--server-pid", type=int, help="pid of the --url server, for memory figures")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the full results here")
+    args = parser.parse_args(argv)
+
+    scenario = Scenario(
+        duration=args.duration, think=args.think, think_min=min(args.think_min, args.think),
+        cpa_share=args.cpa_share, ramp_up=args.ramp_up, timeout=args.timeout, seed=args.seed,
+    )
+    process = None
+    if args.url:
+        base_url, server_pid = args.url.rstrip("/"), args.server_pid
+    else:
+        port = _free_port()
+        process = start_server(port)
+        base_url, server_pid = f"http://127.0.0.1:{port}", process.pid
+    ws_url = base_url.replace("http", "ws", 1) + "/_stcore/stream"
+
+    summaries = []
+    try:
+        _wait_healthy(base_url, process)
+        # Warm the server's caches (the cold scan) outside the measured levels
+        with Session(ws_url, scenario.timeout) as warmup:
+            warmup.rerun({})
+        for users in args.sweep or [args.users]:
+            summary = run_level(users, ws_url, server_pid, scenario)
+            print_level(summary)
+            summaries.append(summary)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+    if args.sweep:
+        print_sweep(summaries, args.slo_p95)
+
+    if args.json:
+        args.json.write_text(json.dumps({"scenario": asdict(scenario), "levels": summaries}, indent=2), encoding="utf-8")
+    return 1 if any(s["errors"] or s["failed_users"] for s in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,257 @@
+"""Memory accounting for the unified app: session state, Streamlit caches and module-level caches.
+
+``deep_sizeof`` walks an object graph once (each object counted once, by id)
+and understands containers, dataclasses and slotted objects, and pandas and
+numpy buffers. The report functions size what the app actually holds:
+
+* every session's ``st.session_state`` keys (all sessions on a live server,
+  otherwise the current one),
+* each ``st.cache_resource`` / ``st.cache_data`` function's entries,
+* the module-level caches listed in ``MODULE_CACHES``, if their module is loaded.
+
+``tracemalloc`` is process-wide and slows every allocation, so it only runs
+after an explicit ``start_tracing()``; snapshots are then taken on demand and
+compared with the previous one to show the top allocation sites and what grew
+in between.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+# (module, attribute) of in-process caches worth watching; modules that are not
+# imported yet are skipped rather than imported
+MODULE_CACHES = (
+    ("fingerprint", "_file_digests"),
+    ("page_timing", "TIMINGS"),
+    ("engine.metrics", "last_scan_metrics"),
+    ("utils.narrative", "_cache"),
+)
+
+TRACEMALLOC_FRAMES = 10
+
+
+def deep_sizeof(obj, seen: set[int] | None = None) -> int:
+    """Approximate bytes retained by ``obj`` and everything it references (each object once)."""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (type, type(sys), type(deep_sizeof))):
+            continue
+        seen.add(id(o))
+
+        nbytes = _buffer_size(o)
+        if nbytes is not None:
+            total += nbytes
+            continue
+
+        try:
+            total += sys.getsizeof(o)
+        except TypeError:
+            continue
+        if isinstance(o, (str, bytes, bytearray, int, float, complex, bool)) or o is None:
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            if hasattr(o, "__dict__"):
+                stack.append(vars(o))
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def _buffer_size(o) -> int | None:
+    """Bytes held by pandas / numpy objects, which getsizeof under-reports."""
+    module = type(o).__module__
+    if module.startswith("pandas"):
+        usage = getattr(o, "memory_usage", None)
+        if usage is not None:
+            try:
+                size = usage(deep=True)
+                return int(size.sum()) if hasattr(size, "sum") else int(size)
+            except TypeError:
+                return None
+    if module == "numpy" and hasattr(o, "nbytes"):
+        return int(o.nbytes) + sys.getsizeof(o) if o.base is None else sys.getsizeof(o)
+    return None
+
+
+@dataclass
+class SizeRow:
+    scope: str  # session id, cache function or module
+    name: str   # key, entry count or attribute
+    bytes: int
+    entries: int | None = None
+
+
+# ---------------------------------------------------------------------------
+# Session state
+# ---------------------------------------------------------------------------
+
+def _live_session_states() -> list[tuple[str, dict]]:
+    """(session id, user keys) for every session on a running Streamlit server."""
+    try:
+        from streamlit.runtime import Runtime
+
+        if not Runtime.exists():
+            return []
+        sessions = Runtime.instance()._session_mgr.list_sessions()
+        return [
+            (info.session.id, dict(info.session.session_state.filtered_state))
+            for info in sessions
+        ]
+    except (AttributeError, RuntimeError):  # private API moved between Streamlit releases
+        return []
+
+
+def session_state_report(current: dict | None = None) -> list[SizeRow]:
+    """Deep size of each session-state key, per session (largest first)."""
+    states = _live_session_states()
+    if not states and current is not None:
+        states = [("current", current)]
+    rows = []
+    for session_id, state in states:
+        for key, value in state.items():
+            rows.append(SizeRow(scope=session_id[:8], name=str(key), bytes=deep_sizeof(value)))
+    return sorted(rows, key=lambda r: -r.bytes)
+
+
+# ---------------------------------------------------------------------------
+# Streamlit caches
+# ---------------------------------------------------------------------------
+
+def _function_caches(api_module: str, registry: str) -> list:
+    try:
+        module = sys.modules.get(api_module) or __import__(api_module, fromlist=["_"])
+        caches = getattr(module, registry)._function_caches
+        return [cache for scoped in list(caches.values()) for cache in list(scoped.values())]
+    except (AttributeError, ImportError):  # private API moved between Streamlit releases
+        return []
+
+
+def cache_report() -> list[SizeRow]:
+    """Entries and deep size per cached function (st.cache_resource values, st.cache_data payloads)."""
+    rows = []
+    for cache in _function_caches("streamlit.runtime.caching.cache_resource_api", "_resource_caches"):
+        with cache._mem_cache_lock:
+            values = [result.value for result in cache._mem_cache.values()]
+        rows.append(SizeRow(
+            scope="cache_resource", name=cache.display_name,
+            bytes=deep_sizeof(values), entries=len(values),
+        ))
+    for cache in _function_caches("streamlit.runtime.caching.cache_data_api", "_data_caches"):
+        stats = [stat for family in cache.get_stats().values() for stat in family]
+        rows.append(SizeRow(
+            scope="cache_data", name=cache.display_name,
+            bytes=sum(stat.byte_length for stat in stats), entries=len(stats),
+        ))
+    return sorted(rows, key=lambda r: -r.bytes)
+
+
+# ---------------------------------------------------------------------------
+# Module-level caches
+# ---------------------------------------------------------------------------
+
+def module_cache_report() -> list[SizeRow]:
+    rows = []
+    for module_name, attr in MODULE_CACHES:
+        module = sys.modules.get(module_name)
+        if module is None or not hasattr(module, attr):
+            continue
+        value = getattr(module, attr)
+        rows.append(SizeRow(
+            scope=module_name, name=attr, bytes=deep_sizeof(value),
+            entries=len(value) if hasattr(value, "__len__") else None,
+        ))
+    return sorted(rows, key=lambda r: -r.bytes)
+
+
+def process_rss() -> int | None:
+    """Resident set size of this process in bytes (Linux), else None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# tracemalloc
+# ---------------------------------------------------------------------------
+
+_last_snapshot: tracemalloc.Snapshot | None = None
+
+
+def tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def start_tracing(frames: int = TRACEMALLOC_FRAMES) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_tracing() -> None:
+    global _last_snapshot
+    tracemalloc.stop()
+    _last_snapshot = None
+
+
+def allocation_snapshot(limit: int = 20) -> dict:
+    """
+    Top allocation sites now, and the top growth since the previous snapshot.
+
+    Only allocations made since ``start_tracing()`` are visible. Raises
+    RuntimeError while tracing is off.
+    """
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing; call start_tracing() first")
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+
+    def site(stat) -> str:
+        frame = stat.traceback[0]
+        return f"{frame.filename}:{frame.lineno}"
+
+    top = [
+        {"site": site(stat), "size": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+    growth = []
+    if _last_snapshot is not None:
+        growth = [
+            {"site": site(stat), "size_diff": stat.size_diff, "size": stat.size, "count_diff": stat.count_diff}
+            for stat in snapshot.compare_to(_last_snapshot, "lineno")[:limit]
+            if stat.size_diff
+        ]
+    _last_snapshot = snapshot
+    return {"taken_at": time.time(), "traced": current, "peak": peak, "top": top, "growth": growth}
+
+
+def format_bytes(n: int | None) -> str:
+    if n is None:
+        return "n/a"
+    if abs(n) < 1024:
+        return f"{n} B"
+    for unit in ("KiB", "MiB", "GiB"):
+        n /= 1024
+        if abs(n) < 1024 or unit == "GiB":
+            return f"{n:.1f} {unit}"
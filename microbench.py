@@ -0,0 +1,163 @@
+"""Small timing harness shared by the scanners' hot-path benchmarks.
+
+Each benchmark is a callable plus the number of units (documents, line items)
+it processes per call. ``measure`` auto-calibrates the loop count to at least
+``min_time`` seconds per round and keeps the best of ``rounds`` rounds, which
+is the least noisy estimate of the code's own cost on a shared machine.
+
+Results print as a table with throughput in units per second, can be saved to
+a JSON baseline, and can be compared against a saved baseline::
+
+    python -m benchmarks.hot_paths --save baseline.json
+    # ... change code ...
+    python -m benchmarks.hot_paths --compare baseline.json
+
+A benchmark slower than the baseline by more than ``--threshold`` is flagged
+and makes the run exit non-zero, so the suite can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_ROUNDS = 5
+DEFAULT_MIN_TIME = 0.2  # seconds per round
+DEFAULT_THRESHOLD = 0.15  # fractional slowdown flagged as a regression
+
+
+@dataclass
+class BenchResult:
+    name: str
+    scale: str
+    units: int  # documents / line items processed per call
+    unit_name: str
+    seconds: float  # best per-call time over all rounds
+    loops: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.scale}"
+
+    @property
+    def throughput(self) -> float:
+        return self.units / self.seconds if self.seconds else 0.0
+
+
+def measure(fn: Callable[[], object], rounds: int = DEFAULT_ROUNDS, min_time: float = DEFAULT_MIN_TIME) -> tuple[float, int]:
+    """Best per-call seconds of ``fn`` and the loop count used per round."""
+    fn()  # warm caches and lazy imports outside the timed rounds
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed / loops
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best, loops
+
+
+class Suite:
+    """Collects benchmark results for one run and handles printing, saving and comparing."""
+
+    def __init__(self, rounds: int = DEFAULT_ROUNDS, min_time: float = DEFAULT_MIN_TIME, only: list[str] | None = None):
+        self.rounds = rounds
+        self.min_time = min_time
+        self.only = only or []
+        self.results: list[BenchResult] = []
+
+    def bench(self, name: str, scale: str, fn: Callable[[], object], units: int, unit_name: str) -> None:
+        if self.only and not any(pattern in name for pattern in self.only):
+            return
+        seconds, loops = measure(fn, self.rounds, self.min_time)
+        result = BenchResult(name, scale, units, unit_name, seconds, loops)
+        self.results.append(result)
+        print(_format_row(result), flush=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        print(f"\nSaved {len(self.results)} results to {path}")
+
+    def compare(self, path: Path, threshold: float = DEFAULT_THRESHOLD) -> int:
+        """Print the change against a saved baseline; returns the number of regressions."""
+        baseline = {
+            f"{r['name']}@{r['scale']}": r
+            for r in json.loads(path.read_text(encoding="utf-8"))["results"]
+        }
+        print(f"\nAgainst {path} (regression threshold {threshold:.0%}):")
+        print(f"{'benchmark':<44} {'baseline':>12} {'now':>12} {'change':>8}")
+        regressions = 0
+        for r in self.results:
+            base = baseline.get(r.key)
+            if base is None:
+                print(f"{r.key:<44} {'-':>12} {_format_time(r.seconds):>12} {'new':>8}")
+                continue
+            change = r.seconds / base["seconds"] - 1 if base["seconds"] else 0.0
+            flag = ""
+            if change > threshold:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(f"{r.key:<44} {_format_time(base['seconds']):>12} {_format_time(r.seconds):>12} {change:>+8.1%}{flag}")
+        return regressions
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options common to every benchmark script."""
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="timed rounds per benchmark (best is kept)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="minimum seconds per round")
+    parser.add_argument("-k", "--only", nargs="+", help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--save", type=Path, help="write results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare results with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown flagged as a regression")
+
+
+def suite_from_args(args: argparse.Namespace) -> Suite:
+    print(f"{'benchmark':<44} {'per call':>12} {'throughput':>22} {'loops':>8}")
+    return Suite(rounds=args.rounds, min_time=args.min_time, only=args.only)
+
+
+def finish(suite: Suite, args: argparse.Namespace) -> int:
+    """Save and/or compare as requested; the exit status is non-zero on regressions."""
+    regressions = 0
+    if args.compare:
+        regressions = suite.compare(args.compare, args.threshold)
+    if args.save:
+        suite.save(args.save)
+    if regressions:
+        print(f"\n{regressions} benchmark(s) regressed", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def _format_row(r: BenchResult) -> str:
+    throughput = f"{r.throughput:,.0f} {r.unit_name}/s"
+    return f"{r.key:<44} {_format_time(r.seconds):>12} {throughput:>22} {r.loops:>8}"
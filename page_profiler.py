@@ -0,0 +1,149 @@
+"""On-demand deterministic profiler for one page execution.
+
+``TraceProfiler`` installs a ``sys.setprofile`` hook on the current thread and
+records every Python and C function entry/exit with a nanosecond timestamp.
+It is meant for a single rerun at a time: the overhead is a callback per call
+while armed and nothing otherwise. Calls made on other threads (e.g. the
+document fetch pool) are not traced.
+
+A capture exports as a speedscope "evented" profile (open in speedscope.app)
+or as folded stacks (``frame;frame;frame weight``) for flamegraph.pl, inferno
+and friends, with weights in microseconds of self time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+MAX_EVENTS = 2_000_000  # bounds memory for runaway pages; later events are dropped
+
+
+def _code_frame(code) -> tuple[str, str, int]:
+    return getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno
+
+
+def _c_frame(fn) -> tuple[str, str, int]:
+    name = getattr(fn, "__qualname__", fn.__name__)
+    module = getattr(fn, "__module__", None)  # None for methods of built-in types ("dict.get")
+    return f"{module}.{name}" if module else name, "<built-in>", 0
+
+
+class TraceProfiler:
+    def __init__(self, name: str = "profile", max_events: int = MAX_EVENTS):
+        self.name = name
+        self.max_events = max_events
+        self.frames: list[tuple[str, str, int]] = []
+        self.events: list[tuple[str, int, int]] = []  # ("O" | "C", frame index, ns since start)
+        self.truncated = False
+        self.duration_ns = 0
+        self._frame_index: dict[tuple[str, str, int], int] = {}
+        self._stack: list[int] = []
+        self._t0 = 0
+
+    # ------------------------------------------------------------------
+    # Capture
+    # ------------------------------------------------------------------
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def start(self) -> None:
+        self._t0 = time.perf_counter_ns()
+        sys.setprofile(self._callback)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+        end = time.perf_counter_ns() - self._t0
+        # Close frames still open when the capture stopped (the caller's own frames)
+        while self._stack:
+            idx = self._stack.pop()
+            if idx >= 0:
+                self.events.append(("C", idx, end))
+        self.duration_ns = end
+
+    def _index(self, key: tuple[str, str, int]) -> int:
+        idx = self._frame_index.get(key)
+        if idx is None:
+            idx = self._frame_index[key] = len(self.frames)
+            self.frames.append(key)
+        return idx
+
+    def _callback(self, frame, event, arg) -> None:
+        at = time.perf_counter_ns() - self._t0
+        if event == "call" or event == "c_call":
+            if len(self.events) >= self.max_events:
+                # Keep the nesting in step without recording the call
+                self.truncated = True
+                self._stack.append(-1)
+                return
+            key = _code_frame(frame.f_code) if event == "call" else _c_frame(arg)
+            idx = self._index(key)
+            self._stack.append(idx)
+            self.events.append(("O", idx, at))
+        elif self._stack:
+            # return / c_return / c_exception; returns from frames entered before
+            # start() arrive with an empty stack and are ignored
+            idx = self._stack.pop()
+            if idx >= 0:
+                self.events.append(("C", idx, at))
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_speedscope(self) -> dict:
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "page_profiler",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": os.path.relpath(file) if file.startswith(os.sep) else file, "line": line}
+                    for name, file, line in self.frames
+                ],
+            },
+            "profiles": [{
+                "type": "evented",
+                "name": self.name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": self.duration_ns,
+                "events": [{"type": kind, "frame": idx, "at": at} for kind, idx, at in self.events],
+            }],
+        }
+
+    def speedscope_json(self) -> str:
+        return json.dumps(self.to_speedscope(), separators=(",", ":"))
+
+    def folded(self) -> str:
+        """Folded stacks with self time in microseconds, heaviest first."""
+        weights: dict[tuple[int, ...], int] = {}
+        stack: list[int] = []
+        last = 0
+        for kind, idx, at in self.events:
+            if stack:
+                path = tuple(stack)
+                weights[path] = weights.get(path, 0) + at - last
+            last = at
+            if kind == "O":
+                stack.append(idx)
+            elif stack:
+                stack.pop()
+
+        names = [name for name, _, _ in self.frames]
+        lines = []
+        for path, ns in sorted(weights.items(), key=lambda item: -item[1]):
+            us = ns // 1000
+            if us:
+                lines.append(";".join(names[i].replace(";", ":") for i in path) + f" {us}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,209 @@
+"""Per-page render timing for the unified app.
+
+The router times every page script it executes and records the duration in
+an in-process registry keyed by ``(mode, page)``. Each key keeps a cumulative
+latency histogram since process start plus one histogram per minute, so the
+admin view can show both all-time numbers and a rolling window (the last
+``WINDOW_MINUTES``). Buckets are fixed, so recording is a bisect and a few
+increments under one lock.
+
+Snapshots are appended as JSON lines to ``PAGE_TIMING_LOG`` at most every
+``PAGE_TIMING_FLUSH_SECONDS``, piggybacking on page executions rather than
+running a background thread.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Upper bounds (seconds) of the latency buckets; a final +Inf bucket catches the rest
+BUCKET_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WINDOW_MINUTES = 15
+
+LOG_PATH = Path(os.environ.get("PAGE_TIMING_LOG", Path(__file__).resolve().parent / ".page_timings.log"))
+FLUSH_SECONDS = float(os.environ.get("PAGE_TIMING_FLUSH_SECONDS", 60))
+
+
+@dataclass
+class Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS) + 1))
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    errors: int = 0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if error:
+            self.errors += 1
+
+    def merge(self, other: Histogram) -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.errors += other.errors
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean": round(self.mean, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 6),
+            "buckets": dict(zip([*map(str, BUCKET_BOUNDS), "+Inf"], self.counts)),
+        }
+
+
+class _PageSeries:
+    """Cumulative histogram plus per-minute histograms for the rolling window."""
+
+    def __init__(self):
+        self.cumulative = Histogram()
+        self.minutes: deque[tuple[int, Histogram]] = deque()
+
+    def observe(self, seconds: float, error: bool, minute: int) -> None:
+        self.cumulative.observe(seconds, error)
+        if not self.minutes or self.minutes[-1][0] != minute:
+            self.minutes.append((minute, Histogram()))
+        self.minutes[-1][1].observe(seconds, error)
+        while self.minutes[0][0] <= minute - WINDOW_MINUTES:
+            self.minutes.popleft()
+
+    def window(self, minute: int) -> Histogram:
+        merged = Histogram()
+        for m, hist in self.minutes:
+            if m > minute - WINDOW_MINUTES:
+                merged.merge(hist)
+        return merged
+
+
+class PageTimings:
+    """Thread-safe registry of page render timings."""
+
+    def __init__(self, log_path: Path | None = LOG_PATH, flush_seconds: float = FLUSH_SECONDS):
+        self._series: dict[tuple[str, str], _PageSeries] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.log_path = log_path
+        self.flush_seconds = flush_seconds
+        self._last_flush = time.monotonic()
+
+    def record(self, mode: str, page: str, seconds: float, error: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            series = self._series.get((mode, page))
+            if series is None:
+                series = self._series[(mode, page)] = _PageSeries()
+            series.observe(seconds, error, int(now // 60))
+            due = self.log_path is not None and time.monotonic() - self._last_flush >= self.flush_seconds
+            if due:
+                self._last_flush = time.monotonic()
+        if due:
+            self.flush()
+
+    def snapshot(self) -> list[dict]:
+        """One row per (mode, page): all-time and rolling-window histogram summaries."""
+        minute = int(time.time() // 60)
+        with self._lock:
+            rows = [
+                {
+                    "mode": mode,
+                    "page": page,
+                    "total": series.cumulative.to_dict(),
+                    "window": series.window(minute).to_dict(),
+                }
+                for (mode, page), series in self._series.items()
+            ]
+        return sorted(rows, key=lambda r: -r["window"]["p95"])
+
+    def by_mode(self) -> dict[str, dict]:
+        """All-time histogram summary per mode."""
+        merged: dict[str, Histogram] = {}
+        with self._lock:
+            for (mode, _), series in self._series.items():
+                merged.setdefault(mode, Histogram()).merge(series.cumulative)
+        return {mode: hist.to_dict() for mode, hist in merged.items()}
+
+    def flush(self) -> None:
+        """Append a snapshot to the log file as one JSON line."""
+        if self.log_path is None:
+            return
+        line = json.dumps({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "window_minutes": WINDOW_MINUTES,
+            "modes": self.by_mode(),
+            "pages": self.snapshot(),
+        }, separators=(",", ":"))
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass  # timing must never break a page
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self.started_at = time.time()
+
+
+# Process-wide registry; this module is imported once and survives Streamlit reruns
+TIMINGS = PageTimings()
+
+
+class timed_page:
+    """Context manager recording one page execution in ``TIMINGS``.
+
+    The page name may be filled in after the script has run (``timer.page = ...``),
+    for apps that pick their page inside the script. Streamlit's control-flow
+    exceptions (st.stop, st.rerun) are recorded as normal executions.
+    """
+
+    def __init__(self, mode: str, page: str, timings: PageTimings = TIMINGS):
+        self.mode = mode
+        self.page = page
+        self.timings = timings
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        error = exc_type is not None and not _is_control_flow(exc_type)
+        self.timings.record(self.mode, self.page, elapsed, error=error)
+        return False
+
+
+def _is_control_flow(exc_type: type) -> bool:
+    return exc_type.__name__ in ("StopException", "RerunException")
@@ -0,0 +1,349 @@
+"""Synthetic scale fixtures for both scanners, generated from the bundled sample data.
+
+Every generated document is a copy of a real template from the repo with its
+identifiers, names and amounts varied, so generated data passes the same schema
+validation and exercises the same rules as the samples::
+
+    # 1 firm with 10k engagement files, 20% failing and 30% passing with warnings
+    python scale_fixtures.py cpa --out /tmp/fixtures --firms 1 --files-per-firm 10000 \\
+        --failure-rate 0.2 --warning-rate 0.3
+
+    # 3 claims of 500 projects and 100k expenditure lines each
+    python scale_fixtures.py sred --out /tmp/fixtures --claims 3 --projects 500 \\
+        --expenditure-lines 100000 --ineligible-rate 0.1 --error-rate 0.05
+
+CPA firms are written to ``<out>/cpa/firm_NNNN/`` (``firm_profile.json`` plus a
+``documents/`` tree); point the CPA app at one with ``CPA_FIRM_PROFILE`` and
+``CPA_DOCUMENT_SOURCE``. SR&ED claims are written to ``<out>/sred/claim_NNNN/``;
+point the Portfolio page at them with ``SRED_PORTFOLIO_DIR=<out>/sred``.
+Output is fully determined by ``--seed``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import random
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+CPA_DATA_DIR = BASE_DIR / "cpa-inspection-2 2" / "data"
+SRED_DATA_DIR = BASE_DIR / "sr&ed 2" / "sred_scanner" / "data"
+
+CLIENT_WORDS = (
+    "Maple", "Northern", "Lakeshore", "Granite", "Harbour", "Summit", "Cedar", "Prairie", "Riverside",
+    "Aurora", "Beacon", "Keystone", "Pioneer", "Heritage", "Evergreen", "Bluewater", "Ironwood", "Meridian",
+)
+CLIENT_TRADES = (
+    "Manufacturing", "Holdings", "Restaurants", "Services", "Logistics", "Dental", "Construction",
+    "Retail", "Consulting", "Farms", "Software", "Trucking", "Printing", "Design",
+)
+CLIENT_SUFFIXES = ("Ltd", "Inc", "Corp", "LLP")
+FIRM_SURNAMES = (
+    "Avery", "Bennett", "Chowdhury", "Dubois", "Fraser", "Gill", "Hughes", "Kowalski", "Lam", "MacLeod",
+    "Nguyen", "Okafor", "Pereira", "Singh", "Tremblay", "Wong",
+)
+PROVINCES = ("Ontario", "Quebec", "British Columbia", "Alberta")
+
+
+def _read(path: Path) -> dict | list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write(path: Path, data: dict | list) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def _jitter(rng: random.Random, amount: float, spread: float = 0.3) -> int:
+    return max(1, round(amount * rng.uniform(1 - spread, 1 + spread)))
+
+
+# ---------------------------------------------------------------------------
+# CPA practice inspection
+# ---------------------------------------------------------------------------
+
+def _client_name(rng: random.Random) -> str:
+    return f"{rng.choice(CLIENT_WORDS)} {rng.choice(CLIENT_TRADES)} {rng.choice(CLIENT_SUFFIXES)}"
+
+
+def generate_cpa(
+    out: Path,
+    firms: int,
+    files_per_firm: int,
+    failure_rate: float,
+    warning_rate: float,
+    seed: int,
+) -> None:
+    """Write ``firms`` firms of ``files_per_firm`` engagement files each under ``out / "cpa"``."""
+    rng = random.Random(seed)
+    documents_dir = CPA_DATA_DIR / "documents"
+    profile_template = _read(CPA_DATA_DIR / "firm_profile.json")
+    firm_docs = {path.name: _read(path) for path in sorted((documents_dir / "firm_level").glob("*.json"))}
+    templates: dict[str, list[dict]] = {}
+    for path in sorted((documents_dir / "engagement_files").glob("*.json")):
+        doc = _read(path)
+        templates.setdefault(doc["overall_status"], []).append(doc)
+    partners = [p["name"] for p in profile_template["partners"]]
+    preparers = [s["name"] for s in profile_template["staff"]]
+
+    for firm_no in range(1, firms + 1):
+        firm_dir = out / "cpa" / f"firm_{firm_no:04d}"
+        profile = copy.deepcopy(profile_template)
+        profile["firm_name"] = f"{rng.choice(FIRM_SURNAMES)} {rng.choice(FIRM_SURNAMES)} Professional Corporation"
+        profile["license_number"] = f"CPA-ON-{rng.randint(2005, 2024)}-{rng.randint(1000, 9999)}"
+        profile["total_clients"] = files_per_firm
+        _write(firm_dir / "firm_profile.json", profile)
+
+        # Firm-level documents carry the firm's own deficiencies; copy them as they are
+        for name, doc in firm_docs.items():
+            _write(firm_dir / "documents" / "firm_level" / name, doc)
+
+        for file_no in range(1, files_per_firm + 1):
+            roll = rng.random()
+            status = "fail" if roll < failure_rate else "pass_with_warning" if roll < failure_rate + warning_rate else "pass"
+            doc = copy.deepcopy(rng.choice(templates[status]))
+            doc["file_id"] = f"FILE-{file_no:05d}"
+            doc["client_name"] = _client_name(rng)
+            doc["engagement_partner"] = rng.choice(partners)
+            doc["prepared_by"] = rng.choice(preparers)
+            slug = doc["client_name"].lower().replace(" ", "_")
+            _write(firm_dir / "documents" / "engagement_files" / f"file_{file_no:05d}_{slug}.json", doc)
+
+        print(f"{firm_dir}: {files_per_firm} engagement files", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# SR&ED claims
+# ---------------------------------------------------------------------------
+
+def _expenditure_lines(
+    rng: random.Random,
+    template: dict,
+    project_ids: list[str],
+    ineligible: set[str],
+    lines: int,
+    error_rate: float,
+) -> dict:
+    """Salary, material and contract lines (1 : 12 : 7) spread over the claim's projects."""
+    eligible_ids = [pid for pid in project_ids if pid not in ineligible] or project_ids
+    n_salaries = max(1, lines // 20)
+    n_contracts = max(1, lines * 7 // 20)
+    n_materials = max(1, lines - n_salaries - n_contracts)
+
+    salary_templates = template["salaries"]["breakdown"]
+    breakdown = []
+    for i in range(n_salaries):
+        t = rng.choice(salary_templates)
+        total_salary = _jitter(rng, t["total_salary"])
+        sred_portion = round(total_salary * t["sred_portion"] / t["total_salary"])
+        allocated = rng.sample(project_ids, k=min(len(project_ids), rng.choice((1, 1, 2))))
+        shares = [rng.random() + 0.1 for _ in allocated]
+        allocation = {pid: round(sred_portion * share / sum(shares)) for pid, share in zip(allocated, shares)}
+        breakdown.append({
+            **t,
+            "name": f"{t['name']} {i + 1}",
+            "total_salary": total_salary,
+            "sred_portion": sum(allocation.values()),
+            "project_allocation": allocation,
+        })
+
+    good_materials = [m for m in template["materials"]["items"] if m["eligible"]]
+    bad_materials = [m for m in template["materials"]["items"] if not m["eligible"]] or good_materials
+    materials = []
+    for _ in range(n_materials):
+        bad = rng.random() < error_rate
+        t = rng.choice(bad_materials if bad else good_materials)
+        project = t["project"] if bad else rng.choice(project_ids)
+        materials.append({**t, "amount": _jitter(rng, t["amount"]), "project": project,
+                          "eligible": not bad and project not in ineligible})
+
+    good_contracts = [c for c in template["contracts"]["items"] if c["eligible"]]
+    bad_contracts = [c for c in template["contracts"]["items"] if not c["eligible"]] or good_contracts
+    contracts = []
+    for _ in range(n_contracts):
+        bad = rng.random() < error_rate
+        t = rng.choice(bad_contracts if bad else good_contracts)
+        project = rng.choice(project_ids if bad else eligible_ids)
+        contract = {**t, "amount": _jitter(rng, t["amount"]), "project": project,
+                    "eligible": not bad and project not in ineligible}
+        contract.pop("itc_eligible_amount", None)
+        contracts.append(contract)
+
+    total_sred = sum(s["sred_portion"] for s in breakdown)
+    specified = sum(s["sred_portion"] for s in breakdown if s.get("specified_employee"))
+    proxy_rate = template["overhead"]["proxy_rate"]
+    expenditures = copy.deepcopy(template)
+    expenditures["salaries"].update({
+        "line_300_total_salary_expenditures": sum(s["total_salary"] for s in breakdown),
+        "breakdown": breakdown,
+        "total_sred_salaries": total_sred,
+        "specified_employee_salary_included": specified,
+    })
+    expenditures["materials"] = {"line_360_total": sum(m["amount"] for m in materials), "items": materials}
+    expenditures["contracts"] = {"line_370_total": sum(c["amount"] for c in contracts), "items": contracts}
+    expenditures["overhead"].update({
+        "proxy_base_salaries": total_sred - specified,
+        "proxy_amount": round((total_sred - specified) * proxy_rate),
+    })
+    expenditures["deliberate_errors"] = _expenditure_errors(template["deliberate_errors"], materials, contracts, ineligible)
+    return expenditures
+
+
+def _expenditure_errors(templates: list[dict], materials: list[dict], contracts: list[dict], ineligible: set[str]) -> list[dict]:
+    """Reviewer findings for the generated lines, reusing the sample findings' rules and wording."""
+    by_category: dict[str, dict] = {}
+    for t in templates:
+        by_category.setdefault(t["category"], t)
+    errors = []
+
+    bad_materials = [m for m in materials if not m["eligible"] and m["project"] not in ineligible]
+    if bad_materials and "materials" in by_category:
+        total = sum(m["amount"] for m in bad_materials)
+        errors.append({
+            **by_category["materials"],
+            "error_id": f"EXP-{len(errors) + 1:03d}",
+            "description": f"{len(bad_materials)} material lines (${total:,}) not consumed or transformed by SR&ED",
+            "remediation": f"Remove ${total:,} from materials claim. Reduces qualified expenditures.",
+        })
+    on_ineligible = [c for c in contracts if c["project"] in ineligible]
+    if on_ineligible and "contracts" in by_category:
+        total = sum(c["amount"] for c in on_ineligible)
+        errors.append({
+            **by_category["contracts"],
+            "error_id": f"EXP-{len(errors) + 1:03d}",
+            "description": f"{len(on_ineligible)} contracts (${total:,}) on ineligible projects",
+            "remediation": f"Remove ineligible projects from the claim, including ${total:,} of contracts.",
+        })
+    return errors
+
+
+def generate_sred(
+    out: Path,
+    claims: int,
+    projects: int,
+    expenditure_lines: int,
+    ineligible_rate: float,
+    error_rate: float,
+    seed: int,
+) -> None:
+    """Write ``claims`` claims of ``projects`` projects and ``expenditure_lines`` lines under ``out / "sred"``."""
+    rng = random.Random(seed)
+    profile_template = _read(SRED_DATA_DIR / "client_profile.json")
+    project_templates = _read(SRED_DATA_DIR / "projects.json")
+    expenditures_template = _read(SRED_DATA_DIR / "expenditures.json")
+    documentation_template = _read(SRED_DATA_DIR / "documentation_log.json")
+    form_template = _read(SRED_DATA_DIR / "t661_form_data.json")
+
+    eligible_templates = [p for p in project_templates if p["eligibility_strength"] != "INELIGIBLE"]
+    ineligible_templates = [p for p in project_templates if p["eligibility_strength"] == "INELIGIBLE"] or eligible_templates
+    evidence_by_project: dict[str, list[dict]] = {}
+    for item in documentation_template["evidence_items"]:
+        evidence_by_project.setdefault(item["project"], []).append(item)
+    checklist_template = documentation_template["t661_evidence_checklist"]
+
+    for claim_no in range(1, claims + 1):
+        claim_dir = out / "sred" / f"claim_{claim_no:04d}"
+        company = f"{rng.choice(CLIENT_WORDS)} {rng.choice(CLIENT_TRADES)} Inc."
+        profile = copy.deepcopy(profile_template)
+        profile["company_name"] = company
+        profile["business_number"] = f"{rng.randint(100000000, 999999999)}RC0001"
+        profile["province"] = rng.choice(PROVINCES)
+
+        claim_projects = []
+        origin: dict[str, str] = {}  # generated project id -> template project id
+        for project_no in range(1, projects + 1):
+            t = rng.choice(ineligible_templates if rng.random() < ineligible_rate else eligible_templates)
+            pid = f"P{project_no:03d}"
+            origin[pid] = t["project_id"]
+            claim_projects.append({**copy.deepcopy(t), "project_id": pid, "title": f"{t['title']} ({pid})"})
+        ineligible = {p["project_id"] for p in claim_projects if p["eligibility_strength"] == "INELIGIBLE"}
+        project_ids = list(origin)
+
+        evidence_items = []
+        for pid, template_pid in origin.items():
+            for item in evidence_by_project.get(template_pid, []):
+                evidence_items.append({**item, "id": f"DOC-{len(evidence_items) + 1:06d}", "project": pid})
+        documentation = {
+            **copy.deepcopy(documentation_template),
+            "evidence_items": evidence_items,
+            "t661_evidence_checklist": {
+                line: {pid: values.get(template_pid, False) for pid, template_pid in origin.items()}
+                for line, values in checklist_template.items()
+            },
+        }
+
+        form = copy.deepcopy(form_template)
+        part_1 = form["parts_status"].get("part_1_general_info", {}).get("lines", {})
+        if "010_corp_name" in part_1:
+            part_1["010_corp_name"] = company
+            part_1["020_bn"] = profile["business_number"]
+            part_1["060_total_claim"] = projects
+            part_1["070_province"] = profile["province"]
+        part_2 = form["parts_status"].get("part_2_project_info", {})
+        for section in ("section_b_three_questions", "section_c_personnel_evidence"):
+            if isinstance(part_2.get(section), dict):
+                by_template = part_2[section]
+                part_2[section] = {pid: by_template.get(template_pid) for pid, template_pid in origin.items()}
+
+        _write(claim_dir / "client_profile.json", profile)
+        _write(claim_dir / "projects.json", claim_projects)
+        _write(claim_dir / "expenditures.json", _expenditure_lines(
+            rng, expenditures_template, project_ids, ineligible, expenditure_lines, error_rate,
+        ))
+        _write(claim_dir / "documentation_log.json", documentation)
+        _write(claim_dir / "t661_form_data.json", form)
+        print(f"{claim_dir}: {projects} projects, {expenditure_lines} expenditure lines", file=sys.stderr)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _rate(value: str) -> float:
+    rate = float(value)
+    if not 0 <= rate <= 1:
+        raise argparse.ArgumentTypeError(f"{value} is not between 0 and 1")
+    return rate
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="scanner", required=True)
+
+    cpa = sub.add_parser("cpa", help="CPA firms and engagement files")
+    cpa.add_argument("--firms", type=int, default=1)
+    cpa.add_argument("--files-per-firm", type=int, default=1000)
+    cpa.add_argument("--failure-rate", type=_rate, default=0.25, help="share of engagement files that fail")
+    cpa.add_argument("--warning-rate", type=_rate, default=0.25, help="share that pass with warnings")
+
+    sred = sub.add_parser("sred", help="SR&ED claims")
+    sred.add_argument("--claims", type=int, default=1)
+    sred.add_argument("--projects", type=int, default=50, help="projects per claim")
+    sred.add_argument("--expenditure-lines", type=int, default=1000, help="salary, material and contract lines per claim")
+    sred.add_argument("--ineligible-rate", type=_rate, default=0.2, help="share of projects that are ineligible")
+    sred.add_argument("--error-rate", type=_rate, default=0.05, help="share of material/contract lines that are ineligible")
+
+    for p in (cpa, sred):
+        p.add_argument("--out", type=Path, required=True, help="output directory")
+        p.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.scanner == "cpa":
+        if args.failure_rate + args.warning_rate > 1:
+            parser.error("--failure-rate and --warning-rate add up to more than 1")
+        generate_cpa(args.out, args.firms, args.files_per_firm, args.failure_rate, args.warning_rate, args.seed)
+    else:
+        generate_sred(
+            args.out, args.claims, args.projects, args.expenditure_lines,
+            args.ineligible_rate, args.error_rate, args.seed,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,88 @@
+"""Client for the local scan service (``scan_service.py``).
+
+The apps hand their heavy computation to the service when SCAN_SERVICE_URL is
+set (e.g. ``http://127.0.0.1:8766``) and compute in-process otherwise. Only the
+standard library is used, so importing this costs nothing in the apps.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+SERVICE_ENV_VAR = "SCAN_SERVICE_URL"
+DEFAULT_TIMEOUT = 300.0  # seconds; a cold scan of a large firm runs inside one request
+OVERLOAD_RETRIES = 3
+
+# The service is local: never route it through an HTTP(S)_PROXY from the environment.
+_OPENER = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+class ScanServiceError(RuntimeError):
+    """The service could not be reached or did not return a result."""
+
+
+def service_url() -> str | None:
+    """Base URL of the configured scan service, or None to compute in-process."""
+    return os.environ.get(SERVICE_ENV_VAR, "").rstrip("/") or None
+
+
+def _local_path(value: str | None) -> str | None:
+    """Absolute form of an existing local path (the service may run from another directory)."""
+    if value and os.path.exists(value):
+        return os.path.abspath(value)
+    return value
+
+
+def _post(path: str, payload: dict, timeout: float) -> dict:
+    base = service_url()
+    if base is None:
+        raise ScanServiceError(f"{SERVICE_ENV_VAR} is not set")
+    data = json.dumps(payload).encode("utf-8")
+    for attempt in range(OVERLOAD_RETRIES + 1):
+        request = urllib.request.Request(
+            base + path, data=data, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with _OPENER.open(request, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            if exc.code == 503 and attempt < OVERLOAD_RETRIES:
+                time.sleep(float(exc.headers.get("Retry-After", 1)))
+                continue
+            try:
+                detail = json.loads(exc.read()).get("error", exc.reason)
+            except ValueError:
+                detail = exc.reason
+            raise ScanServiceError(f"{path}: HTTP {exc.code}: {detail}") from exc
+        except (OSError, ValueError) as exc:
+            raise ScanServiceError(f"{path}: {exc}") from exc
+    raise AssertionError("unreachable")
+
+
+def request_scan(
+    root: str | None = None,
+    store: str | None = None,
+    source: str | None = None,
+    firm_profile: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> dict:
+    """
+    CPA scan result (``scan_result_to_dict`` form) from the service.
+
+    Either a data ``root`` or the same inputs as CPA_DOCUMENT_STORE /
+    CPA_DOCUMENT_SOURCE / CPA_FIRM_PROFILE; inputs not given are the bundled
+    defaults.
+    """
+    payload = {"root": _local_path(root), "store": _local_path(store),
+               "source": _local_path(source), "firm_profile": _local_path(firm_profile)}
+    return _post("/cpa/scan", {k: v for k, v in payload.items() if v}, timeout)
+
+
+def request_analysis(claim_dir: str | None = None, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """SR&ED ``analyze_claim`` result for ``claim_dir`` (default: the bundled claim) from the service."""
+    payload = {"claim_dir": _local_path(claim_dir)} if claim_dir else {}
+    return _post("/sred/analysis", payload, timeout)
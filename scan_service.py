@@ -0,0 +1,334 @@
+"""Local scan service: the CPA inspection scan and SR&ED claim analysis over HTTP.
+
+A small ASGI app that runs both scanners' heavy computation in a bounded pool
+of worker processes, so the Streamlit apps become thin clients (set
+SCAN_SERVICE_URL, see ``scan_client``) and the service can be sized and
+restarted on its own::
+
+    python scan_service.py --port 8766 --workers 4
+    SCAN_SERVICE_URL=http://127.0.0.1:8766 streamlit run app.py
+
+Endpoints take and return JSON:
+
+    POST /cpa/scan        {"root": DIR} or {"store", "source", "firm_profile"}   ScanResult
+    POST /sred/analysis   {"claim_dir": DIR}                                      analyze_claim result
+    GET  /health          workers, queue depth, cache and request counters
+
+A request names all of its inputs: an empty CPA request scans the bundled
+firm and an empty SR&ED request analyzes the bundled claim, whatever the
+service's own environment selects. Results are keyed by the inputs' data
+version (the fingerprints the apps already use), so:
+
+- unchanged inputs are answered from an in-memory LRU cache of encoded responses;
+- identical requests arriving while one is computing share that computation;
+- at most ``--max-pending`` computations are queued or running, and requests
+  beyond that get 503 with Retry-After instead of piling up.
+
+CPA scans also go through the engine's persistent scan cache, so a restarted
+service does not rescan unchanged firms. The ``X-Scan-Cache`` response header
+says whether a response was a ``hit``, ``shared`` or a fresh ``miss``.
+
+The service reads whatever local paths it is sent; it binds to 127.0.0.1 by default.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+ROOT_DIR = Path(__file__).resolve().parent
+for app_dir in (ROOT_DIR / "cpa-inspection-2 2", ROOT_DIR / "sr&ed 2" / "sred_scanner"):
+    if str(app_dir) not in sys.path:
+        sys.path.insert(0, str(app_dir))
+
+from engine.cache import load_or_run_scan, scan_input_key  # noqa: E402
+from engine.models import scan_result_to_dict  # noqa: E402
+from engine.scanner import is_data_root, scan_inputs  # noqa: E402
+from engine.sources import SCOPES, DocumentSourceError  # noqa: E402
+from utils.analysis import analyze_claim  # noqa: E402
+from utils.data_loader import CLAIM_FILES, DATA_DIR, claim_version, load_claim  # noqa: E402
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766  # 8765 is the engine.sources stand-in document server
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+RETRY_AFTER = 1  # seconds a rejected client should wait
+
+
+class Overloaded(Exception):
+    """Too many computations are already queued or running."""
+
+
+# --- Worker-side computations (run in the process pool; results are encoded JSON) ---
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _scan(inputs: dict, key: str) -> bytes:
+    with scan_inputs(**inputs):
+        return _encode(scan_result_to_dict(load_or_run_scan(key=key)))
+
+
+def _analyze(claim_dir: str) -> bytes:
+    return _encode(analyze_claim(load_claim(claim_dir)))
+
+
+def _warm() -> None:
+    """No-op task; running one per worker spawns the pool and its imports before the first request."""
+
+
+# --- Data-version keys (cheap; computed in the service process) ---
+
+def _scan_key(inputs: dict) -> str:
+    with scan_inputs(**inputs):
+        return scan_input_key()
+
+
+class ScanService:
+    """Bounded worker pool, in-flight request table and result cache behind the endpoints."""
+
+    def __init__(self, workers: int, max_pending: int, cache_bytes: int = DEFAULT_CACHE_BYTES):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache_bytes = cache_bytes
+        self._pool: ProcessPoolExecutor | None = None
+        # One thread, so key computations that select scanner inputs through the environment never overlap
+        self._keys = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan-keys")
+        self._cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self._cached_bytes = 0
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.counters = {"hits": 0, "misses": 0, "shared": 0, "rejected": 0, "errors": 0}
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Spawned, not forked: the service process is running threads by the time a pool starts
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def start(self) -> None:
+        self._pool = self._new_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm) for _ in range(self.workers)))
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        self._keys.shutdown(cancel_futures=True)
+
+    async def key(self, fn: Callable[..., str], *args) -> str:
+        """Run a data-version key function off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self._keys, fn, *args)
+
+    async def get(self, key: tuple, fn: Callable[..., bytes], *args) -> tuple[bytes, str]:
+        """Encoded result for ``key`` and how it was served: cache ``hit``, ``shared`` in-flight work, or ``miss``."""
+        body = self._cache.get(key)
+        if body is not None:
+            self._cache.move_to_end(key)
+            self.counters["hits"] += 1
+            return body, "hit"
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters["shared"] += 1
+            return await asyncio.shield(future), "shared"
+
+        if len(self._inflight) >= self.max_pending:
+            self.counters["rejected"] += 1
+            raise Overloaded()
+        self.counters["misses"] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory) and took the pool with it; start a fresh one
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+            future = loop.run_in_executor(self._pool, fn, *args)
+        self._inflight[key] = future
+        # Bookkeeping on completion rather than in the awaiting request, which may be cancelled
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(future), "miss"
+
+    def _finished(self, key: tuple, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self._store(key, future.result())
+
+    def _store(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.cache_bytes:
+            return
+        self._cache[key] = body
+        self._cached_bytes += len(body)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "pending": len(self._inflight),
+            "max_pending": self.max_pending,
+            "cache": {"entries": len(self._cache), "bytes": self._cached_bytes, "max_bytes": self.cache_bytes},
+            **self.counters,
+        }
+
+
+# --- HTTP endpoints ---
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+async def _json_body(request: Request) -> dict:
+    raw = await request.body()
+    payload = json.loads(raw) if raw.strip() else {}
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    return payload
+
+
+async def _serve(service: ScanService, key: tuple, fn: Callable[..., bytes], *args) -> Response:
+    try:
+        body, served = await service.get(key, fn, *args)
+    except Overloaded:
+        return JSONResponse(
+            {"error": f"{service.max_pending} computations already pending; retry shortly"},
+            status_code=503,
+            headers={"Retry-After": str(RETRY_AFTER)},
+        )
+    except BrokenProcessPool:
+        service.counters["errors"] += 1
+        return _error(503, "a worker process died during the request; retry it")
+    except Exception as exc:  # a malformed firm or claim is the caller's problem, not the service's
+        service.counters["errors"] += 1
+        return _error(422, f"{type(exc).__name__}: {exc}")
+    return Response(body, media_type="application/json", headers={"X-Scan-Cache": served})
+
+
+def _text_field(payload: dict, name: str) -> str | None:
+    """A path or URL field from a request, or None when it is absent or null."""
+    value = payload.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{name} must be a non-empty string")
+    return value
+
+
+def _cpa_inputs(payload: dict) -> dict:
+    """Scanner inputs from a request: a data root, or store/source/firm_profile as the env vars take them."""
+    root = _text_field(payload, "root")
+    if root:
+        root = Path(root).resolve()
+        if not is_data_root(root):
+            raise ValueError(f"{root} is not a data root (needs firm_profile.json and documents/)")
+        return {"source": str(root / "documents"), "firm_profile": str(root / "firm_profile.json")}
+    # Inputs not given are the bundled defaults, whatever the service's own environment says
+    inputs = {"store": None, "source": None, "firm_profile": None}
+    fields = {name: _text_field(payload, name) for name in inputs}
+    if fields["store"]:
+        store = Path(fields["store"]).resolve()
+        if not store.is_file():
+            raise ValueError(f"store {store} is not a file")
+        inputs["store"] = str(store)
+    source = fields["source"]
+    if source and source.startswith(("http://", "https://")):
+        inputs["source"] = source
+    elif source:
+        source = Path(source).resolve()
+        if not all((source / scope).is_dir() for scope in SCOPES):
+            needs = " and ".join(f"{scope}/" for scope in SCOPES)
+            raise ValueError(f"source {source} is not a documents directory (needs {needs})")
+        inputs["source"] = str(source)
+    if fields["firm_profile"]:
+        firm_profile = Path(fields["firm_profile"]).resolve()
+        if not firm_profile.is_file():
+            raise ValueError(f"firm_profile {firm_profile} is not a file")
+        inputs["firm_profile"] = str(firm_profile)
+    return inputs
+
+
+def _claim_dir(payload: dict) -> str:
+    claim_dir = os.path.abspath(_text_field(payload, "claim_dir") or DATA_DIR)
+    missing = [name for name in CLAIM_FILES.values() if not os.path.isfile(os.path.join(claim_dir, name))]
+    if missing:
+        raise ValueError(f"{claim_dir} is not a claim directory (missing {', '.join(missing)})")
+    return claim_dir
+
+
+def create_app(service: ScanService) -> Starlette:
+    async def cpa_scan(request: Request) -> Response:
+        try:
+            inputs = _cpa_inputs(await _json_body(request))
+        except ValueError as exc:
+            return _error(400, str(exc))
+        try:
+            key = await service.key(_scan_key, inputs)
+        except (OSError, ValueError, DocumentSourceError) as exc:
+            return _error(422, f"{type(exc).__name__}: {exc}")
+        return await _serve(service, ("cpa", key), _scan, inputs, key)
+
+    async def sred_analysis(request: Request) -> Response:
+        try:
+            claim_dir = _claim_dir(await _json_body(request))
+        except ValueError as exc:
+            return _error(400, str(exc))
+        try:
+            version = await service.key(claim_version, claim_dir)
+        except OSError as exc:
+            return _error(422, f"{type(exc).__name__}: {exc}")
+        return await _serve(service, ("sred", claim_dir, version), _analyze, claim_dir)
+
+    async def health(request: Request) -> Response:
+        return JSONResponse(service.health())
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        await service.start()
+        try:
+            yield
+        finally:
+            service.stop()
+
+    return Starlette(
+        routes=[
+            Route("/cpa/scan", cpa_scan, methods=["POST"]),
+            Route("/sred/analysis", sred_analysis, methods=["POST"]),
+            Route("/health", health, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--max-pending", type=int, help="queued or running computations before 503 (default: 4 per worker)")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / 2**20, help="in-memory result cache size")
+    args = parser.parse_args(argv)
+
+    service = ScanService(args.workers, args.max_pending or 4 * args.workers, int(args.cache_mb * 2**20))
+    print(f"Scan service on http://{args.host}:{args.port} ({args.workers} workers)", flush=True)
+    uvicorn.run(create_app(service), host=args.host, port=args.port, log_level="warning", access_log=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -71,6 +71,7 @@ against CRA rules and identifies compliance issues before filing.
 | **Form T661 Review** | Full form completeness check (all 10 parts) |
 | **Risk Report** | Final risk score + remediation plan |
 | **ITC Calculator** | Federal + provincial ITC estimate |
+| **Portfolio** | Batch scoring across every claim in the portfolio |
 
 ---
 **Client:** {company} | **Fiscal Year:** {fy} | **Projects:** {n_proj}
@@ -0,0 +1,91 @@
+"""Micro-benchmarks of the SR&ED scoring hot paths at several claim sizes.
+
+Covers the overall score, issue aggregation and the corrected and as-filed
+expenditure calculations. Scale ``sample`` is the bundled claim; a scale of
+``PROJECTSxLINES`` is a claim of that many projects and expenditure lines,
+generated with ``scale_fixtures`` into a temporary directory. Throughput is
+expenditure line items per second (salary, material and contract lines)::
+
+    python -m benchmarks.hot_paths [--scale sample 50x1000 500x100000] [-k expenditures]
+    python -m benchmarks.hot_paths --save baselines/main.json
+    python -m benchmarks.hot_paths --compare baselines/main.json
+"""
+
+import argparse
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+sys.path.insert(0, BASE_DIR)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import microbench  # noqa: E402
+from scale_fixtures import generate_sred  # noqa: E402
+
+from utils.data_loader import DATA_DIR, load_claim  # noqa: E402
+from utils.scoring import (  # noqa: E402
+    calculate_overall_score,
+    get_all_issues,
+    calculate_corrected_expenditures,
+    calculate_uncorrected_expenditures,
+)
+
+
+def line_items(expenditures):
+    return (
+        len(expenditures["salaries"]["breakdown"])
+        + len(expenditures["materials"]["items"])
+        + len(expenditures["contracts"]["items"])
+    )
+
+
+def bench_claim(suite, scale, claim):
+    projects = claim["projects"]
+    expenditures = claim["expenditures"]
+    documentation = claim["documentation"]
+    form = claim["t661_form"]
+    client = claim["client_profile"]
+    items = line_items(expenditures)
+
+    suite.bench("calculate_overall_score", scale,
+                lambda: calculate_overall_score(projects, expenditures, documentation, form), items, "lines")
+    suite.bench("get_all_issues", scale,
+                lambda: get_all_issues(projects, expenditures, documentation, form, client), items, "lines")
+    suite.bench("calculate_corrected_expenditures", scale,
+                lambda: calculate_corrected_expenditures(expenditures, projects), items, "lines")
+    suite.bench("calculate_uncorrected_expenditures", scale,
+                lambda: calculate_uncorrected_expenditures(expenditures), items, "lines")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", nargs="+", default=["sample", "50x1000", "500x100000"],
+                        help="'sample' for the bundled claim, or PROJECTSxLINES for a generated one")
+    parser.add_argument("--seed", type=int, default=0)
+    microbench.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    suite = microbench.suite_from_args(args)
+    with tempfile.TemporaryDirectory(prefix="sred-bench-") as tmp:
+        for scale in args.scale:
+            if scale == "sample":
+                claim_dir = DATA_DIR
+            else:
+                try:
+                    projects, lines = (int(n) for n in scale.lower().split("x"))
+                except ValueError:
+                    parser.error(f"scale {scale!r} is not 'sample' or PROJECTSxLINES")
+                out = os.path.join(tmp, scale)
+                generate_sred(out=Path(out), claims=1, projects=projects,
+                              expenditure_lines=lines, ineligible_rate=0.2, error_rate=0.05, seed=args.seed)
+                claim_dir = os.path.join(out, "sred", "claim_0001")
+            bench_claim(suite, scale, load_claim(claim_dir))
+    return microbench.finish(suite, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -11,15 +11,9 @@ if ROOT_DIR not in sys.path:
 from branding import PALETTE
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from utils.scoring import (
-    calculate_overall_score,
-    get_all_issues,
-    calculate_corrected_expenditures,
-    calculate_uncorrected_expenditures,
-)
 from utils.formatters import fmt_currency
-from utils.constants import ITC_CCPC_ENHANCED_RATE
-from utils.data_loader import ensure_data_loaded
+from utils.data_loader import ensure_data_loaded, current_analysis
+from utils.evidence import detect_documentation_gaps
 
 ensure_data_loaded()
 
@@ -27,10 +21,10 @@ projects = st.session_state.projects
 expenditures = st.session_state.expenditures
 documentation = st.session_state.documentation
 form_data = st.session_state.t661_form
-client = st.session_state.client_profile
+analysis = current_analysis()
 
-# Calculate scores
-overall_score, subscores = calculate_overall_score(projects, expenditures, documentation, form_data)
+overall_score = analysis["overall_score"]
+subscores = analysis["subscores"]
 
 # Determine color
 if overall_score <= 40:
@@ -105,7 +99,7 @@ with m2:
         st.success(f"**Expenditure Issues**\n\nNone found")
 
 # Documentation gaps
-doc_gaps = sum(1 for item in documentation["evidence_items"] if item.get("gap_flag"))
+doc_gaps = len(detect_documentation_gaps(documentation, projects))
 with m3:
     if doc_gaps > 0:
         st.warning(f"**Documentation Gaps**\n\n{doc_gaps} critical")
@@ -125,7 +119,7 @@ st.divider()
 
 # Issues Summary Table
 st.subheader("Issues Summary")
-issues = get_all_issues(projects, expenditures, documentation, form_data, client)
+issues = analysis["issues"]
 
 if issues:
     issue_data = []
@@ -149,15 +143,15 @@ st.divider()
 # Estimated ITC Impact
 st.subheader("Estimated ITC Impact")
 
-uncorrected = calculate_uncorrected_expenditures(expenditures)
-corrected = calculate_corrected_expenditures(expenditures)
+uncorrected = analysis["expenditures"]["filed"]
+corrected = analysis["expenditures"]["corrected"]
 
 col_before, col_after = st.columns(2)
 
 with col_before:
     st.markdown("### As Filed (with errors)")
     st.metric("Total Qualified Expenditures", fmt_currency(uncorrected["total"]))
-    itc_before = round(uncorrected["total"] * ITC_CCPC_ENHANCED_RATE)
+    itc_before = analysis["itc"]["filed_federal"]
     st.metric("Estimated Federal ITC (35%)", fmt_currency(itc_before))
     st.error("**HIGH AUDIT RISK** — Includes ineligible project and expenditures")
 
@@ -168,7 +162,7 @@ with col_after:
         fmt_currency(corrected["total"]),
         delta=fmt_currency(corrected["total"] - uncorrected["total"]),
     )
-    itc_after = round(corrected["total"] * ITC_CCPC_ENHANCED_RATE)
+    itc_after = analysis["itc"]["federal"]["total"]
     st.metric(
         "Estimated Federal ITC (35%)",
         fmt_currency(itc_after),
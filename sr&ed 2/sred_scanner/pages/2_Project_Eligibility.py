@@ -4,12 +4,13 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from utils.rules import FIVE_QUESTIONS
-from utils.constants import LINE_242_WORD_LIMIT, LINE_244_WORD_LIMIT, LINE_246_WORD_LIMIT
+from utils.narrative import QUALITY_INDICATORS, analyze_projects
 from utils.data_loader import ensure_data_loaded
 
 ensure_data_loaded()
 
 projects = st.session_state.projects
+narrative_analysis = analyze_projects(projects)
 
 st.header("Project Eligibility Analysis")
 st.markdown("Each project is evaluated against the CRA **Five-Question Eligibility Test** "
@@ -79,18 +80,17 @@ for idx, (tab, project) in enumerate(zip(tabs, projects)):
         # Narrative Analysis
         st.subheader("Narrative Analysis (T661 Part 2, Section B)")
 
-        narratives = [
-            ("Line 242 — Scientific/Technological Advancement", project["line_242_word_count"], LINE_242_WORD_LIMIT),
-            ("Line 244 — Technological Uncertainty", project["line_244_word_count"], LINE_244_WORD_LIMIT),
-            ("Line 246 — Work Performed", project["line_246_word_count"], LINE_246_WORD_LIMIT),
-        ]
+        analysis = narrative_analysis[project["project_id"]]
 
-        for label, wc, limit in narratives:
-            pct = wc / limit
+        for line in analysis["lines"]:
+            label, wc, limit, pct = line["label"], line["word_count"], line["limit"], line["ratio"]
             col_label, col_bar = st.columns([1, 2])
             with col_label:
                 st.markdown(f"**{label}**")
                 st.markdown(f"{wc} / {limit} words ({pct:.0%})")
+                stored = line["stored_word_count"]
+                if stored is not None and stored != wc:
+                    st.caption(f"Form data states {stored} words; counted {wc} in the narrative text.")
             with col_bar:
                 if pct < 0.5:
                     st.progress(pct, text=f"⚠️ Under 50% — too brief")
@@ -105,29 +105,19 @@ for idx, (tab, project) in enumerate(zip(tabs, projects)):
                     "CRA reviewers expect detailed descriptions demonstrating SR&ED eligibility. "
                     "Short narratives may trigger additional scrutiny."
                 )
+            elif pct > 1.0:
+                st.error(
+                    f"**Flag:** Narrative exceeds the {limit}-word limit by {wc - limit} words. "
+                    "*Source: T661 form instructions*"
+                )
 
         # Quality indicators
         if project["project_id"] != "P003":
-            narrative_text = (
-                project.get("line_242_scientific_technological_advancement", "") + " " +
-                project.get("line_244_technological_uncertainty", "") + " " +
-                project.get("line_246_work_performed", "")
-            ).lower()
-
-            quality_keywords = {
-                "hypothesis": "Hypotheses mentioned",
-                "experiment": "Experiments referenced",
-                "systematic": "Systematic approach described",
-                "uncertainty": "Uncertainty articulated",
-                "advancement": "Advancement claimed",
-                "measured": "Measurements cited",
-                "documented": "Documentation referenced",
-            }
-
             st.markdown("**Quality Indicators:**")
-            for kw, label in quality_keywords.items():
-                if kw in narrative_text:
-                    st.markdown(f"  ✅ {label}")
+            for kw, (label, _) in QUALITY_INDICATORS.items():
+                hits = analysis["indicators"][kw]
+                if hits:
+                    st.markdown(f"  ✅ {label} ({hits}×)")
                 else:
                     st.markdown(f"  ⬜ {label}")
 
@@ -10,8 +10,7 @@ from utils.constants import (
     SPECIFIED_EMPLOYEE_PPA_CAP_MULTIPLIER, PROXY_RATE,
     ARMS_LENGTH_CONTRACT_ITC_RATE,
 )
-from utils.scoring import calculate_corrected_expenditures, calculate_uncorrected_expenditures
-from utils.data_loader import ensure_data_loaded
+from utils.data_loader import ensure_data_loaded, current_analysis
 
 ensure_data_loaded()
 
@@ -170,8 +169,9 @@ st.divider()
 # --- Expenditure Summary ---
 st.subheader("Expenditure Summary: Before vs After Correction")
 
-uncorrected = calculate_uncorrected_expenditures(expenditures)
-corrected = calculate_corrected_expenditures(expenditures)
+analysis = current_analysis()
+uncorrected = analysis["expenditures"]["filed"]
+corrected = analysis["expenditures"]["corrected"]
 
 summary_data = {
     "Category": ["Salaries (eligible)", "Materials", "Contracts", "PPA (55%)", "**Total**"],
@@ -201,7 +201,12 @@ summary_data = {
 df_summary = pd.DataFrame(summary_data)
 st.dataframe(df_summary, use_container_width=True, hide_index=True)
 
+removed = analysis["ineligible_projects"]
+removed_text = (
+    f"removing ineligible project{'s' if len(removed) > 1 else ''} {', '.join(removed)} and "
+    if removed else ""
+)
 st.info(
     f"**Net Reduction:** {fmt_currency(uncorrected['total'] - corrected['total'])} in qualified expenditures "
-    "after removing ineligible project P003 and correcting expenditure errors."
+    f"after {removed_text}correcting expenditure errors."
 )
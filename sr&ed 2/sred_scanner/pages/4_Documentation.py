@@ -1,5 +1,5 @@
 import streamlit as st
-import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 from datetime import datetime
 import sys
@@ -13,11 +13,15 @@ from branding import PALETTE
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from utils.data_loader import ensure_data_loaded
+from utils.evidence import detect_documentation_gaps, evidence_interval
+from utils.scoring import ineligible_project_ids
+from utils.timeline import build_evidence_timeline
 
 ensure_data_loaded()
 
 documentation = st.session_state.documentation
 projects = st.session_state.projects
+gaps = detect_documentation_gaps(documentation, projects)
 
 st.header("Documentation & Evidence Trail Audit")
 st.markdown("CRA's primary review focus is contemporaneous documentation. "
@@ -28,93 +32,41 @@ st.divider()
 # --- Timeline Visualization ---
 st.subheader("Evidence Timeline")
 
-# Build timeline data
-timeline_items = []
-project_colors = {
-    "P001": PALETTE.deep_blue,
-    "P002": PALETTE.status_success,
-    "P003": PALETTE.status_critical,
+# Ineligible projects in red; eligible ones cycle through the remaining palette colours
+ineligible = ineligible_project_ids(projects)
+eligible_palette = [PALETTE.deep_blue, PALETTE.status_success, PALETTE.primary_blue, PALETTE.status_warning, PALETTE.status_info]
+eligible_ids = [p["project_id"] for p in projects if p["project_id"] not in ineligible]
+project_colors = {pid: eligible_palette[i % len(eligible_palette)] for i, pid in enumerate(eligible_ids)}
+project_colors.update({pid: PALETTE.status_critical for pid in ineligible})
+project_labels = {
+    "P001": "P001: Sensor Fusion",
+    "P002": "P002: Anomaly Detection",
+    "P003": "P003: GraphQL Migration",
 }
-type_symbols = {
-    "project_initiation_record": "diamond",
-    "literature_review": "square",
-    "lab_notebook": "circle",
-    "test_data": "triangle-up",
-    "technical_report": "star",
-    "source_code": "hexagon",
-    "timesheets": "cross",
-    "feasibility_report": "diamond",
-    "project_plan": "square",
-    "jira_tickets": "pentagon",
+project_rows = {
+    p["project_id"]: (y, project_labels.get(p["project_id"], f"{p['project_id']}: {p['title'][:24]}"))
+    for y, p in enumerate(projects)
 }
 
-fig = go.Figure()
-
-# Add gap highlight for P002
-fig.add_shape(
-    type="rect",
-    x0="2024-06-15", x1="2024-09-03",
-    y0=-0.5, y1=2.5,
-    fillcolor="rgba(196, 131, 142, 0.18)",
-    line=dict(color=PALETTE.status_critical, width=2, dash="dash"),
-)
-fig.add_annotation(
-    x="2024-07-24", y=2.3,
-    text="⚠️ 80-Day Documentation Gap (P002)",
-    showarrow=False,
-    font=dict(color=PALETTE.status_critical, size=12, family="Arial Black"),
-)
-
-project_y = {"P001": 0, "P002": 1, "P003": 2}
-
-for item in documentation["evidence_items"]:
-    pid = item["project"]
-    y = project_y.get(pid, 0)
-
-    # Parse date
-    if "date" in item:
-        x_date = item["date"]
-        hover_date = item["date"]
-    elif "date_range" in item:
-        dates = item["date_range"].split(" to ")
-        x_date = dates[0]
-        hover_date = item["date_range"]
-    else:
-        continue
-
-    symbol = type_symbols.get(item["type"], "circle")
-    color = project_colors.get(pid, PALETTE.text_muted)
-
-    # Flag items
-    flag_text = ""
-    if item.get("gap_flag"):
-        flag_text = " ⚠️ GAP"
-        color = PALETTE.status_critical
-    if item.get("flag"):
-        flag_text = " ⚠️ FLAG"
-        color = PALETTE.status_warning
-
-    fig.add_trace(go.Scatter(
-        x=[x_date],
-        y=[y],
-        mode="markers",
-        marker=dict(size=14, color=color, symbol=symbol, line=dict(width=1, color="white")),
-        name=f"{pid}: {item['type']}",
-        hovertext=f"<b>{item['title']}</b><br>Date: {hover_date}<br>Format: {item['format']}{flag_text}",
-        hoverinfo="text",
-        showlegend=False,
-    ))
-
-fig.update_layout(
-    height=300,
-    xaxis=dict(title="2024", range=["2024-01-01", "2024-12-31"]),
-    yaxis=dict(
-        tickvals=[0, 1, 2],
-        ticktext=["P001: Sensor Fusion", "P002: Anomaly Detection", "P003: GraphQL Migration"],
-        range=[-0.5, 2.5],
-    ),
-    margin=dict(t=30, b=40, l=200, r=30),
-)
+
+@st.cache_data(max_entries=32)
+def get_timeline_json(data_version, _documentation, _gaps, _project_rows):
+    fig = build_evidence_timeline(
+        _documentation,
+        _gaps,
+        _project_rows,
+        project_colors,
+        {
+            "gap": PALETTE.status_critical,
+            "flag": PALETTE.status_warning,
+            "default": PALETTE.text_muted,
+            "gap_fill": "rgba(196, 131, 142, 0.18)",
+        },
+    )
+    return fig.to_json()
+
+
+fig = pio.from_json(get_timeline_json(st.session_state.data_version, documentation, gaps, project_rows))
 st.plotly_chart(fig, use_container_width=True)
 
 st.divider()
@@ -149,9 +101,8 @@ check_data = []
 for key, label in checklist_display.items():
     row = {"Line": label}
     project_vals = checklist.get(key, {})
-    row["P001"] = format_check(project_vals.get("P001"))
-    row["P002"] = format_check(project_vals.get("P002"))
-    row["P003"] = format_check(project_vals.get("P003"))
+    for p in projects:
+        row[p["project_id"]] = format_check(project_vals.get(p["project_id"]))
     check_data.append(row)
 
 df_check = pd.DataFrame(check_data)
@@ -159,23 +110,43 @@ st.dataframe(df_check, use_container_width=True, hide_index=True)
 
 st.divider()
 
-# --- P002 Documentation Gap Deep Dive ---
-st.subheader("P002 Documentation Gap — Deep Dive")
+# --- Documentation Gap Deep Dive ---
+st.subheader("Documentation Gaps — Deep Dive")
 
-st.error(
-    "**80-Day Documentation Gap Detected**\n\n"
-    "**Period:** June 15, 2024 to September 3, 2024\n\n"
-    "**Cause:** Team lead on parental leave. No delegate assigned for documentation.\n\n"
-    "**Impact:** Lab notebook entries (Confluence: CloudAnomaly-R&D Space) suspended for 80 days. "
-    "89 entries before gap, 67 entries after resumption."
-)
+if not gaps:
+    st.success("No uncovered periods found in the contemporaneous experimental records.")
 
-st.warning(
-    "**Note:** Git commits continued during the gap period — code exists but no experimental "
-    "rationale was recorded. The Git repo (novatech/cloud-anomaly-gnn) shows 412 total commits "
-    "spanning the entire project period, indicating active development without corresponding "
-    "SR&ED documentation."
-)
+for gap in gaps:
+    gap_start = datetime.strptime(gap["start"], "%Y-%m-%d")
+    gap_end = datetime.strptime(gap["end"], "%Y-%m-%d")
+    project_items = [i for i in documentation["evidence_items"] if i["project"] == gap["project"]]
+
+    notebooks = [(i, evidence_interval(i)) for i in project_items if i["type"] == "lab_notebook"]
+    entries_before = sum(i.get("entries", 0) for i, iv in notebooks if iv and iv[1].isoformat() < gap["start"])
+    entries_after = sum(i.get("entries", 0) for i, iv in notebooks if iv and iv[0].isoformat() > gap["end"])
+
+    details = (
+        f"**{gap['days']}-Day Documentation Gap Detected ({gap['project']})**\n\n"
+        f"**Period:** {gap_start.strftime('%B %d, %Y')} to {gap_end.strftime('%B %d, %Y')}\n\n"
+    )
+    if gap["reason"]:
+        details += f"**Cause:** {gap['reason']}\n\n"
+    details += f"**Impact:** No contemporaneous experimental records for {gap['days']} days."
+    if entries_before or entries_after:
+        details += f" {entries_before} lab notebook entries before gap, {entries_after} entries after resumption."
+    st.error(details)
+
+    for code in project_items:
+        interval = evidence_interval(code)
+        if code["type"] != "source_code" or interval is None:
+            continue
+        if interval[0].isoformat() <= gap["end"] and interval[1].isoformat() >= gap["start"]:
+            commits = f"{code['commits']} total commits" if code.get("commits") else "commits"
+            st.warning(
+                "**Note:** Git commits continued during the gap period — code exists but no experimental "
+                f"rationale was recorded. {code['title']} shows {commits} spanning {code['date_range']}, "
+                "indicating active development without corresponding SR&ED documentation."
+            )
 
 with st.expander("CRA Guidance on Documentation Gaps"):
     st.markdown(
@@ -185,7 +156,7 @@ with st.expander("CRA Guidance on Documentation Gaps"):
         "> *'The claimant should be able to demonstrate that a systematic investigation "
         "or search was carried out by providing evidence that was recorded as the work progressed.'*\n\n"
         "**Risk Assessment:** CRA reviewer will likely request an explanation for the gap. "
-        "An 80-day gap on an otherwise strong project weakens the claim for that period.\n\n"
+        "A multi-month gap on an otherwise strong project weakens the claim for that period.\n\n"
         "**Recommendation:** Prepare a retrospective memo reconstructing the experimental approach "
         "during the gap period using:\n"
         "- Git commit messages and code review comments\n"
@@ -198,16 +169,17 @@ with st.expander("CRA Guidance on Documentation Gaps"):
 
 st.divider()
 
-# --- P003 Documentation Failure ---
-st.subheader("P003 Documentation Assessment")
-
-st.error(
-    "**Documentation Inadequate for SR&ED Claim**\n\n"
-    "Project P003 documentation consists entirely of standard software engineering artifacts:\n\n"
-    "- **Confluence page:** Standard project plan (not an SR&ED PIR). No hypotheses, no uncertainty analysis.\n"
-    "- **Jira tickets:** 47 standard development stories. No experimental design or hypothesis tracking.\n"
-    "- **Timesheets:** Standard time entries (not SR&ED-specific allocation).\n\n"
-    "**Assessment:** No SR&ED-type records exist for this project. There are no records of hypotheses "
-    "formulated, experiments conducted, or technological uncertainties investigated. This is consistent "
-    "with the project's ineligibility — it was standard development work documented as such."
-)
+# --- P003 Documentation Failure (the bundled sample claim's ineligible project) ---
+if "P003" in ineligible:
+    st.subheader("P003 Documentation Assessment")
+
+    st.error(
+        "**Documentation Inadequate for SR&ED Claim**\n\n"
+        "Project P003 documentation consists entirely of standard software engineering artifacts:\n\n"
+        "- **Confluence page:** Standard project plan (not an SR&ED PIR). No hypotheses, no uncertainty analysis.\n"
+        "- **Jira tickets:** 47 standard development stories. No experimental design or hypothesis tracking.\n"
+        "- **Timesheets:** Standard time entries (not SR&ED-specific allocation).\n\n"
+        "**Assessment:** No SR&ED-type records exist for this project. There are no records of hypotheses "
+        "formulated, experiments conducted, or technological uncertainties investigated. This is consistent "
+        "with the project's ineligibility — it was standard development work documented as such."
+    )
@@ -11,15 +11,12 @@ if ROOT_DIR not in sys.path:
 from branding import BRAND, PALETTE
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from utils.scoring import (
-    calculate_overall_score,
-    get_all_issues,
-    calculate_corrected_expenditures,
-    calculate_uncorrected_expenditures,
-)
-from utils.formatters import fmt_currency
-from utils.constants import ITC_CCPC_ENHANCED_RATE
-from utils.data_loader import ensure_data_loaded
+from utils.formatters import fmt_currency, fmt_percentage
+from utils.constants import MONTE_CARLO_TRIALS
+from utils.simulation import build_exposures, simulate_refund
+from utils.narrative import analyze_projects, narrative_score
+from utils.evidence import detect_documentation_gaps
+from utils.data_loader import ensure_data_loaded, current_analysis
 
 ensure_data_loaded()
 
@@ -29,7 +26,10 @@ documentation = st.session_state.documentation
 form_data = st.session_state.t661_form
 client = st.session_state.client_profile
 
-overall_score, subscores = calculate_overall_score(projects, expenditures, documentation, form_data)
+analysis = current_analysis()
+
+overall_score = analysis["overall_score"]
+subscores = analysis["subscores"]
 
 st.header("Risk Assessment & Remediation Plan")
 
@@ -40,14 +40,13 @@ st.subheader("Risk Score Breakdown")
 
 # Calculate additional scores
 # Narrative score
-narrative_scores = []
-for p in projects:
-    if p["eligibility_strength"] != "INELIGIBLE":
-        wc_242 = p["line_242_word_count"] / 350 * 100
-        wc_244 = p["line_244_word_count"] / 700 * 100
-        wc_246 = p["line_246_word_count"] / 350 * 100
-        narrative_scores.append(min(100, (wc_242 + wc_244 + wc_246) / 3))
-narrative_score = round(sum(narrative_scores) / len(narrative_scores)) if narrative_scores else 0
+narrative_analysis = analyze_projects(projects)
+narrative_scores = [
+    narrative_score(narrative_analysis[p["project_id"]])
+    for p in projects
+    if p["eligibility_strength"] != "INELIGIBLE"
+]
+narrative_pct = round(sum(narrative_scores) / len(narrative_scores)) if narrative_scores else 0
 
 # Preparer risk score
 preparer_score = 60 if client["preparer"]["billing_arrangement"] == 1 else 100
@@ -64,7 +63,7 @@ values = [
     subscores["eligibility"],
     subscores["expenditure"],
     subscores["documentation"],
-    narrative_score,
+    narrative_pct,
     preparer_score,
     round(filing_score),
 ]
@@ -104,7 +103,12 @@ st.subheader("CRA Audit Risk Factors")
 risk_factors = [
     ("⚠️", "Contingency fee preparer (elevated audit rate per CRA 2022 warnings)", "MEDIUM"),
     ("⚠️", "Ineligible project included (P003 — routine development claimed as SR&ED)", "HIGH"),
-    ("⚠️", "Documentation gap on otherwise-eligible project (P002 — 80 days)", "HIGH"),
+]
+for gap in detect_documentation_gaps(documentation, projects):
+    risk_factors.append(
+        ("⚠️", f"Documentation gap on otherwise-eligible project ({gap['project']} — {gap['days']} days)", "HIGH")
+    )
+risk_factors += [
     ("⚠️", "Ineligible expenditures (office supplies $1,200, non-SR&ED contract $45,000)", "MEDIUM"),
     ("✅", "Not first-time claimant (lower risk profile)", "LOW"),
     ("✅", f"Filing well within 18-month deadline ({days_remaining} days remaining)", "LOW"),
@@ -168,11 +172,11 @@ st.divider()
 # --- Before/After Comparison ---
 st.subheader("Before/After Comparison Summary")
 
-uncorrected = calculate_uncorrected_expenditures(expenditures)
-corrected = calculate_corrected_expenditures(expenditures)
+uncorrected = analysis["expenditures"]["filed"]
+corrected = analysis["expenditures"]["corrected"]
 
-itc_before = round(uncorrected["total"] * ITC_CCPC_ENHANCED_RATE)
-itc_after = round(corrected["total"] * ITC_CCPC_ENHANCED_RATE)
+itc_before = analysis["itc"]["filed_federal"]
+itc_after = analysis["itc"]["federal"]["total"]
 
 col1, col2, col3 = st.columns(3)
 
@@ -199,6 +203,95 @@ with col3:
 
 st.divider()
 
+# --- Expected Refund Under CRA Review ---
+st.subheader("Expected Refund Under CRA Review (Monte Carlo)")
+st.markdown(
+    "Each issue is assigned a probability of being upheld on CRA review and the qualified "
+    "expenditure it puts at risk. The simulation samples review outcomes for the claim as filed "
+    "and reports the resulting federal ITC refund distribution."
+)
+
+sim_col1, sim_col2 = st.columns(2)
+with sim_col1:
+    trials = st.select_slider(
+        "Simulated reviews",
+        options=[10000, 50000, 100000, 200000, 500000],
+        value=MONTE_CARLO_TRIALS,
+    )
+with sim_col2:
+    seed = st.number_input("Random seed", min_value=0, value=2024, step=1)
+
+
+# Exposures and the filed total derive from the claim, so its data version keys the results.
+@st.cache_data(max_entries=16)
+def get_exposures(data_version, _projects, _expenditures, _documentation, _form_data, _client):
+    return build_exposures(_projects, _expenditures, _documentation, _form_data, _client)
+
+
+@st.cache_data(max_entries=16)
+def get_simulation(data_version, trials, seed, _exposures, _filed_total):
+    return simulate_refund(_exposures, _filed_total, trials=trials, seed=seed)
+
+
+exposures = get_exposures(st.session_state.data_version, projects, expenditures, documentation, form_data, client)
+simulation = get_simulation(st.session_state.data_version, trials, int(seed), exposures, uncorrected["total"])
+
+mc1, mc2, mc3, mc4 = st.columns(4)
+mc1.metric("Federal ITC as Filed", fmt_currency(simulation["filed_itc"]))
+mc2.metric(
+    "Expected Refund",
+    fmt_currency(simulation["expected"]),
+    delta=fmt_currency(simulation["expected"] - simulation["filed_itc"]),
+)
+mc3.metric("Corrected Claim ITC", fmt_currency(itc_after))
+mc4.metric("Chance of Full Refund", fmt_percentage(simulation["probability_full_refund"]))
+
+hist = simulation["histogram"]
+bin_centers = [(lo + hi) / 2 for lo, hi in zip(hist["edges"][:-1], hist["edges"][1:])]
+fig_mc = go.Figure(go.Bar(
+    x=bin_centers,
+    y=[c / simulation["trials"] for c in hist["counts"]],
+    marker_color=PALETTE.primary_blue,
+    hovertemplate="Refund: $%{x:,.0f}<br>Probability: %{y:.1%}<extra></extra>",
+))
+fig_mc.add_vline(x=simulation["expected"], line=dict(color=PALETTE.deep_blue, width=2, dash="dash"),
+                 annotation_text="Expected", annotation_position="top")
+fig_mc.add_vline(x=itc_after, line=dict(color=PALETTE.status_success, width=2),
+                 annotation_text="Corrected", annotation_position="top left")
+fig_mc.update_layout(
+    height=320,
+    xaxis=dict(title="Federal ITC refund (as filed)", tickprefix="$", tickformat=",.0f"),
+    yaxis=dict(title="Probability", tickformat=".0%"),
+    bargap=0.05,
+    margin=dict(t=40, b=40, l=60, r=30),
+)
+st.plotly_chart(fig_mc, use_container_width=True)
+
+pct_df = pd.DataFrame({
+    "Percentile": [f"P{p}" for p in simulation["percentiles"]],
+    "Refund": [fmt_currency(v) for v in simulation["percentiles"].values()],
+})
+st.dataframe(pct_df, use_container_width=True, hide_index=True)
+
+with st.expander("Issue exposure assumptions"):
+    exposure_df = pd.DataFrame([
+        {
+            "Severity": e["severity"],
+            "Category": e["category"],
+            "Issue": e["issue"],
+            "P(Upheld)": fmt_percentage(e["probability"]),
+            "Amount at Risk": fmt_currency(e["amount_at_risk"]),
+        }
+        for e in exposures
+    ])
+    st.dataframe(exposure_df, use_container_width=True, hide_index=True)
+    st.caption(
+        "Issues that put the same expenditures at risk are disallowed at most once per simulated review. "
+        "Amounts on a project that fails every eligibility question are counted only under that project."
+    )
+
+st.divider()
+
 # --- Downloadable Report ---
 st.subheader("Download Report")
 
@@ -220,7 +313,7 @@ SCORE BREAKDOWN:
 ISSUES IDENTIFIED:
 """
 
-issues = get_all_issues(projects, expenditures, documentation, form_data, client)
+issues = analysis["issues"]
 for i, issue in enumerate(issues, 1):
     report_text += f"\n{i}. [{issue['severity']}] {issue['issue']}"
     report_text += f"\n   Remediation: {issue['remediation']}\n"
@@ -238,6 +331,7 @@ Total:              {fmt_currency(uncorrected['total']):>15} {fmt_currency(corre
 ESTIMATED ITC:
 Federal (35%):      {fmt_currency(itc_before):>15} {fmt_currency(itc_after):>15}
 Audit Risk:         {'HIGH':>15} {'LOW':>15}
+Expected (review):  {fmt_currency(simulation['expected']):>15}
 
 REMEDIATION PLAN:
 """
@@ -6,9 +6,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from utils.formatters import fmt_currency
 from utils.constants import (
-    ITC_CCPC_ENHANCED_RATE,
     ITC_CCPC_ENHANCED_LIMIT,
-    ITC_CCPC_BASE_RATE,
     TAXABLE_CAPITAL_PHASEOUT_LOW,
     TAXABLE_CAPITAL_PHASEOUT_HIGH,
     TAXABLE_INCOME_PHASEOUT_LOW,
@@ -16,16 +14,16 @@ from utils.constants import (
     ARMS_LENGTH_CONTRACT_ITC_RATE,
     PROVINCIAL_CREDITS,
 )
-from utils.scoring import calculate_corrected_expenditures, calculate_uncorrected_expenditures
-from utils.data_loader import ensure_data_loaded
+from utils.itc import federal_itc_breakdown, provincial_credits
+from utils.data_loader import ensure_data_loaded, current_analysis
 
 ensure_data_loaded()
 
 client = st.session_state.client_profile
-expenditures = st.session_state.expenditures
+analysis = current_analysis()
 
-corrected = calculate_corrected_expenditures(expenditures)
-uncorrected = calculate_uncorrected_expenditures(expenditures)
+corrected = analysis["expenditures"]["corrected"]
+uncorrected = analysis["expenditures"]["filed"]
 
 st.header("Investment Tax Credit (ITC) Calculator")
 
@@ -78,9 +76,10 @@ st.divider()
 st.subheader("Federal ITC Calculation")
 
 qualified = corrected["total"]
+federal = federal_itc_breakdown(qualified)
+federal_itc = federal["total"]
 
 if qualified <= ITC_CCPC_ENHANCED_LIMIT:
-    federal_itc = round(qualified * ITC_CCPC_ENHANCED_RATE)
     st.markdown(f"""
 ```
 Corrected Qualified Expenditures:    {fmt_currency(qualified)}
@@ -92,14 +91,11 @@ Federal ITC:  {fmt_currency(federal_itc)} (fully refundable)
 ```
 """)
 else:
-    enhanced_portion = round(ITC_CCPC_ENHANCED_LIMIT * ITC_CCPC_ENHANCED_RATE)
-    base_portion = round((qualified - ITC_CCPC_ENHANCED_LIMIT) * ITC_CCPC_BASE_RATE)
-    federal_itc = enhanced_portion + base_portion
     st.markdown(f"""
 ```
 Corrected Qualified Expenditures:    {fmt_currency(qualified)}
-Enhanced rate (35% on first $6M):    {fmt_currency(ITC_CCPC_ENHANCED_LIMIT)} x 35% = {fmt_currency(enhanced_portion)}
-Base rate (15% on remainder):        {fmt_currency(qualified - ITC_CCPC_ENHANCED_LIMIT)} x 15% = {fmt_currency(base_portion)}
+Enhanced rate (35% on first $6M):    {fmt_currency(federal['enhanced_base'])} x 35% = {fmt_currency(federal['enhanced'])}
+Base rate (15% on remainder):        {fmt_currency(federal['base_base'])} x 15% = {fmt_currency(federal['base'])}
 
 Federal ITC:  {fmt_currency(federal_itc)}
 ```
@@ -117,99 +113,44 @@ selected_province = st.selectbox(
     index=list(PROVINCIAL_CREDITS.keys()).index(client["province"]),
 )
 
-prov_credits = PROVINCIAL_CREDITS.get(selected_province, {})
+provincial = provincial_credits(qualified, selected_province)
 
-if "note" in prov_credits:
-    st.info(f"**{selected_province}:** {prov_credits['note']}")
-    provincial_total = 0
-    provincial_refundable = 0
-    prov_rows = []
-else:
-    prov_rows = []
-    provincial_total = 0
-    provincial_refundable = 0
-
-    for credit_code, credit_info in prov_credits.items():
-        if credit_code == "note":
-            continue
+if provincial["note"]:
+    st.info(f"**{selected_province}:** {provincial['note']}")
 
-        name = credit_info["name"]
+for credit in provincial["credits"]:
+    name = credit["name"]
+    credit_code = credit["code"]
+    amount = credit["amount"]
 
-        # Calculate based on credit structure
-        if "rate" in credit_info:
-            rate = credit_info["rate"]
-            limit = credit_info.get("limit")
-            base = min(qualified, limit) if limit else qualified
-            amount = round(base * rate)
-            refundable = credit_info.get("refundable", False)
-
-            st.markdown(f"""
+    if credit["structure"] == "flat":
+        rate = credit["rate"]
+        limit = credit["limit"]
+        st.markdown(f"""
 **{name} ({credit_code}):**
 ```
-Rate: {rate:.1%} {'refundable' if refundable else 'non-refundable'}{f' on first {fmt_currency(limit)}' if limit else ''} qualified expenditures
-{fmt_currency(base)} x {rate:.1%} = {fmt_currency(amount)}
+Rate: {rate:.1%} {'refundable' if credit['refundable'] else 'non-refundable'}{f' on first {fmt_currency(limit)}' if limit else ''} qualified expenditures
+{fmt_currency(credit['base'])} x {rate:.1%} = {fmt_currency(amount)}
 ```
 """)
-            prov_rows.append({
-                "Credit": f"{name} ({credit_code})",
-                "Amount": amount,
-                "Refundable": "Yes" if refundable else "No",
-            })
-            provincial_total += amount
-            if refundable:
-                provincial_refundable += amount
-
-        elif "rate_first_1m" in credit_info:
-            # Quebec-style tiered
-            first_1m = min(qualified, 1000000)
-            above = max(0, qualified - 1000000)
-            amount_1 = round(first_1m * credit_info["rate_first_1m"])
-            amount_2 = round(above * credit_info["rate_above"])
-            amount = amount_1 + amount_2
-            refundable = credit_info.get("refundable", False)
-
-            st.markdown(f"""
+    elif credit["structure"] == "tiered":
+        st.markdown(f"""
 **{name} ({credit_code}):**
 ```
-First $1M: {fmt_currency(first_1m)} x {credit_info['rate_first_1m']:.0%} = {fmt_currency(amount_1)}
-Above $1M: {fmt_currency(above)} x {credit_info['rate_above']:.0%} = {fmt_currency(amount_2)}
+First $1M: {fmt_currency(credit['first_1m'])} x {credit['rate_first_1m']:.0%} = {fmt_currency(credit['amount_1'])}
+Above $1M: {fmt_currency(credit['above'])} x {credit['rate_above']:.0%} = {fmt_currency(credit['amount_2'])}
 Total: {fmt_currency(amount)}
 ```
 """)
-            prov_rows.append({
-                "Credit": f"{name} ({credit_code})",
-                "Amount": amount,
-                "Refundable": "Yes" if refundable else "No",
-            })
-            provincial_total += amount
-            if refundable:
-                provincial_refundable += amount
-
-        elif "rate_base" in credit_info:
-            # Alberta-style base + incremental
-            base_amount = round(qualified * credit_info["rate_base"])
-            inc_limit = credit_info.get("incremental_limit", 0)
-            inc_base = min(qualified, inc_limit)
-            inc_amount = round(inc_base * credit_info.get("rate_incremental", 0))
-            amount = base_amount + inc_amount
-            refundable = credit_info.get("refundable", False)
-
-            st.markdown(f"""
+    else:
+        st.markdown(f"""
 **{name} ({credit_code}):**
 ```
-Base: {fmt_currency(qualified)} x {credit_info['rate_base']:.0%} = {fmt_currency(base_amount)}
-Incremental: {fmt_currency(inc_base)} x {credit_info['rate_incremental']:.0%} = {fmt_currency(inc_amount)}
+Base: {fmt_currency(qualified)} x {credit['rate_base']:.0%} = {fmt_currency(credit['base_amount'])}
+Incremental: {fmt_currency(credit['inc_base'])} x {credit['rate_incremental']:.0%} = {fmt_currency(credit['inc_amount'])}
 Total: {fmt_currency(amount)}
 ```
 """)
-            prov_rows.append({
-                "Credit": f"{name} ({credit_code})",
-                "Amount": amount,
-                "Refundable": "Yes" if refundable else "No",
-            })
-            provincial_total += amount
-            if refundable:
-                provincial_refundable += amount
 
 st.divider()
 
@@ -219,15 +160,15 @@ st.subheader("Total Credits Summary")
 summary_rows = [
     {"Credit": f"Federal ITC (35%)", "Amount": fmt_currency(federal_itc), "Refundable": "Yes"},
 ]
-for row in prov_rows:
+for credit in provincial["credits"]:
     summary_rows.append({
-        "Credit": row["Credit"],
-        "Amount": fmt_currency(row["Amount"]),
-        "Refundable": row["Refundable"],
+        "Credit": f"{credit['name']} ({credit['code']})",
+        "Amount": fmt_currency(credit["amount"]),
+        "Refundable": "Yes" if credit["refundable"] else "No",
     })
 
-total_credits = federal_itc + provincial_total
-total_refundable = federal_itc + provincial_refundable
+total_credits = federal_itc + provincial["total"]
+total_refundable = federal_itc + provincial["refundable"]
 
 summary_rows.append({
     "Credit": "**TOTAL**",
@@ -250,7 +191,7 @@ st.divider()
 # --- Comparison with Uncorrected ---
 st.subheader("Corrected vs Uncorrected Claim Comparison")
 
-uncorrected_itc = round(uncorrected["total"] * ITC_CCPC_ENHANCED_RATE)
+uncorrected_itc = analysis["itc"]["filed_federal"]
 
 col_unc, col_cor = st.columns(2)
 
@@ -0,0 +1,133 @@
+import streamlit as st
+import pandas as pd
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from utils.formatters import fmt_currency
+from utils.data_loader import claim_version, ensure_data_loaded, load_claim, open_claim
+from utils.portfolio import PORTFOLIO_DIR, discover_claims, score_portfolio
+from utils.analysis import analyze_claim
+
+ensure_data_loaded()
+
+
+def _claims_signature(claim_dirs):
+    """Data versions of every claim, so edits invalidate the cached scores."""
+    return tuple(claim_version(claim_dir) for claim_dir in claim_dirs)
+
+
+@st.cache_data(show_spinner="Scoring portfolio...")
+def get_portfolio_rows(claim_dirs, signature):
+    return score_portfolio(claim_dirs)
+
+
+@st.cache_data
+def get_claim_detail(claim_dir, signature):
+    return analyze_claim(load_claim(claim_dir))
+
+
+st.header("Claim Portfolio")
+st.markdown(
+    f"All SR&ED claims discovered under `{PORTFOLIO_DIR}`, scored in parallel. "
+    "Select a claim to load its details, or open it in the other scanner pages."
+)
+
+claim_dirs = tuple(discover_claims())
+signature = _claims_signature(claim_dirs)
+rows = get_portfolio_rows(claim_dirs, signature)
+
+scored = [r for r in rows if not r["error"]]
+failed = [r for r in rows if r["error"]]
+
+p1, p2, p3, p4 = st.columns(4)
+p1.metric("Claims", len(rows))
+p2.metric("Average Readiness", f"{round(sum(r['overall_score'] for r in scored) / len(scored)) if scored else 0}/100")
+p3.metric("High-Severity Issues", sum(r["high_issues"] for r in scored))
+p4.metric("Corrected Federal ITC", fmt_currency(sum(r["corrected_itc"] for r in scored)))
+
+if failed:
+    with st.expander(f"⚠️ {len(failed)} claim(s) could not be scored"):
+        for r in failed:
+            st.error(f"`{r['claim_dir']}` — {r['error']}")
+
+st.divider()
+
+if not scored:
+    st.info("No claims to display.")
+    st.stop()
+
+sort_options = {
+    "Readiness score (lowest first)": ("overall_score", True),
+    "High-severity issues (most first)": ("high_issues", False),
+    "Filed federal ITC (largest first)": ("filed_itc", False),
+    "ITC at risk (largest first)": ("itc_at_risk", False),
+    "Company name": ("company_name", True),
+}
+sort_label = st.selectbox("Sort portfolio by", list(sort_options.keys()))
+sort_col, ascending = sort_options[sort_label]
+
+df = pd.DataFrame(scored)
+df["itc_at_risk"] = df["filed_itc"] - df["corrected_itc"]
+df = df.sort_values(sort_col, ascending=ascending, kind="stable").reset_index(drop=True)
+
+st.dataframe(
+    df[[
+        "company_name", "fiscal_year_end", "province", "projects", "overall_score",
+        "high_issues", "medium_issues", "filed_itc", "corrected_itc", "itc_at_risk",
+    ]],
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "company_name": "Company",
+        "fiscal_year_end": "Fiscal Year End",
+        "province": "Province",
+        "projects": "Projects",
+        "overall_score": st.column_config.ProgressColumn("Readiness", min_value=0, max_value=100, format="%d"),
+        "high_issues": "HIGH",
+        "medium_issues": "MEDIUM",
+        "filed_itc": st.column_config.NumberColumn("Filed ITC", format="$%d"),
+        "corrected_itc": st.column_config.NumberColumn("Corrected ITC", format="$%d"),
+        "itc_at_risk": st.column_config.NumberColumn("ITC at Risk", format="$%d"),
+    },
+)
+
+st.divider()
+
+# --- Claim detail (loaded only when selected) ---
+st.subheader("Claim Detail")
+
+selected = st.selectbox(
+    "Select claim",
+    range(len(df)),
+    format_func=lambda i: f"{df.at[i, 'company_name']} ({df.at[i, 'fiscal_year_end'][:4]}) — {df.at[i, 'overall_score']}/100",
+)
+row = df.iloc[selected]
+claim_dir = row["claim_dir"]
+detail = get_claim_detail(claim_dir, _claims_signature((claim_dir,)))
+
+d1, d2, d3, d4 = st.columns(4)
+d1.metric("Eligibility", f"{row['eligibility_score']}/100")
+d2.metric("Expenditure Accuracy", f"{row['expenditure_score']}/100")
+d3.metric("Documentation", f"{row['documentation_score']}/100")
+d4.metric("Form Completeness", f"{row['form_score']}/100")
+
+issues = detail["issues"]
+if issues:
+    st.dataframe(
+        pd.DataFrame([
+            {"Severity": i["severity"], "Category": i["category"], "Issue": i["issue"], "Project": i["project"]}
+            for i in issues
+        ]),
+        use_container_width=True,
+        hide_index=True,
+    )
+else:
+    st.success("No issues found!")
+
+is_open = os.path.abspath(st.session_state.get("claim_dir", "")) == claim_dir
+if st.button("Open this claim in the scanner", disabled=is_open, use_container_width=True):
+    open_claim(claim_dir)
+    st.rerun()
+if is_open:
+    st.caption("This claim is currently loaded in the scanner pages.")
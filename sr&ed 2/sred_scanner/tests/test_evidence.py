@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.evidence import detect_documentation_gaps
+
+
+def _project(pid, start, end):
+    return {"project_id": pid, "start_date": start, "end_date": end}
+
+
+def _lab_note(pid, day):
+    return {"project": pid, "type": "lab_notebook", "date": day}
+
+
+def test_late_dated_evidence_does_not_stretch_a_gap_past_the_period():
+    documentation = {"evidence_items": [
+        _lab_note("P001", "2024-01-05"),
+        _lab_note("P001", "2025-06-01"),  # filed after the project ended
+    ]}
+
+    gaps = detect_documentation_gaps(documentation, [_project("P001", "2024-01-01", "2024-12-31")])
+
+    assert [(g["start"], g["end"]) for g in gaps] == [("2024-01-06", "2024-12-31")]
+
+
+def test_evidence_straddling_the_period_end_covers_only_up_to_it():
+    documentation = {"evidence_items": [
+        {"project": "P001", "type": "lab_notebook", "date_range": "2024-01-01 to 2024-06-30"},
+        {"project": "P001", "type": "lab_notebook", "date_range": "2024-11-01 to 2025-03-31"},
+    ]}
+
+    gaps = detect_documentation_gaps(documentation, [_project("P001", "2024-01-01", "2024-12-31")])
+
+    assert [(g["start"], g["end"], g["days"]) for g in gaps] == [("2024-07-01", "2024-10-31", 123)]
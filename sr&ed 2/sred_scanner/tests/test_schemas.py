@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.data_loader import DATA_DIR, load_claim
+from utils.schemas import ClaimValidationError, decode_claim_file
+
+
+def _without(filename, *path):
+    with open(os.path.join(DATA_DIR, filename)) as f:
+        data = json.load(f)
+    parent = data
+    for key in path[:-1]:
+        parent = parent[key]
+    del parent[path[-1]]
+    return json.dumps(data)
+
+
+def test_bundled_claim_loads_as_plain_dicts():
+    claim = load_claim()
+    assert isinstance(claim["expenditures"], dict)
+    assert isinstance(claim["client_profile"]["fiscal_year_end"], str)
+
+
+@pytest.mark.parametrize("filename, path", [
+    ("expenditures.json", ("materials", "line_360_total")),
+    ("expenditures.json", ("salaries", "total_sred_salaries")),
+    ("expenditures.json", ("overhead",)),
+    ("client_profile.json", ("preparer",)),
+    ("client_profile.json", ("preparer", "billing_arrangement")),
+])
+def test_keys_the_pages_index_are_required(filename, path):
+    with pytest.raises(ClaimValidationError, match=path[-1]):
+        decode_claim_file(filename, _without(filename, *path))
@@ -0,0 +1,120 @@
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.data_loader import load_claim
+from utils.scoring import (
+    calculate_corrected_expenditures,
+    calculate_documentation_score,
+    calculate_overall_score,
+    ineligible_project_ids,
+)
+
+
+def _project(pid, strength="STRONG"):
+    return {"project_id": pid, "eligibility_strength": strength}
+
+
+def _expenditures():
+    return {
+        "salaries": {
+            "breakdown": [
+                {"project_allocation": {"P010": 100000, "P020": 50000}},
+                {"project_allocation": {"P020": 20000, "P030": 30000}},
+            ],
+        },
+        "materials": {
+            "items": [
+                {"project": "P010", "amount": 4000, "eligible": True},
+                {"project": "P020", "amount": 6000, "eligible": True},
+                {"project": "P030", "amount": 1000, "eligible": False},
+            ],
+        },
+        "contracts": {
+            "items": [
+                {"project": "P020", "amount": 25000, "eligible": True},
+                {"project": "P030", "amount": 9000, "eligible": True},
+            ],
+        },
+    }
+
+
+@pytest.fixture(scope="module")
+def claim():
+    return load_claim()
+
+
+def test_bundled_claim_scores_unchanged(claim):
+    args = (claim["projects"], claim["expenditures"], claim["documentation"], claim["t661_form"])
+    overall, _ = calculate_overall_score(*args)
+    corrected = calculate_corrected_expenditures(claim["expenditures"], claim["projects"])
+    assert overall == 58
+    assert corrected["total"] == 546406
+
+
+def test_ineligible_project_other_than_p003_is_removed():
+    projects = [_project("P010"), _project("P020", "INELIGIBLE"), _project("P030")]
+    corrected = calculate_corrected_expenditures(_expenditures(), projects)
+    assert corrected["salaries"] == 100000 + 30000
+    assert corrected["materials"] == 4000  # P030's item is ineligible in its own right
+    assert corrected["contracts"] == 9000
+    assert corrected["ppa"] == round(130000 * 0.55)
+    assert corrected["total"] == 130000 + 4000 + 9000 + round(130000 * 0.55)
+
+
+def test_several_ineligible_projects_are_removed():
+    projects = [_project("P010", "INELIGIBLE"), _project("P020"), _project("P030", "INELIGIBLE")]
+    assert ineligible_project_ids(projects) == {"P010", "P030"}
+    corrected = calculate_corrected_expenditures(_expenditures(), projects)
+    assert corrected["salaries"] == 70000
+    assert corrected["materials"] == 6000
+    assert corrected["contracts"] == 25000
+
+
+def test_nothing_removed_when_every_project_is_eligible():
+    projects = [_project("P010"), _project("P020"), _project("P030")]
+    corrected = calculate_corrected_expenditures(_expenditures(), projects)
+    assert corrected["salaries"] == 200000
+    assert corrected["contracts"] == 34000
+
+
+def test_bundled_claim_with_a_different_ineligible_project(claim):
+    projects = copy.deepcopy(claim["projects"])
+    for p in projects:
+        p["eligibility_strength"] = "INELIGIBLE" if p["project_id"] == "P001" else "STRONG"
+    expenditures = claim["expenditures"]
+    corrected = calculate_corrected_expenditures(expenditures, projects)
+    p001_salaries = sum(s["project_allocation"].get("P001", 0) for s in expenditures["salaries"]["breakdown"])
+    all_salaries = sum(sum(s["project_allocation"].values()) for s in expenditures["salaries"]["breakdown"])
+    assert corrected["salaries"] == all_salaries - p001_salaries
+    assert corrected["materials"] == sum(
+        m["amount"] for m in expenditures["materials"]["items"] if m["eligible"] and m["project"] != "P001"
+    )
+    assert corrected["contracts"] == sum(
+        c["amount"] for c in expenditures["contracts"]["items"] if c["eligible"] and c["project"] != "P001"
+    )
+
+
+def test_documentation_weights_follow_eligibility():
+    documentation = {
+        "t661_evidence_checklist": {
+            "line_a": {"P010": True, "P020": False, "P030": True},
+            "line_b": {"P010": True, "P020": False, "P030": "partial"},
+        },
+    }
+    # P010 100%, P020 0%, P030 75%
+    projects = [_project("P010"), _project("P020", "INELIGIBLE"), _project("P030")]
+    assert calculate_documentation_score(documentation, projects) == round(0.45 * 100 + 0.10 * 0 + 0.45 * 75)
+    projects = [_project("P010", "INELIGIBLE"), _project("P020"), _project("P030")]
+    assert calculate_documentation_score(documentation, projects) == round(0.10 * 100 + 0.45 * 0 + 0.45 * 75)
+
+
+def test_projects_are_required():
+    with pytest.raises(TypeError):
+        calculate_corrected_expenditures(_expenditures())
+    with pytest.raises(TypeError):
+        calculate_documentation_score({"t661_evidence_checklist": {}})
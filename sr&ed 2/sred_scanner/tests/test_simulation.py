@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.constants import PROXY_RATE
+from utils.data_loader import load_claim
+from utils.simulation import FIVE_QUESTION_KEYS, TRIAL_CHUNK, _pool_exposures, build_exposures, simulate_refund
+
+
+def _exposures(claim):
+    return build_exposures(
+        claim["projects"], claim["expenditures"], claim["documentation"], claim["t661_form"], claim["client_profile"]
+    )
+
+
+def test_chunked_draws_match_one_full_matrix():
+    exposures = _exposures(load_claim())
+    trials = 2 * TRIAL_CHUNK + 7
+    result = simulate_refund(exposures, 1_000_000, trials=trials, seed=11)
+
+    probabilities, amounts = _pool_exposures(exposures)
+    draws = np.random.default_rng(11).random((trials, len(amounts)), dtype=np.float32)
+    disallowed = (draws < probabilities.astype(np.float32)) @ amounts
+    assert result["probability_full_refund"] == float(np.mean(disallowed == 0))
+    assert result["trials"] == trials
+
+
+def test_eligibility_exposure_includes_the_ppa_share():
+    claim = load_claim()
+    exposures = _exposures(claim)
+    expenditures = claim["expenditures"]
+    exposure = next(e for e in exposures if e["category"] == "Eligibility")
+    pid = exposure["project"]
+    salaries = sum(s["project_allocation"].get(pid, 0) for s in expenditures["salaries"]["breakdown"])
+    other = sum(
+        i["amount"] for i in expenditures["materials"]["items"] + expenditures["contracts"]["items"] if i["project"] == pid
+    )
+    fqt = next(p for p in claim["projects"] if p["project_id"] == pid)["five_question_test"]
+    failed = sum(1 for k in FIVE_QUESTION_KEYS if not fqt.get(k))
+    expected = (salaries * (1 + PROXY_RATE) + other) * failed / len(FIVE_QUESTION_KEYS)
+    assert abs(exposure["amount_at_risk"] - expected) <= 1
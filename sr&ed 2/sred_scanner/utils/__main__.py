@@ -0,0 +1,70 @@
+"""Headless SR&ED claim analysis: load claim directories and emit their analysis as JSON.
+
+Run from the app directory (``sr&ed 2/sred_scanner``)::
+
+    python -m utils                                  # the bundled claim
+    python -m utils claims/acme claims/globex        # a JSON list, one analysis per claim
+    python -m utils --portfolio claims --summary     # one compact row per discovered claim
+    python -m utils claims/acme --out acme.json --fail-under 70
+
+Nothing here imports Streamlit, pandas or plotly.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from utils.analysis import analyze_claim
+from utils.data_loader import DATA_DIR, load_claim
+from utils.portfolio import discover_claims, score_portfolio
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m utils", description=__doc__.splitlines()[0])
+    parser.add_argument("claims", nargs="*", help="claim directories (default: the bundled claim)")
+    parser.add_argument("--portfolio", metavar="ROOT", help="analyze every claim directory under ROOT")
+    parser.add_argument("--summary", action="store_true", help="compact score rows instead of full analyses")
+    parser.add_argument("--workers", type=int, help="worker processes for --summary (default: one per core)")
+    parser.add_argument("--out", help="write the JSON here instead of stdout")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indent (0 for one line)")
+    parser.add_argument("--fail-under", type=int, help="exit 1 if any claim's overall score is below this")
+    args = parser.parse_args(argv)
+
+    claim_dirs = [os.path.abspath(d) for d in args.claims]
+    if args.portfolio:
+        claim_dirs += discover_claims(args.portfolio)
+    claim_dirs = claim_dirs or [os.path.abspath(DATA_DIR)]
+
+    if args.summary:
+        results = score_portfolio(claim_dirs, max_workers=args.workers)
+        failed = [r for r in results if r["error"]]
+        scores = [r["overall_score"] for r in results if not r["error"]]
+    else:
+        results, failed = [], []
+        for claim_dir in claim_dirs:
+            try:
+                results.append({"claim_dir": claim_dir, **analyze_claim(load_claim(claim_dir))})
+            except Exception as exc:  # report the broken claim and carry on with the rest
+                error = {"claim_dir": claim_dir, "error": f"{type(exc).__name__}: {exc}"}
+                results.append(error)
+                failed.append(error)
+        scores = [r["overall_score"] for r in results if "error" not in r]
+
+    # One claim named (or the default) prints its object; several, or a portfolio, print a list
+    payload = results[0] if len(claim_dirs) == 1 and not args.portfolio else results
+    text = json.dumps(payload, indent=args.indent or None)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+    for r in failed:
+        print(f"{r['claim_dir']}: {r['error']}", file=sys.stderr)
+    below = args.fail_under is not None and any(score < args.fail_under for score in scores)
+    return 1 if failed or below else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""Whole-claim analysis: scores, issues, expenditures and credits, as plain data.
+
+This is the API the pages, the portfolio and the ``python -m utils`` CLI share.
+It takes a claim as returned by ``utils.data_loader.load_claim`` and never
+touches Streamlit, so it runs the same in a page, a batch worker or a test.
+"""
+
+from utils.itc import federal_itc_breakdown, provincial_credits
+from utils.scoring import (
+    calculate_overall_score,
+    get_all_issues,
+    calculate_corrected_expenditures,
+    calculate_uncorrected_expenditures,
+    calculate_federal_itc,
+    ineligible_project_ids,
+)
+
+SEVERITIES = ("HIGH", "MEDIUM", "LOW")
+
+
+def analyze_claim(claim):
+    """Score one claim and compute its as-filed and corrected expenditures and credits."""
+    client = claim["client_profile"]
+    projects = claim["projects"]
+    expenditures = claim["expenditures"]
+    args = (projects, expenditures, claim["documentation"], claim["t661_form"])
+
+    overall, subscores = calculate_overall_score(*args)
+    issues = get_all_issues(*args, client)
+    filed = calculate_uncorrected_expenditures(expenditures)
+    corrected = calculate_corrected_expenditures(expenditures, projects)
+    federal = federal_itc_breakdown(corrected["total"])
+    provincial = provincial_credits(corrected["total"], client["province"])
+
+    return {
+        "client": {
+            "company_name": client["company_name"],
+            "business_number": client["business_number"],
+            "fiscal_year_end": client["fiscal_year_end"],
+            "province": client["province"],
+            "corporation_type": client["corporation_type"],
+        },
+        "projects": len(projects),
+        "ineligible_projects": sorted(ineligible_project_ids(projects)),
+        "overall_score": overall,
+        "subscores": subscores,
+        "issue_counts": {s: sum(1 for i in issues if i["severity"] == s) for s in SEVERITIES},
+        "issues": issues,
+        "expenditures": {"filed": filed, "corrected": corrected},
+        "itc": {
+            "filed_federal": calculate_federal_itc(filed["total"]),
+            "federal": federal,
+            "provincial": provincial,
+            "total": federal["total"] + provincial["total"],
+            "refundable": federal["total"] + provincial["refundable"],
+        },
+    }
@@ -32,6 +32,19 @@ LINE_246_WORD_LIMIT = 350
 # Filing deadline
 FILING_DEADLINE_MONTHS = 18  # 18 months from fiscal year end, absolute
 
+# Documentation score: share of the weight given to ineligible projects (the rest is split
+# evenly across eligible projects)
+INELIGIBLE_DOCUMENTATION_WEIGHT = 0.10
+
+# Contemporaneous documentation gaps (CRA Guidelines on Eligibility, Section 6)
+DOCUMENTATION_GAP_THRESHOLD_DAYS = 30  # Uncovered windows shorter than this are not reported
+DOCUMENTATION_GAP_HIGH_DAYS = 60  # Gaps at least this long are HIGH severity
+
+# CRA review outcome model (Monte Carlo refund simulation)
+REVIEW_DISALLOWANCE_PROBABILITY = {"HIGH": 0.85, "MEDIUM": 0.40, "LOW": 0.15}  # P(issue disallowed | review)
+PREPARER_REVIEW_ADJUSTMENT_RATE = 0.10  # Share of claim exposed to a broad contingency-fee review adjustment
+MONTE_CARLO_TRIALS = 200000
+
 # Provincial ITC Rates (2024 tax year)
 PROVINCIAL_CREDITS = {
     "Ontario": {
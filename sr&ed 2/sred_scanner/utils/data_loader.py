@@ -1,21 +1,89 @@
-import streamlit as st
-import json
 import os
+import sys
+
+from utils.schemas import decode_claim_file
 
 BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+ROOT_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import scan_client
+from fingerprint import fingerprint
+
+# Session-state key -> file name inside a claim directory
+CLAIM_FILES = {
+    "client_profile": "client_profile.json",
+    "projects": "projects.json",
+    "expenditures": "expenditures.json",
+    "documentation": "documentation_log.json",
+    "t661_form": "t661_form_data.json",
+}
+
 
+def load_json(filename, data_dir=None):
+    """Load one claim file, validated against its schema in utils.schemas."""
+    with open(os.path.join(data_dir or DATA_DIR, filename), "rb") as f:
+        return decode_claim_file(filename, f.read())
 
-def load_json(filename):
-    with open(os.path.join(BASE_DIR, "data", filename), "r") as f:
-        return json.load(f)
+
+def load_claim(data_dir=None):
+    """Load every claim file from one claim directory, keyed like session state."""
+    return {key: load_json(filename, data_dir) for key, filename in CLAIM_FILES.items()}
+
+
+def claim_version(claim_dir=None):
+    """Data-version fingerprint of one claim directory's files."""
+    claim_dir = claim_dir or DATA_DIR
+    return fingerprint(*(os.path.join(claim_dir, filename) for filename in CLAIM_FILES.values()))
 
 
 def ensure_data_loaded():
-    """Load all data files into session state if not already loaded."""
-    if "data_loaded" not in st.session_state:
-        st.session_state.client_profile = load_json("client_profile.json")
-        st.session_state.projects = load_json("projects.json")
-        st.session_state.expenditures = load_json("expenditures.json")
-        st.session_state.documentation = load_json("documentation_log.json")
-        st.session_state.t661_form = load_json("t661_form_data.json")
-        st.session_state.data_loaded = True
+    """Load the claim into session state, reloading it whenever its files change on disk."""
+    import streamlit as st
+
+    claim_dir = st.session_state.get("claim_dir", DATA_DIR)
+    version = claim_version(claim_dir)
+    if st.session_state.get("data_version") != version:
+        open_claim(claim_dir, version)
+
+
+def open_claim(claim_dir, version=None):
+    """Replace the claim held in session state with the one in ``claim_dir``."""
+    import streamlit as st
+
+    for key, value in load_claim(claim_dir).items():
+        st.session_state[key] = value
+    st.session_state.claim_dir = claim_dir
+    st.session_state.data_version = version or claim_version(claim_dir)
+    st.session_state.data_loaded = True
+
+
+def _analysis_from_service(claim_dir):
+    """The claim's analysis from the scan service, or None to analyze in-process."""
+    if not scan_client.service_url():
+        return None
+    try:
+        return scan_client.request_analysis(claim_dir)
+    except scan_client.ScanServiceError as exc:
+        print(f"Scan service unavailable, analyzing in-process: {exc}", file=sys.stderr)
+        return None
+
+
+def current_analysis():
+    """``analyze_claim`` of the claim in session state, computed once per data version."""
+    import streamlit as st
+
+    from utils.analysis import analyze_claim
+
+    version = st.session_state.get("data_version")
+    cached = st.session_state.get("analysis")
+    if cached is None or cached[0] != version:
+        analysis = _analysis_from_service(st.session_state.get("claim_dir", DATA_DIR))
+        if analysis is None:
+            analysis = analyze_claim({key: st.session_state[key] for key in CLAIM_FILES})
+        cached = (version, analysis)
+        st.session_state.analysis = cached
+    return cached[1]
@@ -0,0 +1,99 @@
+"""Evidence interval parsing and documentation-gap detection (sort + sweep-line)."""
+
+from datetime import date, timedelta
+
+from utils.constants import DOCUMENTATION_GAP_THRESHOLD_DAYS
+
+ONE_DAY = timedelta(days=1)
+
+# Evidence that shows activity but records no experimental rationale, so it
+# cannot close a contemporaneous-documentation gap (CRA Guidelines on Eligibility, Section 6).
+NON_EXPERIMENTAL_EVIDENCE_TYPES = {"source_code", "timesheets"}
+
+
+def evidence_interval(item):
+    """Return the inclusive ``(start, end)`` dates an evidence item covers, or None if undated."""
+    if "date" in item:
+        day = date.fromisoformat(item["date"])
+        return day, day
+    if "date_range" in item:
+        start, end = item["date_range"].split(" to ")
+        return date.fromisoformat(start), date.fromisoformat(end)
+    return None
+
+
+def _uncovered_windows(intervals, period_start=None, period_end=None):
+    """
+    Sweep sorted intervals and yield every uncovered ``(start, end)`` window.
+
+    When a project period is given, intervals are clamped to it first (evidence
+    dated outside the period neither closes nor opens a window), and leading and
+    trailing windows inside it are reported too. O(n log n) for the sort, O(n)
+    for the sweep.
+    """
+    if period_start or period_end:
+        clamped = []
+        for start, end in intervals:
+            start = max(start, period_start) if period_start else start
+            end = min(end, period_end) if period_end else end
+            if start <= end:
+                clamped.append((start, end))
+        intervals = clamped
+    intervals.sort()
+    covered_until = period_start - ONE_DAY if period_start else None
+    for start, end in intervals:
+        if covered_until is not None and start > covered_until + ONE_DAY:
+            yield covered_until + ONE_DAY, start - ONE_DAY
+        if covered_until is None or end > covered_until:
+            covered_until = end
+    if period_end and covered_until is not None and covered_until < period_end:
+        yield covered_until + ONE_DAY, period_end
+
+
+def detect_documentation_gaps(documentation, projects=None, min_days=DOCUMENTATION_GAP_THRESHOLD_DAYS):
+    """
+    Find windows with no contemporaneous experimental records, per project.
+
+    Returns a list of ``{"project", "start", "end", "days", "reason"}`` dicts
+    (ISO date strings, inclusive), sorted by project then start. ``reason``
+    comes from a pre-flagged evidence item overlapping the window, if any.
+    """
+    periods = {}
+    for p in projects or []:
+        periods[p["project_id"]] = (date.fromisoformat(p["start_date"]), date.fromisoformat(p["end_date"]))
+
+    intervals_by_project = {pid: [] for pid in periods}
+    flagged = []
+    for item in documentation.get("evidence_items", []):
+        if item.get("gap_flag") and item.get("gap_start") and item.get("gap_end"):
+            flagged.append((
+                item["project"],
+                date.fromisoformat(item["gap_start"]),
+                date.fromisoformat(item["gap_end"]),
+                item.get("gap_reason", ""),
+            ))
+        if item.get("type") in NON_EXPERIMENTAL_EVIDENCE_TYPES:
+            continue
+        interval = evidence_interval(item)
+        if interval:
+            intervals_by_project.setdefault(item["project"], []).append(interval)
+
+    gaps = []
+    for pid in sorted(intervals_by_project):
+        period_start, period_end = periods.get(pid, (None, None))
+        for start, end in _uncovered_windows(intervals_by_project[pid], period_start, period_end):
+            days = (end - start).days + 1
+            if days < min_days:
+                continue
+            reason = next(
+                (r for fpid, fstart, fend, r in flagged if fpid == pid and fstart <= end and fend >= start),
+                "",
+            )
+            gaps.append({
+                "project": pid,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "days": days,
+                "reason": reason,
+            })
+    return gaps
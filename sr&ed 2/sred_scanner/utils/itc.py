@@ -0,0 +1,75 @@
+"""Federal and provincial SR&ED investment tax credits on a qualified expenditure base."""
+
+from utils.constants import (
+    ITC_CCPC_ENHANCED_LIMIT,
+    ITC_CCPC_ENHANCED_RATE,
+    ITC_CCPC_BASE_RATE,
+    PROVINCIAL_CREDITS,
+)
+from utils.scoring import calculate_federal_itc
+
+
+def federal_itc_breakdown(qualified):
+    """Enhanced-rate and base-rate portions of the federal CCPC ITC (they sum to calculate_federal_itc)."""
+    enhanced_base = min(qualified, ITC_CCPC_ENHANCED_LIMIT)
+    base_base = max(0, qualified - ITC_CCPC_ENHANCED_LIMIT)
+    enhanced = round(enhanced_base * ITC_CCPC_ENHANCED_RATE)
+    base = round(base_base * ITC_CCPC_BASE_RATE) if base_base else 0
+    return {
+        "qualified": qualified,
+        "enhanced_base": enhanced_base,
+        "enhanced": enhanced,
+        "base_base": base_base,
+        "base": base,
+        "total": calculate_federal_itc(qualified),
+    }
+
+
+def _provincial_credit(code, info, qualified):
+    """One provincial credit; ``structure`` says which of the three rate shapes it uses."""
+    credit = {"code": code, "name": info["name"], "refundable": info.get("refundable", False)}
+    if "rate" in info:
+        limit = info.get("limit")
+        base = min(qualified, limit) if limit else qualified
+        credit.update(structure="flat", rate=info["rate"], limit=limit, base=base, amount=round(base * info["rate"]))
+    elif "rate_first_1m" in info:
+        # Quebec-style tiered
+        first_1m = min(qualified, 1000000)
+        above = max(0, qualified - 1000000)
+        amount_1 = round(first_1m * info["rate_first_1m"])
+        amount_2 = round(above * info["rate_above"])
+        credit.update(
+            structure="tiered", rate_first_1m=info["rate_first_1m"], rate_above=info["rate_above"],
+            first_1m=first_1m, above=above, amount_1=amount_1, amount_2=amount_2, amount=amount_1 + amount_2,
+        )
+    elif "rate_base" in info:
+        # Alberta-style base + incremental
+        base_amount = round(qualified * info["rate_base"])
+        inc_base = min(qualified, info.get("incremental_limit", 0))
+        inc_amount = round(inc_base * info.get("rate_incremental", 0))
+        credit.update(
+            structure="base_incremental", rate_base=info["rate_base"],
+            rate_incremental=info.get("rate_incremental", 0), base_amount=base_amount,
+            inc_base=inc_base, inc_amount=inc_amount, amount=base_amount + inc_amount,
+        )
+    else:
+        return None
+    return credit
+
+
+def provincial_credits(qualified, province):
+    """Provincial credits for ``province`` on ``qualified``, with their total and refundable share."""
+    table = PROVINCIAL_CREDITS.get(province, {})
+    credits = []
+    if "note" not in table:
+        for code, info in table.items():
+            credit = _provincial_credit(code, info, qualified)
+            if credit is not None:
+                credits.append(credit)
+    return {
+        "province": province,
+        "note": table.get("note"),
+        "credits": credits,
+        "total": sum(c["amount"] for c in credits),
+        "refundable": sum(c["amount"] for c in credits if c["refundable"]),
+    }
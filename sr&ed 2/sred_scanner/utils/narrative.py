@@ -0,0 +1,116 @@
+"""T661 Part 2 Section B narrative analysis: computed word counts and quality indicators."""
+
+import hashlib
+import re
+from collections import OrderedDict
+
+from utils.constants import LINE_242_WORD_LIMIT, LINE_244_WORD_LIMIT, LINE_246_WORD_LIMIT
+
+NARRATIVE_LINES = [
+    {
+        "line": "line_242",
+        "text_key": "line_242_scientific_technological_advancement",
+        "label": "Line 242 — Scientific/Technological Advancement",
+        "limit": LINE_242_WORD_LIMIT,
+    },
+    {
+        "line": "line_244",
+        "text_key": "line_244_technological_uncertainty",
+        "label": "Line 244 — Technological Uncertainty",
+        "limit": LINE_244_WORD_LIMIT,
+    },
+    {
+        "line": "line_246",
+        "text_key": "line_246_work_performed",
+        "label": "Line 246 — Work Performed",
+        "limit": LINE_246_WORD_LIMIT,
+    },
+]
+
+# Indicator -> (label, whole-word terms that count as a hit)
+QUALITY_INDICATORS = {
+    "hypothesis": ("Hypotheses mentioned", ["hypothesis", "hypotheses", "hypothesized", "hypothesised"]),
+    "experiment": ("Experiments referenced", ["experiment", "experiments", "experimental", "experimentation", "experimented"]),
+    "systematic": ("Systematic approach described", ["systematic", "systematically"]),
+    "uncertainty": ("Uncertainty articulated", ["uncertainty", "uncertainties"]),
+    "advancement": ("Advancement claimed", ["advancement", "advancements"]),
+    "measured": ("Measurements cited", ["measured", "measurement", "measurements"]),
+    "documented": ("Documentation referenced", ["documented", "documentation"]),
+}
+
+_TERM_TO_INDICATOR = {
+    term: indicator
+    for indicator, (_, terms) in QUALITY_INDICATORS.items()
+    for term in terms
+}
+# One alternation over every term, longest first so "experimental" wins over "experiment".
+_INDICATOR_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(t) for t in sorted(_TERM_TO_INDICATOR, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
+CACHE_SIZE = 8192
+_cache = OrderedDict()
+
+
+def narrative_digest(text):
+    """Content hash used as the analysis cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def count_words(text):
+    """Whitespace-delimited word count, as used for the T661 narrative limits."""
+    return len(text.split())
+
+
+def analyze_text(text):
+    """
+    Return ``{"word_count": int, "indicators": {indicator: hits}}`` for one narrative.
+
+    Results are cached by content hash and shared between callers; treat them as read-only.
+    """
+    key = narrative_digest(text)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    hits = dict.fromkeys(QUALITY_INDICATORS, 0)
+    for match in _INDICATOR_RE.finditer(text):
+        hits[_TERM_TO_INDICATOR[match.group(0).lower()]] += 1
+
+    result = {"word_count": count_words(text), "indicators": hits}
+    _cache[key] = result
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def analyze_project(project):
+    """Per-line word counts against the T661 limits plus indicator hits across all three lines."""
+    lines = []
+    indicators = dict.fromkeys(QUALITY_INDICATORS, 0)
+    for spec in NARRATIVE_LINES:
+        analysis = analyze_text(project.get(spec["text_key"], ""))
+        for indicator, hits in analysis["indicators"].items():
+            indicators[indicator] += hits
+        lines.append({
+            "line": spec["line"],
+            "label": spec["label"],
+            "limit": spec["limit"],
+            "word_count": analysis["word_count"],
+            "stored_word_count": project.get(f"{spec['line']}_word_count"),
+            "ratio": analysis["word_count"] / spec["limit"],
+        })
+    return {"lines": lines, "indicators": indicators}
+
+
+def analyze_projects(projects):
+    """Analyze every project's narratives in one pass, keyed by project_id."""
+    return {p["project_id"]: analyze_project(p) for p in projects}
+
+
+def narrative_score(analysis):
+    """0-100 narrative completeness: average share of each line's word limit used, capped at 100."""
+    ratios = [line["ratio"] * 100 for line in analysis["lines"]]
+    return min(100, sum(ratios) / len(ratios)) if ratios else 0
@@ -0,0 +1,78 @@
+"""Multi-claim portfolio discovery and batch scoring across worker processes."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.analysis import analyze_claim
+from utils.data_loader import BASE_DIR, CLAIM_FILES, DATA_DIR, load_claim
+
+PORTFOLIO_DIR = os.environ.get("SRED_PORTFOLIO_DIR", os.path.join(BASE_DIR, "claims"))
+CLAIM_MARKER = CLAIM_FILES["client_profile"]
+
+# Below this many claims the process pool costs more than it saves.
+PARALLEL_MIN_CLAIMS = 8
+
+
+def discover_claims(root=None):
+    """
+    Return every claim directory under ``root`` (a directory holding client_profile.json).
+
+    Falls back to the bundled single-claim ``data/`` directory when the
+    portfolio root does not exist.
+    """
+    root = root or PORTFOLIO_DIR
+    if not os.path.isdir(root):
+        return [os.path.abspath(DATA_DIR)]
+
+    claim_dirs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if CLAIM_MARKER in filenames:
+            claim_dirs.append(os.path.abspath(dirpath))
+            dirnames.clear()  # a claim directory never nests another claim
+    return claim_dirs
+
+
+def score_claim(claim_dir):
+    """Load one claim and return a compact, picklable summary row."""
+    try:
+        analysis = analyze_claim(load_claim(claim_dir))
+    except Exception as exc:  # one malformed claim must not sink the batch
+        return {"claim_dir": claim_dir, "error": f"{type(exc).__name__}: {exc}"}
+
+    client = analysis["client"]
+    expenditures = analysis["expenditures"]
+    return {
+        "claim_dir": claim_dir,
+        "error": None,
+        "company_name": client["company_name"],
+        "business_number": client["business_number"],
+        "fiscal_year_end": client["fiscal_year_end"],
+        "province": client["province"],
+        "projects": analysis["projects"],
+        "overall_score": analysis["overall_score"],
+        **{f"{k}_score": v for k, v in analysis["subscores"].items()},
+        "high_issues": analysis["issue_counts"]["HIGH"],
+        "medium_issues": analysis["issue_counts"]["MEDIUM"],
+        "low_issues": analysis["issue_counts"]["LOW"],
+        "filed_total": expenditures["filed"]["total"],
+        "corrected_total": expenditures["corrected"]["total"],
+        "filed_itc": analysis["itc"]["filed_federal"],
+        "corrected_itc": analysis["itc"]["federal"]["total"],
+    }
+
+
+def score_portfolio(claim_dirs, max_workers=None):
+    """Score every claim, in parallel across cores for larger portfolios. Preserves input order."""
+    claim_dirs = list(claim_dirs)
+    if max_workers == 1 or len(claim_dirs) < PARALLEL_MIN_CLAIMS:
+        return [score_claim(d) for d in claim_dirs]
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(claim_dirs) // (workers * 4))
+    # Spawned workers start clean instead of forking a threaded parent such as a Streamlit server;
+    # score_claim stays a module-level function so they can import it.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(score_claim, claim_dirs, chunksize=chunksize))
@@ -0,0 +1,228 @@
+"""Schemas for the SR&ED claim files, used to validate them with msgspec when a claim is loaded.
+
+Every key the scoring, the pages and the sidebar index directly is a required
+field without a default, so a claim missing one fails when it is loaded, with
+the file name and the JSON path, instead of raising KeyError inside a page.
+Keys they only read with ``.get`` keep their defaults. This is a validation
+layer only: each file is parsed once, the plain-dict parse is checked against
+its schema and returned as is, and the converted structs are discarded, so the
+pages and scoring keep working on dicts. Undeclared fields are allowed and kept.
+"""
+
+import datetime
+
+import msgspec
+
+
+class ClaimValidationError(ValueError):
+    """A claim file does not match its schema."""
+
+    def __init__(self, name, detail):
+        super().__init__(f"{name}: {detail}")
+        self.name = name
+        self.detail = detail
+
+
+# ---------------------------------------------------------------------------
+# projects.json
+# ---------------------------------------------------------------------------
+
+class FiveQuestionTest(msgspec.Struct, kw_only=True):
+    q1_uncertainty: bool = False
+    q2_hypothesis: bool = False
+    q3_systematic: bool = False
+    q4_advancement: bool = False
+    q5_record: bool = False
+    q1_evidence: str = ""
+    q2_evidence: str = ""
+    q3_evidence: str = ""
+    q4_evidence: str = ""
+    q5_evidence: str = ""
+
+
+class Personnel(msgspec.Struct, kw_only=True):
+    name: str
+    role: str
+    hours_sred: float
+    hours_total: float
+    salary: float | None = None
+    is_specified_employee: bool = False
+
+
+class Project(msgspec.Struct, kw_only=True):
+    project_id: str
+    title: str
+    field_of_science_code: str = ""
+    field_of_science: str = ""
+    start_date: datetime.date
+    end_date: datetime.date
+    status: str = ""
+    keyword_codes: list[str] = []
+    eligibility_strength: str
+    line_242_scientific_technological_advancement: str = ""
+    line_242_word_count: int = 0
+    line_244_technological_uncertainty: str = ""
+    line_244_word_count: int = 0
+    line_246_work_performed: str = ""
+    line_246_word_count: int = 0
+    five_question_test: FiveQuestionTest
+    personnel: list[Personnel]
+
+
+# ---------------------------------------------------------------------------
+# expenditures.json
+# ---------------------------------------------------------------------------
+
+class SalaryLine(msgspec.Struct, kw_only=True):
+    name: str
+    total_salary: float
+    sred_portion: float
+    project_allocation: dict[str, float]
+    specified_employee: bool
+    paid_within_180_days: bool
+
+
+class Salaries(msgspec.Struct, kw_only=True):
+    line_300_total_salary_expenditures: float = 0
+    breakdown: list[SalaryLine]
+    total_sred_salaries: float
+    specified_employee_salary_included: float = 0
+
+
+class MaterialItem(msgspec.Struct, kw_only=True):
+    description: str
+    amount: float
+    project: str
+    consumed_or_transformed: str
+    eligible: bool
+
+
+class Materials(msgspec.Struct, kw_only=True):
+    line_360_total: float
+    items: list[MaterialItem]
+
+
+class ContractItem(msgspec.Struct, kw_only=True):
+    payee: str
+    amount: float
+    project: str
+    arms_length: bool
+    contract_specifies_sred: bool
+    eligible: bool
+    itc_eligible_amount: float | None = None
+
+
+class Contracts(msgspec.Struct, kw_only=True):
+    line_370_total: float
+    items: list[ContractItem]
+
+
+class Overhead(msgspec.Struct, kw_only=True):
+    method: str = "proxy"
+    proxy_base_salaries: float
+    proxy_rate: float = 0
+    proxy_amount: float
+    note: str
+
+
+class ExpenditureError(msgspec.Struct, kw_only=True):
+    error_id: str = ""
+    category: str = "General"
+    description: str
+    severity: str
+    remediation: str
+
+
+class Expenditures(msgspec.Struct, kw_only=True):
+    method: str = "proxy"
+    fiscal_year: str = ""
+    salaries: Salaries
+    materials: Materials
+    contracts: Contracts
+    overhead: Overhead
+    deliberate_errors: list[ExpenditureError] = []
+
+
+# ---------------------------------------------------------------------------
+# documentation_log.json
+# ---------------------------------------------------------------------------
+
+class EvidenceItem(msgspec.Struct, kw_only=True):
+    id: str = ""
+    project: str
+    type: str
+    title: str
+    format: str = ""
+    date: datetime.date | None = None
+    date_range: str | None = None
+    contemporaneous: bool | None = None
+    gap_flag: bool = False
+    gap_start: datetime.date | None = None
+    gap_end: datetime.date | None = None
+    gap_reason: str = ""
+    flag: bool | str | None = None
+
+
+class DocumentationLog(msgspec.Struct, kw_only=True):
+    evidence_items: list[EvidenceItem]
+    t661_evidence_checklist: dict[str, dict[str, bool | str]]
+
+
+# ---------------------------------------------------------------------------
+# t661_form_data.json and client_profile.json
+# ---------------------------------------------------------------------------
+
+class FormPart(msgspec.Struct, kw_only=True):
+    status: str
+    issues: list[str] = []
+
+
+class T661Form(msgspec.Struct, kw_only=True):
+    form_version: str = ""
+    parts_status: dict[str, FormPart]
+
+
+class Preparer(msgspec.Struct, kw_only=True):
+    name: str
+    contact_name: str
+    business_number: str = ""
+    billing_arrangement: int | None
+    fee_percentage: float | None
+
+
+class ClientProfile(msgspec.Struct, kw_only=True):
+    company_name: str
+    business_number: str
+    fiscal_year_end: datetime.date
+    corporation_type: str
+    taxable_income_prior_year: float
+    taxable_capital: float
+    associated_corps: int = 0
+    province: str
+    first_time_claimant: bool
+    preparer: Preparer
+
+
+# Claim file name -> schema of its top-level JSON value
+CLAIM_SCHEMAS = {
+    "client_profile.json": ClientProfile,
+    "projects.json": list[Project],
+    "expenditures.json": Expenditures,
+    "documentation_log.json": DocumentationLog,
+    "t661_form_data.json": T661Form,
+}
+
+_json_decoder = msgspec.json.Decoder()
+
+
+def decode_claim_file(name, raw):
+    """Parse one claim file, validate it against its schema (if it has one) and return the plain parse."""
+    try:
+        data = _json_decoder.decode(raw)
+        if name in CLAIM_SCHEMAS:
+            msgspec.convert(data, CLAIM_SCHEMAS[name])
+        return data
+    except msgspec.ValidationError as e:
+        raise ClaimValidationError(name, str(e)) from e
+    except msgspec.DecodeError as e:
+        raise ClaimValidationError(name, f"invalid JSON ({e})") from e
@@ -1,10 +1,40 @@
 """Risk scoring engine for SR&ED claim readiness."""
 
+from utils.constants import (
+    ITC_CCPC_ENHANCED_LIMIT,
+    ITC_CCPC_ENHANCED_RATE,
+    ITC_CCPC_BASE_RATE,
+    DOCUMENTATION_GAP_HIGH_DAYS,
+    INELIGIBLE_DOCUMENTATION_WEIGHT,
+)
+from utils.evidence import detect_documentation_gaps
+
+
+def ineligible_project_ids(projects):
+    """IDs of projects rated INELIGIBLE, whose expenditures must come out of the claim."""
+    return {p["project_id"] for p in projects if p.get("eligibility_strength") == "INELIGIBLE"}
+
+
+def project_spend(expenditures, salary_multiplier=1):
+    """
+    Salary, material and contract spend per project, in one pass over the expenditure lines.
+
+    Salaries count ``salary_multiplier`` times (e.g. 1 + PROXY_RATE to include the PPA).
+    """
+    spend = {}
+    for s in expenditures["salaries"]["breakdown"]:
+        for pid, amount in s["project_allocation"].items():
+            spend[pid] = spend.get(pid, 0) + amount * salary_multiplier
+    for item in expenditures["materials"]["items"] + expenditures["contracts"]["items"]:
+        spend[item["project"]] = spend.get(item["project"], 0) + item["amount"]
+    return spend
+
 
 def calculate_eligibility_score(projects, expenditures):
     """Score project eligibility weighted by expenditure."""
     project_scores = {}
-    project_spend = {}
+    spend_by_project = project_spend(expenditures)
+    project_spend_used = {}
 
     for p in projects:
         pid = p["project_id"]
@@ -12,24 +42,13 @@ def calculate_eligibility_score(projects, expenditures):
         passed = sum(1 for k in ["q1_uncertainty", "q2_hypothesis", "q3_systematic", "q4_advancement", "q5_record"] if fqt.get(k))
         # Score: 100 if 5/5, 80 if 4/5, 60 if 3/5, etc. 0 if 0/5
         project_scores[pid] = (passed / 5) * 100
+        project_spend_used[pid] = spend_by_project.get(pid, 0)
 
-        # Calculate spend for this project
-        spend = 0
-        for s in expenditures["salaries"]["breakdown"]:
-            spend += s["project_allocation"].get(pid, 0)
-        for m in expenditures["materials"]["items"]:
-            if m["project"] == pid:
-                spend += m["amount"]
-        for c in expenditures["contracts"]["items"]:
-            if c["project"] == pid:
-                spend += c["amount"]
-        project_spend[pid] = spend
-
-    total_spend = sum(project_spend.values())
+    total_spend = sum(project_spend_used.values())
     if total_spend == 0:
         return 0
 
-    weighted = sum(project_scores[pid] * (project_spend[pid] / total_spend) for pid in project_scores)
+    weighted = sum(project_scores[pid] * (project_spend_used[pid] / total_spend) for pid in project_scores)
     return round(weighted)
 
 
@@ -46,15 +65,21 @@ def calculate_expenditure_score(expenditures):
     return max(0, score)
 
 
-def calculate_documentation_score(documentation):
-    """Score documentation completeness across eligible projects."""
+def calculate_documentation_score(documentation, projects):
+    """
+    Score documentation completeness across projects.
+
+    Eligible projects share most of the weight evenly; ineligible ones share
+    INELIGIBLE_DOCUMENTATION_WEIGHT, since they still count for scoring.
+    """
     checklist = documentation["t661_evidence_checklist"]
-    scores = {"P001": 0, "P002": 0, "P003": 0}
-    counts = {"P001": 0, "P002": 0, "P003": 0}
+    scores = {}
+    counts = {}
 
     for line_key, project_vals in checklist.items():
         for pid, val in project_vals.items():
-            counts[pid] += 1
+            counts[pid] = counts.get(pid, 0) + 1
+            scores.setdefault(pid, 0)
             if val is True:
                 scores[pid] += 1
             elif val == "partial" or val == "wrong_type":
@@ -65,13 +90,21 @@ def calculate_documentation_score(documentation):
         if counts[pid] > 0:
             project_pcts[pid] = (scores[pid] / counts[pid]) * 100
 
-    # Weight eligible projects more heavily
-    if project_pcts:
-        # P001 and P002 are eligible; P003 is not but still counts for scoring
-        weights = {"P001": 0.45, "P002": 0.45, "P003": 0.10}
-        weighted = sum(project_pcts.get(pid, 0) * w for pid, w in weights.items())
-        return round(weighted)
-    return 0
+    if not project_pcts:
+        return 0
+
+    # Projects without checklist rows still carry weight (and score 0)
+    pids = list(project_pcts)
+    pids += [p["project_id"] for p in projects if p["project_id"] not in project_pcts]
+    ineligible = ineligible_project_ids(projects)
+    eligible = [pid for pid in pids if pid not in ineligible]
+    excluded = [pid for pid in pids if pid in ineligible]
+    ineligible_share = (INELIGIBLE_DOCUMENTATION_WEIGHT if eligible else 1.0) if excluded else 0.0
+
+    weights = {pid: (1 - ineligible_share) / len(eligible) for pid in eligible}
+    weights.update({pid: ineligible_share / len(excluded) for pid in excluded})
+    weighted = sum(project_pcts.get(pid, 0) * w for pid, w in weights.items())
+    return round(weighted)
 
 
 def calculate_form_score(form_data):
@@ -107,7 +140,7 @@ def calculate_overall_score(projects, expenditures, documentation, form_data):
 
     elig = calculate_eligibility_score(projects, expenditures)
     exp = calculate_expenditure_score(expenditures)
-    doc = calculate_documentation_score(documentation)
+    doc = calculate_documentation_score(documentation, projects)
     form = calculate_form_score(form_data)
 
     composite = (elig * W_ELIG + exp * W_EXP + doc * W_DOC + form * W_FORM)
@@ -156,16 +189,19 @@ def get_all_issues(projects, expenditures, documentation, form_data, client_prof
             "remediation": error["remediation"],
         })
 
-    # Documentation gaps
-    for item in documentation.get("evidence_items", []):
-        if item.get("gap_flag"):
-            issues.append({
-                "severity": "HIGH",
-                "category": "Documentation",
-                "issue": f"Documentation gap: {item.get('gap_start')} to {item.get('gap_end')} ({item.get('gap_reason')})",
-                "project": item["project"],
-                "remediation": "Prepare memo reconstructing experimental approach during gap period using git commits and code reviews.",
-            })
+    # Documentation gaps (computed from evidence coverage)
+    for gap in detect_documentation_gaps(documentation, projects):
+        reason = gap["reason"] or "no contemporaneous experimental records"
+        issues.append({
+            "severity": "HIGH" if gap["days"] >= DOCUMENTATION_GAP_HIGH_DAYS else "MEDIUM",
+            "category": "Documentation",
+            "issue": f"Documentation gap: {gap['start']} to {gap['end']}, {gap['days']} days ({reason})",
+            "project": gap["project"],
+            "remediation": "Prepare memo reconstructing experimental approach during gap period using git commits and code reviews.",
+            "gap_start": gap["start"],
+            "gap_end": gap["end"],
+            "gap_days": gap["days"],
+        })
 
     # Preparer risk
     preparer = client_profile.get("preparer", {})
@@ -185,28 +221,30 @@ def get_all_issues(projects, expenditures, documentation, form_data, client_prof
     return issues
 
 
-def calculate_corrected_expenditures(expenditures):
-    """Calculate expenditures after removing P003 and fixing errors."""
-    # Corrected salaries: remove P003 allocations
+def calculate_corrected_expenditures(expenditures, projects):
+    """Calculate expenditures after removing ineligible projects and fixing errors."""
+    excluded = ineligible_project_ids(projects)
+
+    # Corrected salaries: remove allocations to ineligible projects
     corrected_salaries = 0
     for s in expenditures["salaries"]["breakdown"]:
         for pid, amount in s["project_allocation"].items():
-            if pid != "P003":
+            if pid not in excluded:
                 corrected_salaries += amount
 
     # Corrected materials: remove ineligible items
     corrected_materials = 0
     for m in expenditures["materials"]["items"]:
-        if m["eligible"] and m["project"] != "P003":
+        if m["eligible"] and m["project"] not in excluded:
             corrected_materials += m["amount"]
 
     # Corrected contracts: remove ineligible
     corrected_contracts = 0
     for c in expenditures["contracts"]["items"]:
-        if c["eligible"] and c["project"] != "P003":
+        if c["eligible"] and c["project"] not in excluded:
             corrected_contracts += c["amount"]
 
-    # Corrected PPA: 55% of eligible salary base (excluding specified employees on P003)
+    # Corrected PPA: 55% of eligible salary base
     corrected_ppa = round(corrected_salaries * 0.55)
 
     return {
@@ -232,3 +270,12 @@ def calculate_uncorrected_expenditures(expenditures):
         "ppa": ppa,
         "total": salaries + materials + contracts + ppa,
     }
+
+
+def calculate_federal_itc(qualified):
+    """Federal CCPC ITC: enhanced rate up to the expenditure limit, base rate above it."""
+    if qualified <= ITC_CCPC_ENHANCED_LIMIT:
+        return round(qualified * ITC_CCPC_ENHANCED_RATE)
+    enhanced_portion = round(ITC_CCPC_ENHANCED_LIMIT * ITC_CCPC_ENHANCED_RATE)
+    base_portion = round((qualified - ITC_CCPC_ENHANCED_LIMIT) * ITC_CCPC_BASE_RATE)
+    return enhanced_portion + base_portion
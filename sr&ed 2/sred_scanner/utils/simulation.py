@@ -0,0 +1,165 @@
+"""Monte Carlo simulation of the federal ITC refund under CRA review risk."""
+
+from datetime import datetime
+
+import numpy as np
+
+from utils.constants import (
+    ITC_CCPC_ENHANCED_LIMIT,
+    ITC_CCPC_ENHANCED_RATE,
+    ITC_CCPC_BASE_RATE,
+    MONTE_CARLO_TRIALS,
+    PREPARER_REVIEW_ADJUSTMENT_RATE,
+    PROXY_RATE,
+    REVIEW_DISALLOWANCE_PROBABILITY,
+    SPECIFIED_EMPLOYEE_PPA_CAP_MULTIPLIER,
+    SPECIFIED_EMPLOYEE_SALARY_PERCENTAGE,
+    YMPE_2024,
+)
+from utils.scoring import get_all_issues, calculate_uncorrected_expenditures, project_spend
+
+FIVE_QUESTION_KEYS = ["q1_uncertainty", "q2_hypothesis", "q3_systematic", "q4_advancement", "q5_record"]
+PERCENTILES = [5, 25, 50, 75, 95]
+# Trials drawn per batch, so the (trials x pools) draw matrix stays bounded however many trials run
+TRIAL_CHUNK = 50_000
+
+
+def _days_between(start, end):
+    return (datetime.strptime(end, "%Y-%m-%d") - datetime.strptime(start, "%Y-%m-%d")).days + 1
+
+
+def _expenditure_amount(expenditures, category, excluded_projects):
+    """Dollars behind an expenditure error, skipping projects already fully at risk."""
+    if category == "materials":
+        return sum(
+            m["amount"] for m in expenditures["materials"]["items"]
+            if not m["eligible"] and m["project"] not in excluded_projects
+        )
+    if category == "contracts":
+        return sum(
+            c["amount"] for c in expenditures["contracts"]["items"]
+            if not c["eligible"] and c["project"] not in excluded_projects
+        )
+    if category == "specified_employee":
+        excess_ppa = 0
+        for s in expenditures["salaries"]["breakdown"]:
+            if not s["specified_employee"] or s["total_salary"] <= 0:
+                continue
+            cap = min(
+                s["total_salary"] * SPECIFIED_EMPLOYEE_SALARY_PERCENTAGE,
+                YMPE_2024 * SPECIFIED_EMPLOYEE_PPA_CAP_MULTIPLIER,
+            )
+            for pid, amount in s["project_allocation"].items():
+                if pid in excluded_projects:
+                    continue
+                capped_base = cap * amount / s["total_salary"]
+                excess_ppa += max(0, amount - capped_base) * PROXY_RATE
+        return round(excess_ppa)
+    return 0
+
+
+def build_exposures(projects, expenditures, documentation, form_data, client_profile):
+    """
+    Attach a disallowance probability and an amount at risk to each issue.
+
+    Issues that put the same dollars at risk share a ``pool``; the simulation
+    disallows a pool once if any of its issues is upheld on review.
+    """
+    issues = get_all_issues(projects, expenditures, documentation, form_data, client_profile)
+    projects_by_id = {p["project_id"]: p for p in projects}
+    claim_total = calculate_uncorrected_expenditures(expenditures)["total"]
+    # Qualified spend per project as filed, including its share of the PPA
+    spend = project_spend(expenditures, salary_multiplier=1 + PROXY_RATE)
+
+    # Projects failing every question are exposed in full; other issues skip them.
+    fully_exposed = {
+        p["project_id"] for p in projects
+        if not any(p["five_question_test"].get(k) for k in FIVE_QUESTION_KEYS)
+    }
+
+    exposures = []
+    for issue in issues:
+        category = issue["category"]
+        pid = issue["project"]
+        amount = 0
+        pool = f"{category}:{pid}"
+
+        if category == "Eligibility":
+            fqt = projects_by_id[pid]["five_question_test"]
+            failed = sum(1 for k in FIVE_QUESTION_KEYS if not fqt.get(k))
+            amount = spend.get(pid, 0) * failed / len(FIVE_QUESTION_KEYS)
+        elif category == "Expenditure":
+            amount = _expenditure_amount(expenditures, pid, fully_exposed)
+        elif category == "Documentation":
+            project = projects_by_id.get(pid)
+            if project and pid not in fully_exposed:
+                project_days = _days_between(project["start_date"], project["end_date"])
+                amount = spend.get(pid, 0) * min(1.0, issue["gap_days"] / project_days)
+            pool = f"Documentation:{pid}:{issue['gap_start']}"
+        elif category == "Preparer":
+            amount = claim_total * PREPARER_REVIEW_ADJUSTMENT_RATE
+            pool = "Preparer:claim"
+
+        exposures.append({
+            **issue,
+            "probability": REVIEW_DISALLOWANCE_PROBABILITY.get(issue["severity"], 0.0),
+            "amount_at_risk": round(amount),
+            "pool": pool,
+        })
+    return exposures
+
+
+def _pool_exposures(exposures):
+    """Collapse issues sharing a pool into one Bernoulli draw: P(any upheld), max amount."""
+    pools = {}
+    for e in exposures:
+        if e["amount_at_risk"] <= 0 or e["probability"] <= 0:
+            continue
+        survive, amount = pools.get(e["pool"], (1.0, 0))
+        pools[e["pool"]] = (survive * (1 - e["probability"]), max(amount, e["amount_at_risk"]))
+    probabilities = np.array([1 - survive for survive, _ in pools.values()], dtype=np.float64)
+    amounts = np.array([amount for _, amount in pools.values()], dtype=np.float64)
+    return probabilities, amounts
+
+
+def _federal_itc(qualified):
+    """Vectorized counterpart of ``scoring.calculate_federal_itc``."""
+    enhanced = np.minimum(qualified, ITC_CCPC_ENHANCED_LIMIT) * ITC_CCPC_ENHANCED_RATE
+    base = np.maximum(qualified - ITC_CCPC_ENHANCED_LIMIT, 0) * ITC_CCPC_BASE_RATE
+    return enhanced + base
+
+
+def simulate_refund(exposures, claim_total, trials=MONTE_CARLO_TRIALS, seed=None, bins=40):
+    """
+    Sample CRA review outcomes and return the federal ITC refund distribution.
+
+    Each pool is disallowed independently with its combined probability; the
+    disallowed total is capped at the claim before the ITC is applied. Trials
+    are drawn ``TRIAL_CHUNK`` at a time, which yields the same draws as one
+    full matrix.
+    """
+    rng = np.random.default_rng(seed)
+    probabilities, amounts = _pool_exposures(exposures)
+
+    disallowed = np.zeros(trials)
+    if len(amounts):
+        thresholds = probabilities.astype(np.float32)
+        for start in range(0, trials, TRIAL_CHUNK):
+            stop = min(start + TRIAL_CHUNK, trials)
+            upheld = rng.random((stop - start, len(amounts)), dtype=np.float32) < thresholds
+            disallowed[start:stop] = upheld @ amounts
+
+    qualified = np.maximum(claim_total - disallowed, 0)
+    refunds = _federal_itc(qualified)
+    filed_itc = float(_federal_itc(np.float64(claim_total)))
+
+    counts, edges = np.histogram(refunds, bins=bins)
+    return {
+        "trials": trials,
+        "filed_itc": filed_itc,
+        "expected": float(refunds.mean()),
+        "std": float(refunds.std()),
+        "percentiles": dict(zip(PERCENTILES, np.percentile(refunds, PERCENTILES).tolist())),
+        "probability_full_refund": float(np.mean(disallowed == 0)),
+        "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+    }
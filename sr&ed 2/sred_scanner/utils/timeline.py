@@ -0,0 +1,145 @@
+"""Evidence timeline figure: one WebGL trace per project and evidence type, binned when dense."""
+
+from collections import defaultdict
+
+import plotly.graph_objects as go
+
+from utils.evidence import evidence_interval
+
+EVIDENCE_TYPE_SYMBOLS = {
+    "project_initiation_record": "diamond",
+    "literature_review": "square",
+    "lab_notebook": "circle",
+    "test_data": "triangle-up",
+    "technical_report": "star",
+    "source_code": "hexagon",
+    "timesheets": "cross",
+    "feasibility_report": "diamond",
+    "project_plan": "square",
+    "jira_tickets": "pentagon",
+}
+
+# Above this many items in one project/type trace, unflagged items are binned.
+TIMELINE_MAX_POINTS_PER_TRACE = 400
+TIMELINE_BIN_DAYS = 7
+
+
+def _bin_items(items, bin_days):
+    """Group (start_date, item) pairs into fixed-width date bins: [(bin_start, [items])]."""
+    bins = defaultdict(list)
+    for start, item in items:
+        bins[start.toordinal() // bin_days].append((start, item))
+    return [
+        (min(start for start, _ in members), [item for _, item in members])
+        for _, members in sorted(bins.items())
+    ]
+
+
+def build_evidence_timeline(
+    documentation,
+    gaps,
+    project_rows,
+    project_colors,
+    flag_colors,
+    max_points=TIMELINE_MAX_POINTS_PER_TRACE,
+    bin_days=TIMELINE_BIN_DAYS,
+):
+    """
+    Build the evidence timeline figure.
+
+    ``project_rows`` maps project_id -> (y, tick label); ``flag_colors`` holds
+    ``"gap"``, ``"flag"``, ``"default"`` and ``"gap_fill"`` colors. Items are
+    grouped into one ``Scattergl`` trace per (project, type); groups larger than
+    ``max_points`` keep flagged items individually and bin the rest by
+    ``bin_days``, sizing each bin marker by its item count.
+    """
+    groups = defaultdict(list)
+    for item in documentation.get("evidence_items", []):
+        interval = evidence_interval(item)
+        if interval is not None:
+            groups[(item["project"], item["type"])].append((interval[0], item))
+
+    fig = go.Figure()
+
+    for gap in gaps:
+        y = project_rows.get(gap["project"], (0, ""))[0]
+        fig.add_shape(
+            type="rect",
+            x0=gap["start"], x1=gap["end"],
+            y0=y - 0.4, y1=y + 0.4,
+            fillcolor=flag_colors["gap_fill"],
+            line=dict(color=flag_colors["gap"], width=2, dash="dash"),
+        )
+        fig.add_annotation(
+            x=gap["start"], y=y + 0.4,
+            xanchor="left", yanchor="bottom",
+            text=f"⚠️ {gap['days']}-Day Documentation Gap ({gap['project']})",
+            showarrow=False,
+            font=dict(color=flag_colors["gap"], size=12, family="Arial Black"),
+        )
+
+    for (pid, item_type), entries in sorted(groups.items()):
+        y = project_rows.get(pid, (0, ""))[0]
+        base_color = project_colors.get(pid, flag_colors["default"])
+
+        if len(entries) > max_points:
+            singles = [(start, item) for start, item in entries if item.get("gap_flag") or item.get("flag")]
+            binned = _bin_items(
+                [(start, item) for start, item in entries if not (item.get("gap_flag") or item.get("flag"))],
+                bin_days,
+            )
+        else:
+            singles, binned = entries, []
+
+        xs, colors, sizes, hovers = [], [], [], []
+        for start, item in singles:
+            hover_date = item.get("date") or item.get("date_range", "")
+            flag_text = ""
+            color = base_color
+            if item.get("gap_flag"):
+                flag_text = " ⚠️ GAP"
+                color = flag_colors["gap"]
+            if item.get("flag"):
+                flag_text = " ⚠️ FLAG"
+                color = flag_colors["flag"]
+            xs.append(start.isoformat())
+            colors.append(color)
+            sizes.append(14)
+            hovers.append(f"<b>{item['title']}</b><br>Date: {hover_date}<br>Format: {item['format']}{flag_text}")
+        for bin_start, members in binned:
+            xs.append(bin_start.isoformat())
+            colors.append(base_color)
+            sizes.append(min(30, 10 + 2 * len(members) ** 0.5))
+            hovers.append(
+                f"<b>{len(members)} {item_type.replace('_', ' ')} items</b><br>"
+                f"{bin_days}-day bin from {bin_start.isoformat()}<br>First: {members[0]['title']}"
+            )
+
+        fig.add_trace(go.Scattergl(
+            x=xs,
+            y=[y] * len(xs),
+            mode="markers",
+            marker=dict(
+                size=sizes,
+                color=colors,
+                symbol=EVIDENCE_TYPE_SYMBOLS.get(item_type, "circle"),
+                line=dict(width=1, color="white"),
+            ),
+            name=f"{pid}: {item_type}",
+            hovertext=hovers,
+            hoverinfo="text",
+            showlegend=False,
+        ))
+
+    ordered = sorted(project_rows.values())
+    fig.update_layout(
+        height=max(300, 100 * len(ordered)),
+        xaxis=dict(title="2024", range=["2024-01-01", "2024-12-31"]),
+        yaxis=dict(
+            tickvals=[y for y, _ in ordered],
+            ticktext=[label for _, label in ordered],
+            range=[-0.5, len(ordered) - 0.5],
+        ),
+        margin=dict(t=30, b=40, l=200, r=30),
+    )
+    return fig